@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+AI Response Cache - Paying for Each Prompt Once
+
+Stores raw AI responses in a SQLite database, keyed by a hash of model,
+prompt and temperature. Re-running the pipeline with the same prompts (after
+a crash, or while iterating on ``_parse_ai_response``) is served from disk
+instead of calling the API again.
+
+The cache is capped in size with least-recently-used eviction, and entries can
+optionally expire after a TTL.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+DEFAULT_AI_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.ai_cache.db')
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+
+
+def cache_key(model: str, prompt: str, temperature: float) -> str:
+    """Hash the request parameters that determine a response."""
+    payload = json.dumps([model, prompt, temperature], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class AIResponseCache:
+    """On-disk cache of AI responses with LRU eviction and optional expiry."""
+
+    def __init__(self, path: str = DEFAULT_AI_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES,
+                 ttl: Optional[float] = None):
+        """Open (or create) the cache.
+
+        Args:
+            path: Path of the SQLite cache file
+            max_bytes: Maximum total size of cached responses before LRU eviction
+            ttl: Seconds after which an entry expires (None keeps entries until evicted)
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                tokens INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._db.commit()
+        self.total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0, 'tokens_avoided': 0, 'evictions': 0}
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a cached response, or None on a miss or expired entry."""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT response, size, tokens, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row and self.ttl is not None and now - row[3] > self.ttl:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                self.total_bytes -= row[1]
+                self.stats['expired'] += 1
+                row = None
+
+            if not row:
+                self.stats['misses'] += 1
+                return None
+
+            self._db.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self.stats['hits'] += 1
+            self.stats['tokens_avoided'] += row[2]
+            return row[0]
+
+    def put(self, key: str, response: str, tokens: int):
+        """Store a response and evict old entries if over the size cap.
+
+        Args:
+            key: Key from ``cache_key``
+            response: Raw response text
+            tokens: Tokens the request cost, reported as avoided on later hits
+        """
+        size = len(response.encode('utf-8'))
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            if row:
+                self.total_bytes -= row[0]
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, response, size, tokens, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, response, size, tokens, now, now)
+            )
+            self.total_bytes += size
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits its size cap."""
+        while self.total_bytes > self.max_bytes:
+            row = self._db.execute("SELECT key, size FROM responses ORDER BY last_access LIMIT 1").fetchone()
+            if not row:
+                break
+            self._db.execute("DELETE FROM responses WHERE key = ?", (row[0],))
+            self.total_bytes -= row[1]
+            self.stats['evictions'] += 1
+
+    def print_summary(self):
+        """Print hit/miss statistics for this run."""
+        hits, misses = self.stats['hits'], self.stats['misses']
+        total = hits + misses
+        hit_rate = (hits / total * 100) if total else 0.0
+        print(f"🧠 AI cache: {hits} hits, {misses} misses ({hit_rate:.1f}% hit rate), "
+              f"{self.stats['tokens_avoided']} tokens avoided, {self.stats['expired']} expired, "
+              f"{self.stats['evictions']} evicted, {self.total_bytes / 1024 / 1024:.1f} MB on disk")
+
+    def close(self):
+        """Close the cache database."""
+        with self._lock:
+            self._db.close()
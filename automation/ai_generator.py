@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+AI Generation Stage - Concurrent, Budgeted LLM Requests
+
+Runs chat completion requests for many calculators at once instead of one
+blocking call per page:
+
+- at most ``concurrency`` requests in flight
+- a tokens-per-minute budget, reserved from an estimate before each request
+  and corrected from the ``usage`` reported by the API
+- optional packing of several small calculators into a single request
+- per-item results: items whose request failed come back as None, so the
+  caller can fall back to templates for just those items
+- an optional response cache (ai_cache.py) checked per prompt before any
+  request is made
+- streamed completions, parsed as they arrive (streaming_json.py): the time
+  to the first usable field is measured, and an interrupted or truncated
+  stream keeps the text received so far, so complete fields can be salvaged
+
+Requests go to an OpenAI-compatible ``/chat/completions`` endpoint through
+the shared HTTP client, so ``api_base`` can point at ai_stub_server.py for
+offline benchmarks.
+"""
+
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import requests
+
+from ai_cache import AIResponseCache, cache_key
+from http_client import DEFAULT_TIMEOUT, create_session
+from rate_limiter import THROTTLE_STATUS_CODES, parse_retry_after
+from streaming_json import StreamingJSONParser, parse_partial_json
+
+DEFAULT_API_BASE = 'https://api.openai.com/v1'
+DEFAULT_MODEL = 'gpt-3.5-turbo'
+DEFAULT_TOKENS_PER_MINUTE = 90000
+
+# Prompts estimated below this many tokens are "small" and may share a request
+PACK_MAX_PROMPT_TOKENS = 400
+
+PACK_HEADER = (
+    "Answer each of the following {count} requests independently. Output a single JSON array "
+    "with exactly {count} elements, where element i is the JSON object requested by request i.\n"
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for budgeting (about four characters per token)."""
+    return len(text) // 4 + 1
+
+
+class TokenBudget:
+    """Tokens-per-minute budget shared by all in-flight requests.
+
+    A token bucket holding at most one minute of tokens. Requests reserve
+    their estimated cost up front (waiting if the bucket is overdrawn) and
+    settle the difference once the real usage is known.
+    """
+
+    def __init__(self, tokens_per_minute: int):
+        self.capacity = float(tokens_per_minute)
+        self.rate = tokens_per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.waited = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, tokens: int) -> float:
+        """Reserve ``tokens``, blocking until the budget allows it.
+
+        Returns:
+            Seconds spent waiting
+        """
+        with self._lock:
+            self._refill()
+            self.tokens -= min(tokens, self.capacity)
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            self.waited += wait
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def settle(self, difference: int):
+        """Charge (or refund, if negative) the gap between actual and estimated usage."""
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens - difference)
+
+
+class Completion(NamedTuple):
+    """Result of one chat completion request."""
+    text: str
+    tokens: int
+    truncated: bool
+    latency: float
+    # Seconds from request start until each top-level JSON member was complete (streamed responses)
+    member_times: List[float]
+
+
+# A queued prompt: (prompt, future for its result, callback applied to the response text)
+_Item = Tuple[str, Future, Optional[Callable[[Optional[str]], Any]]]
+
+
+class AIGenerationStage:
+    """Concurrent chat completion runner with a token budget and request packing."""
+
+    def __init__(self, api_key: str, api_base: str = DEFAULT_API_BASE, model: str = DEFAULT_MODEL,
+                 concurrency: int = 4, tokens_per_minute: int = DEFAULT_TOKENS_PER_MINUTE,
+                 pack_size: int = 1, max_tokens: int = 2000, temperature: float = 0.7,
+                 timeout: float = 120.0, cache: Optional[AIResponseCache] = None, stream: bool = True):
+        """Initialize the stage.
+
+        Args:
+            api_key: API key sent as a bearer token
+            api_base: Base URL of the OpenAI-compatible API
+            model: Chat model name
+            concurrency: Maximum number of requests in flight
+            tokens_per_minute: Token budget shared by all requests
+            pack_size: Maximum number of small prompts sent in one request (1 disables packing)
+            max_tokens: Completion token limit per item
+            temperature: Sampling temperature
+            timeout: Read timeout per request in seconds
+            cache: Response cache consulted before sending a prompt (None disables caching)
+            stream: Stream completions and parse them as they arrive
+        """
+        self.api_key = api_key
+        self.api_base = api_base.rstrip('/')
+        self.model = model
+        self.concurrency = concurrency
+        self.pack_size = max(1, pack_size)
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.max_throttle_retries = 3
+        self.cache = cache
+        self.stream = stream
+
+        self.session = create_session(pool_size=concurrency, timeout=(DEFAULT_TIMEOUT[0], timeout))
+        self.budget = TokenBudget(tokens_per_minute)
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='ai')
+        # Bounds queued work so a fast crawl can't run arbitrarily far ahead of generation
+        self._slots = threading.BoundedSemaphore(concurrency * self.pack_size * 4)
+        self._pack: List[_Item] = []
+        self._lock = threading.Lock()
+
+        self.stats = {'requests': 0, 'items': 0, 'cached_items': 0, 'packed_items': 0, 'failed_items': 0,
+                      'truncated': 0, 'prompt_tokens': 0, 'completion_tokens': 0, 'latency': 0.0}
+        # Seconds from request start to the first complete field, and to the full response, per item
+        self._first_field_latencies: List[float] = []
+        self._item_latencies: List[float] = []
+
+    def submit(self, prompt: str, callback: Optional[Callable[[Optional[str]], Any]] = None) -> Future:
+        """Queue a prompt for generation.
+
+        Cached prompts are answered immediately. Small prompts are held back
+        until ``pack_size`` of them can share a request (call ``flush`` to send
+        a partial pack).
+
+        Args:
+            prompt: User prompt
+            callback: Called with the response text (None if the request failed) on
+                a worker thread, or right away for cached prompts; its return value
+                becomes the future's result
+
+        Returns:
+            Future for the response text, or for the callback's result
+        """
+        if self.cache is not None:
+            cached = self.cache.get(self._cache_key(prompt))
+            if cached is not None:
+                with self._lock:
+                    self.stats['cached_items'] += 1
+                future = Future()
+                try:
+                    future.set_result(callback(cached) if callback else cached)
+                except Exception as e:
+                    future.set_exception(e)
+                return future
+
+        self._slots.acquire()
+        item = (prompt, Future(), callback)
+
+        if self.pack_size > 1 and estimate_tokens(prompt) <= PACK_MAX_PROMPT_TOKENS:
+            with self._lock:
+                self._pack.append(item)
+                if len(self._pack) < self.pack_size:
+                    return item[1]
+                group, self._pack = self._pack, []
+        else:
+            group = [item]
+
+        self._executor.submit(self._run_group, group)
+        return item[1]
+
+    def flush(self):
+        """Send any partially filled pack."""
+        with self._lock:
+            group, self._pack = self._pack, []
+        if group:
+            self._executor.submit(self._run_group, group)
+
+    def run(self, prompts: List[str]) -> List[Optional[str]]:
+        """Generate responses for a list of prompts concurrently.
+
+        Returns:
+            Response text per prompt, in order (None where the request failed)
+        """
+        futures = [self.submit(prompt) for prompt in prompts]
+        self.flush()
+        return [future.result() for future in futures]
+
+    def _run_group(self, group: List[_Item]):
+        """Worker: send one request for a group of items and resolve their futures."""
+        try:
+            if len(group) == 1:
+                completion = self._complete(group[0][0], self.max_tokens)
+                texts = [completion.text]
+            else:
+                texts, completion = self._complete_packed([prompt for prompt, _, _ in group])
+        except Exception as e:
+            print(f"AI generation failed: {e}")
+            texts, completion = [None] * len(group), None
+
+        if self.cache is not None and completion and not completion.truncated:
+            # Packed requests are cached per item, with an equal share of the tokens.
+            # Truncated responses aren't cached so a rerun can get the full answer.
+            for (prompt, _, _), text in zip(group, texts):
+                if text is not None:
+                    self.cache.put(self._cache_key(prompt), text, completion.tokens // len(group))
+
+        with self._lock:
+            self.stats['items'] += len(group)
+            if len(group) > 1:
+                self.stats['packed_items'] += len(group)
+            self.stats['failed_items'] += sum(text is None for text in texts)
+            if completion:
+                # A packed item is usable once its array element is complete
+                if len(group) > 1 and completion.member_times:
+                    self._item_latencies.extend(completion.member_times[:len(group)])
+                else:
+                    self._item_latencies.extend([completion.latency] * len(group))
+
+        for (_, future, callback), text in zip(group, texts):
+            try:
+                future.set_result(callback(text) if callback else text)
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                self._slots.release()
+
+    def _cache_key(self, prompt: str) -> str:
+        return cache_key(self.model, prompt, self.temperature)
+
+    def _complete(self, prompt: str, max_tokens: int, start: str = '{') -> Completion:
+        """Send a single chat completion request under the token budget.
+
+        Args:
+            prompt: User prompt
+            max_tokens: Completion token limit
+            start: JSON container the answer holds ('{' or '['), used to spot complete members while streaming
+
+        Returns:
+            The completion
+        """
+        estimate = estimate_tokens(prompt) + max_tokens
+        self.budget.acquire(estimate)
+
+        payload = {
+            'model': self.model,
+            'messages': [{'role': 'user', 'content': prompt}],
+            'max_tokens': max_tokens,
+            'temperature': self.temperature,
+        }
+        if self.stream:
+            payload['stream'] = True
+            payload['stream_options'] = {'include_usage': True}
+
+        for attempt in range(self.max_throttle_retries + 1):
+            request_start = time.perf_counter()
+            response = self.session.post(
+                f"{self.api_base}/chat/completions",
+                headers={'Authorization': f'Bearer {self.api_key}'},
+                json=payload,
+                stream=self.stream,
+            )
+            if response.status_code not in THROTTLE_STATUS_CODES or attempt == self.max_throttle_retries:
+                break
+            response.close()
+            delay = parse_retry_after(response.headers.get('Retry-After'))
+            time.sleep(delay if delay is not None else 2 ** attempt)
+
+        if not response.ok:
+            response.close()
+        response.raise_for_status()
+
+        member_times: List[float] = []
+        if response.headers.get('Content-Type', '').startswith('text/event-stream'):
+            text, usage, finish_reason = self._read_stream(response, start, request_start, member_times)
+        else:
+            body = response.json()
+            usage = body.get('usage') or {}
+            choice = body['choices'][0]
+            text, finish_reason = choice['message']['content'], choice.get('finish_reason')
+        latency = time.perf_counter() - request_start
+
+        if not usage:
+            usage = {'prompt_tokens': estimate_tokens(prompt), 'completion_tokens': estimate_tokens(text)}
+        total_tokens = usage.get('total_tokens', usage['prompt_tokens'] + usage['completion_tokens'])
+        self.budget.settle(total_tokens - estimate)
+        truncated = finish_reason not in (None, 'stop')
+
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats['prompt_tokens'] += usage.get('prompt_tokens', 0)
+            self.stats['completion_tokens'] += usage.get('completion_tokens', 0)
+            self.stats['latency'] += latency
+            self.stats['truncated'] += truncated
+            if member_times:
+                self._first_field_latencies.append(member_times[0])
+
+        return Completion(text, total_tokens, truncated, latency, member_times)
+
+    def _read_stream(self, response: requests.Response, start: str, request_start: float,
+                     member_times: List[float]) -> Tuple[str, Dict[str, int], Optional[str]]:
+        """Read a server-sent event stream of completion deltas.
+
+        The answer is parsed as it arrives, and the time at which each
+        top-level member (field or array item) became complete is appended to
+        ``member_times``. If the stream breaks off, the text received so far is
+        returned as a truncated response rather than failing the request. A
+        stream that ends without a finish reason or without ``[DONE]`` is
+        treated as truncated too.
+
+        Returns:
+            Response text, usage and finish reason
+        """
+        parser = StreamingJSONParser(start)
+        parts: List[str] = []
+        usage: Dict[str, int] = {}
+        finish_reason = None
+        done = False
+
+        try:
+            for line in response.iter_lines():
+                if not line.startswith(b'data:'):
+                    continue
+                data = line[5:].strip()
+                if data == b'[DONE]':
+                    done = True
+                    break
+                event = json.loads(data)
+                usage = event.get('usage') or usage
+                for choice in event.get('choices') or []:
+                    delta = (choice.get('delta') or {}).get('content')
+                    if delta:
+                        parts.append(delta)
+                        completed = parser.feed(delta)
+                        if completed:
+                            member_times.extend([time.perf_counter() - request_start] * completed)
+                    finish_reason = choice.get('finish_reason') or finish_reason
+        except (requests.RequestException, ValueError) as e:
+            if not parts:
+                raise
+            print(f"⚠️  AI stream interrupted after {sum(map(len, parts))} characters, keeping what arrived: {e}")
+            finish_reason = 'interrupted'
+        else:
+            if finish_reason is None or not done:
+                print(f"⚠️  AI stream ended without {'a finish reason' if done else '[DONE]'} after "
+                      f"{sum(map(len, parts))} characters, treating it as truncated")
+                finish_reason = 'incomplete' if finish_reason in (None, 'stop') else finish_reason
+        finally:
+            response.close()
+
+        return ''.join(parts), usage, finish_reason
+
+    def _complete_packed(self, prompts: List[str]) -> Tuple[List[Optional[str]], Completion]:
+        """Send several prompts in one request and split the JSON array answer.
+
+        Complete answers are kept even if the array is cut off; the missing
+        ones come back as None.
+
+        Returns:
+            Response text per prompt (None if it couldn't be split out) and the completion
+        """
+        combined = PACK_HEADER.format(count=len(prompts)) + ''.join(
+            f"\n### Request {i}\n{prompt.strip()}\n" for i, prompt in enumerate(prompts, 1)
+        )
+        completion = self._complete(combined, self.max_tokens * len(prompts), start='[')
+
+        answers = parse_partial_json(completion.text, '[')
+        if len(answers) > len(prompts):
+            print(f"AI generation failed: packed response holds {len(answers)} answers for {len(prompts)} requests")
+            return [None] * len(prompts), completion
+        if len(answers) < len(prompts):
+            print(f"⚠️  Packed AI response has {len(answers)} of {len(prompts)} answers, "
+                  f"using templates for the rest")
+            completion = completion._replace(truncated=True)
+
+        texts = [json.dumps(answer) if isinstance(answer, dict) else None for answer in answers]
+        return texts + [None] * (len(prompts) - len(texts)), completion
+
+    def summary(self) -> Dict[str, Any]:
+        """Return request, token and fallback counts for this run."""
+        with self._lock:
+            stats = dict(self.stats)
+            first_fields = list(self._first_field_latencies)
+            latencies = sorted(self._item_latencies)
+        stats['budget_wait'] = self.budget.waited
+        stats['first_field_avg'] = statistics.mean(first_fields) if first_fields else None
+        stats['latency_p50'] = latencies[len(latencies) // 2] if latencies else None
+        stats['latency_p95'] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else None
+        return stats
+
+    def print_summary(self):
+        """Print request, token and fallback statistics."""
+        s = self.summary()
+        if self.cache is not None:
+            self.cache.print_summary()
+        if not s['items'] and not s['cached_items']:
+            return
+        average = s['latency'] / s['requests'] if s['requests'] else 0.0
+        print(f"🤖 AI: {s['items']} items in {s['requests']} requests ({s['packed_items']} packed), "
+              f"{s['cached_items']} from cache, "
+              f"{s['failed_items']} fell back to templates, {s['prompt_tokens']}+{s['completion_tokens']} tokens, "
+              f"{average:.2f}s average latency, {s['budget_wait']:.1f}s waiting on the token budget")
+        if s['latency_p50'] is not None:
+            first_field = f"{s['first_field_avg']:.2f}s" if s['first_field_avg'] is not None else 'n/a'
+            print(f"⏱️  AI latency: first usable field after {first_field} on average, full response "
+                  f"p50 {s['latency_p50']:.2f}s / p95 {s['latency_p95']:.2f}s, {s['truncated']} truncated")
+
+    def close(self):
+        """Send any partial pack and stop the worker threads."""
+        self.flush()
+        self._executor.shutdown(wait=True)
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
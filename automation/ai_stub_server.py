@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+AI Stub Server - Offline Stand-in for the Chat Completions API
+
+Answers ``POST /v1/chat/completions`` like the OpenAI API does, after a
+configurable delay, with content built from the calculator titles in the
+prompt (a JSON array for packed requests). Streaming requests get a
+server-sent event stream of small deltas, and a fraction of responses can be
+cut short (``finish_reason: length``) to exercise salvage of partial output.
+Use it to benchmark the AI generation stage without network access or API costs.
+
+Usage:
+    python ai_stub_server.py --port 8090 --latency 0.8
+    python content_generator.py --sitemap https://example.com/sitemap.xml --output /tmp/out \\
+        --openai-key test --ai-base-url http://localhost:8090/v1 --ai-concurrency 16
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+
+
+def build_stub_content(title: str) -> Dict[str, Any]:
+    """Build a plausible generated-content object for a calculator title."""
+    return {
+        'metaDescription': f"Free online {title}. Enter your values to get instant, accurate results.",
+        'instructions': [
+            f"Open the {title} and review the input fields.",
+            "Enter each value in the units shown next to the field.",
+            "Press Calculate to see the result and how it was computed.",
+        ],
+        'examples': [{'input': {'value': '100'}, 'output': f"{title} result for a value of 100"}],
+        'applications': f"Use the {title} whenever you need a quick, reliable answer without manual math.",
+    }
+
+
+class StubServer(ThreadingHTTPServer):
+    """Threaded HTTP server carrying the stub's latency and error settings."""
+
+    daemon_threads = True
+
+    def __init__(self, address, latency: float = 0.5, jitter: float = 0.0, error_rate: float = 0.0,
+                 truncate_rate: float = 0.0, chunk_delay: float = 0.0):
+        super().__init__(address, StubHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.truncate_rate = truncate_rate
+        self.chunk_delay = chunk_delay
+        self.requests = 0
+        self._lock = threading.Lock()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Chat completions endpoint returning canned content."""
+
+    server: StubServer
+
+    def do_POST(self):
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self._send(404, {'error': {'message': 'Not found'}})
+            return
+
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        prompt = body.get('messages', [{}])[-1].get('content', '')
+        with self.server._lock:
+            self.server.requests += 1
+
+        time.sleep(self.server.latency + random.uniform(0, self.server.jitter))
+        if random.random() < self.server.error_rate:
+            self._send(500, {'error': {'message': 'Stub server error'}})
+            return
+
+        titles = re.findall(r'^Title: (.*)$', prompt, re.MULTILINE) or ['Calculator']
+        answers = [build_stub_content(title.strip()) for title in titles]
+        content = json.dumps(answers if len(answers) > 1 else answers[0], indent=2)
+        finish_reason = 'stop'
+        if random.random() < self.server.truncate_rate:
+            content = content[:int(len(content) * random.uniform(0.4, 0.9))]
+            finish_reason = 'length'
+
+        usage = {
+            'prompt_tokens': len(prompt) // 4,
+            'completion_tokens': len(content) // 4,
+            'total_tokens': len(prompt) // 4 + len(content) // 4,
+        }
+        if body.get('stream'):
+            self._stream(body, content, finish_reason, usage)
+            return
+
+        self._send(200, {
+            'id': f"chatcmpl-stub-{self.server.requests}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model', 'stub'),
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content},
+                         'finish_reason': finish_reason}],
+            'usage': usage,
+        })
+
+    def _stream(self, body: Dict[str, Any], content: str, finish_reason: str, usage: Dict[str, int]):
+        """Send the completion as server-sent events, a few characters per delta."""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+
+        def event(choices, **extra):
+            chunk = {'id': f"chatcmpl-stub-{self.server.requests}", 'object': 'chat.completion.chunk',
+                     'model': body.get('model', 'stub'), 'choices': choices, **extra}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+            self.wfile.flush()
+
+        for i in range(0, len(content), 16):
+            event([{'index': 0, 'delta': {'content': content[i:i + 16]}, 'finish_reason': None}])
+            if self.server.chunk_delay:
+                time.sleep(self.server.chunk_delay)
+        event([{'index': 0, 'delta': {}, 'finish_reason': finish_reason}])
+        if (body.get('stream_options') or {}).get('include_usage'):
+            event([], usage=usage)
+        self.wfile.write(b"data: [DONE]\n\n")
+
+    def _send(self, status: int, payload: Dict[str, Any]):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        """Keep benchmark output quiet."""
+
+
+def start_stub_server(port: int = 0, latency: float = 0.5, jitter: float = 0.0, error_rate: float = 0.0,
+                      truncate_rate: float = 0.0, chunk_delay: float = 0.0) -> StubServer:
+    """Start the stub server on a background thread.
+
+    Args:
+        port: Port to listen on (0 picks a free port)
+        latency: Seconds each response is delayed
+        jitter: Extra random delay of up to this many seconds
+        error_rate: Fraction of requests answered with HTTP 500
+        truncate_rate: Fraction of responses cut short with finish_reason "length"
+        chunk_delay: Seconds between streamed deltas
+
+    Returns:
+        The running server; its base URL is ``http://127.0.0.1:<server_port>/v1``
+    """
+    server = StubServer(('127.0.0.1', port), latency, jitter, error_rate, truncate_rate, chunk_delay)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for the chat completions API")
+    parser.add_argument('--port', type=int, default=8090, help='Port to listen on')
+    parser.add_argument('--latency', type=float, default=0.5, help='Seconds each response is delayed')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Extra random delay of up to this many seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with HTTP 500')
+    parser.add_argument('--truncate-rate', type=float, default=0.0,
+                        help='Fraction of responses cut short (finish_reason "length")')
+    parser.add_argument('--chunk-delay', type=float, default=0.0, help='Seconds between streamed deltas')
+
+    args = parser.parse_args()
+
+    server = StubServer(('127.0.0.1', args.port), args.latency, args.jitter, args.error_rate,
+                        args.truncate_rate, args.chunk_delay)
+    print(f"🤖 Stub chat completions API on http://127.0.0.1:{args.port}/v1 "
+          f"({args.latency}s latency, {args.error_rate:.0%} errors)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
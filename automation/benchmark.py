@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Pipeline Micro-Benchmarks
+
+Synthetic, offline benchmarks for the hot paths of the content pipeline.
+Each benchmark compares the current implementation against the previous
+approach on generated input, so no network access is needed.
+
+Usage:
+    python benchmark.py form-fields --inputs 500
+    python benchmark.py instructions --sections 200
+    python benchmark.py parser
+    python benchmark.py ai-generation --items 48 --latency 0.5
+    python benchmark.py templates --records 20000
+    python benchmark.py translation --strings 200 --latency 0.05 --handshake 0.1
+"""
+
+import argparse
+import contextlib
+import io
+import time
+from typing import Any, Callable, Dict, List
+
+from bs4 import BeautifulSoup
+
+from ai_stub_server import start_stub_server
+from content_generator import PARSER_MODES, CalculatorContentGenerator
+from rate_limiter import AdaptiveRateLimiter
+from template_engine import (APPLICATIONS, CALCULATE_INSTRUCTION, CLEAN_DESCRIPTION_RE, EXAMPLE_OUTPUT,
+                             EXAMPLE_RESULTS, FIELD_INSTRUCTION, INSTRUCTION_DETAIL, META_DESCRIPTION,
+                             TemplateEngine)
+from translate_content import DEEPL_AVAILABLE, ContentTranslator
+from translation_stub_server import start_stub_server as start_translation_stub_server
+
+
+def _time_it(func: Callable, repeat: int) -> float:
+    """Return the best wall time of ``repeat`` runs in milliseconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def _report(name: str, baseline_ms: float, current_ms: float):
+    print(f"   Baseline: {baseline_ms:9.2f} ms")
+    print(f"   Current:  {current_ms:9.2f} ms")
+    print(f"✅ {name}: {baseline_ms / current_ms if current_ms else float('inf'):.1f}x faster")
+
+
+def build_form_page(num_inputs: int) -> str:
+    """Build a synthetic calculator page with ``num_inputs`` labelled inputs."""
+    rows = []
+    for i in range(num_inputs):
+        if i % 2:
+            # Labelled through <label for="...">
+            rows.append(f'<div class="row"><label for="field{i}">Field {i} Amount ($)</label>'
+                        f'<input type="number" id="field{i}" name="field{i}"></div>')
+        else:
+            # Unlabelled; falls back to parent text
+            rows.append(f'<div class="row">Value {i} (%) <input type="number" name="value{i}" value="{i}"></div>')
+    return (f'<html><head><title>Benchmark Calculator</title></head><body>'
+            f'<form>{"".join(rows)}<input type="submit" value="Calculate"></form></body></html>')
+
+
+def legacy_extract_form_fields(soup: BeautifulSoup) -> List[Dict[str, str]]:
+    """Previous form field extractor: one document scan per input."""
+    fields = []
+    for input_elem in soup.find_all('input'):
+        input_type = input_elem.get('type', 'text')
+        input_name = input_elem.get('name', '')
+        input_id = input_elem.get('id', '')
+
+        label_text = ""
+        if input_id:
+            label = soup.find('label', attrs={'for': input_id})
+            if label:
+                label_text = label.get_text().strip()
+
+        if not label_text and input_name:
+            parent = input_elem.parent
+            if parent:
+                label_text = parent.get_text().strip()
+                if input_elem.get('value'):
+                    label_text = label_text.replace(input_elem.get('value'), '').strip()
+
+        if input_type not in ['submit', 'button', 'hidden']:
+            fields.append({
+                'name': input_name or f'field_{len(fields)}',
+                'label': label_text or f'Input Field {len(fields) + 1}',
+                'type': input_type,
+                'id': input_id
+            })
+    return fields
+
+
+def bench_form_fields(args: argparse.Namespace):
+    """Compare indexed form field extraction with per-input label lookups."""
+    print(f"🧪 Form field extraction on a synthetic {args.inputs}-input page")
+    soup = BeautifulSoup(build_form_page(args.inputs), 'html.parser')
+    generator = CalculatorContentGenerator(cache_dir=None)
+
+    assert generator._extract_form_fields(soup) == legacy_extract_form_fields(soup)
+
+    baseline = _time_it(lambda: legacy_extract_form_fields(soup), args.repeat)
+    current = _time_it(lambda: generator._extract_form_fields(soup), args.repeat)
+    _report("Form field extraction", baseline, current)
+
+
+def build_content_page(num_sections: int) -> str:
+    """Build a large synthetic page with lists, tables and how-to sections."""
+    sections = []
+    for i in range(num_sections):
+        items = ''.join(f'<li>Step {i}.{j}: enter the value for row {j} carefully</li>' for j in range(8))
+        rows = ''.join(f'<tr><td>Example {i}.{j}</td><td>Principal $1,000 at 5% gives $1,050</td></tr>'
+                       for j in range(8))
+        sections.append(f'<section><div class="how-to"><ol>{items}</ol></div>'
+                        f'<ul class="nav">{items}</ul><table class="examples">{rows}</table>'
+                        f'<p class="calculation">Calculation {i}: 1000 x 1.05 = 1050 for year one</p></section>')
+    return f'<html><body>{"".join(sections)}</body></html>'
+
+
+def legacy_extract_instructions(soup: BeautifulSoup) -> List[str]:
+    """Previous instruction extractor: seven full-document selector passes."""
+    instructions = []
+    for selector in ['.instructions', '.how-to', '.steps', '[class*="instruction"]',
+                     '[class*="step"]', 'ol li', 'ul li']:
+        for elem in soup.select(selector):
+            text = elem.get_text().strip()
+            if len(text) > 10 and text not in instructions:
+                instructions.append(text)
+    return instructions[:10]
+
+
+def legacy_extract_examples(soup: BeautifulSoup) -> List[Dict[str, str]]:
+    """Previous example extractor: five full-document selector passes."""
+    examples = []
+    for selector in ['.example', '.examples', '[class*="example"]', 'table tr', '.calculation']:
+        for elem in soup.select(selector):
+            text = elem.get_text().strip()
+            if len(text) > 20:
+                examples.append({'text': text, 'type': 'existing'})
+    return examples[:5]
+
+
+def bench_instructions(args: argparse.Namespace):
+    """Compare the single-pass instruction/example walk with per-selector scans."""
+    print(f"🧪 Instruction/example extraction on a synthetic {args.sections}-section page")
+    soup = BeautifulSoup(build_content_page(args.sections), 'html.parser')
+    generator = CalculatorContentGenerator(cache_dir=None)
+
+    instructions, examples = generator._extract_instructions_and_examples(soup)
+    assert instructions == legacy_extract_instructions(soup)
+    assert examples == legacy_extract_examples(soup)
+    print(f"   Found {len(instructions)} instructions, {len(examples)} examples")
+
+    baseline = _time_it(lambda: (legacy_extract_instructions(soup), legacy_extract_examples(soup)), args.repeat)
+    current = _time_it(lambda: generator._extract_instructions_and_examples(soup), args.repeat)
+    _report("Instruction/example extraction", baseline, current)
+
+
+def bench_parser(args: argparse.Namespace):
+    """Compare extraction time of each HTML parser mode on a large page."""
+    # Real pages carry a lot of article/navigation markup the extractors never look at
+    article = ''.join(f'<div class="article"><h2>Section {i}</h2><p>Paragraph {i} explains the formula '
+                      f'<a href="/link{i}">in <b>detail</b></a> with <span>inline</span> markup.</p></div>'
+                      for i in range(args.sections * 20))
+    page = build_content_page(args.sections).replace(
+        '<html><body>', build_form_page(args.inputs).replace('</form></body></html>', '</form>') + article, 1
+    ).encode('utf-8')
+    print(f"🧪 Page extraction per parser mode on a synthetic {len(page) / 1024:.0f} KB page")
+
+    timings = {}
+    for mode in PARSER_MODES:
+        generator = CalculatorContentGenerator(cache_dir=None, parser=mode)
+        with contextlib.redirect_stdout(io.StringIO()):
+            timings[mode] = _time_it(lambda: generator.extract_from_html('https://example.com/bench', page, 'utf-8'),
+                                     args.repeat)
+        print(f"   {mode:16s} {timings[mode]:9.2f} ms")
+
+    fastest = min(timings, key=timings.get)
+    print(f"✅ Fastest: {fastest} ({timings['html.parser'] / timings[fastest]:.1f}x faster than html.parser)")
+
+
+def bench_ai_generation(args: argparse.Namespace):
+    """Compare serial AI generation with the concurrent and packed AI stage on a stub API."""
+    server = start_stub_server(latency=args.latency)
+    base_url = f"http://127.0.0.1:{server.server_port}/v1"
+    items = [{'title': f'Benchmark {i} Calculator', 'description': f'Calculates benchmark value {i}.',
+              'form_fields': [{'name': 'value', 'label': 'Value', 'type': 'number', 'id': 'value'}]}
+             for i in range(args.items)]
+    print(f"🧪 AI generation of {args.items} calculators against a stub API with {args.latency}s latency")
+
+    configurations = [
+        ('serial (one request per page)', 1, 1),
+        (f'concurrent x{args.concurrency}', args.concurrency, 1),
+        (f'concurrent x{args.concurrency}, packed x{args.pack}', args.concurrency, args.pack),
+    ]
+    timings = {}
+    for name, concurrency, pack_size in configurations:
+        generator = CalculatorContentGenerator(api_key='benchmark', cache_dir=None, journal_path=None,
+                                               manifest_path=None, archive_dir=None, ai_cache_path=None,
+                                               ai_base_url=base_url,
+                                               ai_concurrency=concurrency, ai_pack_size=pack_size)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            if concurrency == 1 and pack_size == 1:
+                results = [generator.generate_expanded_content(item) for item in items]
+            else:
+                results = generator.generate_expanded_content_batch(items)
+        timings[name] = time.perf_counter() - start
+        stats = generator.ai_stage.summary()
+        generator.ai_stage.close()
+
+        assert stats['failed_items'] == 0 and len(results) == len(items)
+        print(f"   {name:32s} {timings[name]:7.2f} s  {len(items) / timings[name]:7.1f} items/s  "
+              f"{stats['requests']} requests")
+
+    server.shutdown()
+    baseline = timings[configurations[0][0]]
+    best = min(timings, key=timings.get)
+    print(f"✅ Fastest: {best} ({baseline / timings[best]:.1f}x faster than serial)")
+
+
+def build_extracted_records(count: int) -> List[Dict[str, Any]]:
+    """Build synthetic extracted records resembling crawled calculator pages."""
+    field_sets = [
+        [{'name': 'loan_amount', 'label': 'Loan Amount ($)', 'type': 'number', 'id': 'amount'},
+         {'name': 'interest_rate', 'label': 'Interest Rate (%)', 'type': 'number', 'id': 'rate'},
+         {'name': 'term_months', 'label': 'Term (months)', 'type': 'number', 'id': 'term'}],
+        [{'name': 'weight', 'label': 'Weight', 'type': 'number', 'id': 'weight'},
+         {'name': 'height', 'label': 'Height', 'type': 'number', 'id': 'height'},
+         {'name': 'units', 'label': 'Units', 'type': 'radio', 'id': 'units'}],
+        [{'name': f'value{i}', 'label': f'Value {i}', 'type': 'number', 'id': f'value{i}'} for i in range(5)],
+    ]
+    records = []
+    for i in range(count):
+        record = {
+            'title': f'Benchmark {i} Calculator',
+            'description': (f'Calculate benchmark value {i} quickly & accurately (with formulas, '
+                            f'worked examples and explanations).') if i % 2 else '',
+            'form_fields': field_sets[i % len(field_sets)],
+            'existing_instructions': [],
+            'existing_examples': [],
+        }
+        if i % 5 == 0:
+            record['existing_instructions'] = [f'Enter the value for step {j}' for j in range(3)]
+            record['existing_examples'] = [{'text': f'Example {i}: 10 x 5 = 50', 'type': 'existing'}]
+        records.append(record)
+    return records
+
+
+def legacy_render_templates(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Previous per-record template generation: every string rebuilt for each record."""
+    title = data.get('title', 'Calculator')
+    description = data.get('description', '')
+    form_fields = data.get('form_fields', [])
+
+    if description and len(description) > 50:
+        meta_desc = CLEAN_DESCRIPTION_RE.sub('', description)
+        if len(meta_desc) > 140:
+            meta_desc = meta_desc[:137] + "..."
+    else:
+        base_desc = META_DESCRIPTION.format(title=title.lower())
+        meta_desc = base_desc[:155] + "..." if len(base_desc) > 155 else base_desc
+
+    instructions = []
+    existing = data.get('existing_instructions', [])
+    if existing:
+        for instr in existing[:4]:
+            if len(instr) <= 100:
+                instr = (instr if instr.endswith('.') else instr + '.') + INSTRUCTION_DETAIL
+            instructions.append(instr)
+    else:
+        for i, field in enumerate(form_fields[:4]):
+            instructions.append(FIELD_INSTRUCTION.format(label=field.get('label', f'Field {i+1}').lower()))
+    instructions.append(CALCULATE_INSTRUCTION)
+
+    examples = [example for example in data.get('existing_examples', [])[:3]
+                if 'input' in example or 'text' in example]
+    while len(examples) < 3:
+        index = len(examples)
+        inputs = {}
+        for field in form_fields[:3]:
+            field_name = field.get('name', f'field_{len(inputs)}')
+            if field.get('type', 'number') == 'number':
+                if 'amount' in field_name.lower() or 'price' in field_name.lower():
+                    inputs[field_name] = [1000, 5000, 10000][index % 3]
+                elif 'rate' in field_name.lower() or 'percent' in field_name.lower():
+                    inputs[field_name] = [3.5, 5.0, 7.5][index % 3]
+                elif 'month' in field_name.lower() or 'year' in field_name.lower():
+                    inputs[field_name] = [12, 24, 36][index % 3]
+                else:
+                    inputs[field_name] = [10, 25, 50][index % 3]
+            else:
+                inputs[field_name] = f"Sample {field_name}"
+        examples.append({
+            'input': inputs,
+            'output': EXAMPLE_OUTPUT.format(number=index + 1, result=EXAMPLE_RESULTS[index % 3]),
+            'type': 'generated'
+        })
+
+    return {
+        'title': title,
+        'metaDescription': meta_desc,
+        'instructions': instructions,
+        'examples': examples,
+        'applications': APPLICATIONS.format(calculator_type=title.lower().replace(' calculator', '')),
+        'formFields': form_fields
+    }
+
+
+def bench_templates(args: argparse.Namespace):
+    """Compare bulk rendering with the precompiled engine against per-record template generation."""
+    print(f"🧪 Template generation for {args.records} synthetic calculators")
+    records = build_extracted_records(args.records)
+    engine = TemplateEngine()
+
+    assert engine.render_batch(records) == [legacy_render_templates(r) for r in records]
+
+    baseline = _time_it(lambda: [legacy_render_templates(r) for r in records], args.repeat)
+    current = _time_it(lambda: engine.render_batch(records), args.repeat)
+    print(f"   Per-record: {args.records / baseline * 1000:12,.0f} calculators/s")
+    print(f"   Bulk:       {args.records / current * 1000:12,.0f} calculators/s")
+    _report("Template generation", baseline, current)
+
+
+def bench_translation(args: argparse.Namespace):
+    """Compare a new DeepL client per string with pooled clients and batched requests on a stub API."""
+    if not DEEPL_AVAILABLE:
+        print("⚠️  deepl not installed (pip install deepl)")
+        return
+    import deepl
+
+    server = start_translation_stub_server(latency=args.latency, handshake=args.handshake)
+    server_url = f"http://127.0.0.1:{server.server_port}"
+    texts = [f'Benchmark label {i}' for i in range(args.strings)]
+    print(f"🧪 Translation of {args.strings} strings against a stub DeepL API with {args.latency}s latency "
+          f"and {args.handshake}s per new connection")
+
+    def new_client_per_string():
+        return [deepl.Translator('benchmark', server_url=server_url).translate_text(
+            text, source_lang='EN', target_lang='ES').text for text in texts]
+
+    def translator():
+        translator = ContentTranslator('deepl', api_key='benchmark', server_url=server_url, memory_path=None)
+        # Measure the clients, not the pacing
+        translator.rate_limiter = AdaptiveRateLimiter(initial_rate=1000.0, max_rate=1000.0)
+        return translator
+
+    pooled = translator()
+    batched = translator()
+    configurations = [
+        ('new client per string', new_client_per_string),
+        ('pooled client per string', lambda: [pooled.translate_text(text, 'es') for text in texts]),
+        ('pooled client, batched', lambda: batched.translate_texts(texts, 'es')),
+    ]
+    timings = {}
+    for name, func in configurations:
+        requests_before, connections_before = server.requests, server.connections
+        start = time.perf_counter()
+        results = func()
+        timings[name] = time.perf_counter() - start
+
+        assert results == [f'[ES] {text}' for text in texts]
+        print(f"   {name:26s} {timings[name]:7.2f} s  {len(texts) / timings[name]:8.1f} strings/s  "
+              f"{server.requests - requests_before:5d} requests  "
+              f"{server.connections - connections_before:5d} connections")
+
+    server.shutdown()
+    baseline = timings[configurations[0][0]]
+    best = min(timings, key=timings.get)
+    print(f"✅ Fastest: {best} ({baseline / timings[best]:.1f}x faster than a new client per string)")
+
+
+BENCHMARKS = {
+    'form-fields': bench_form_fields,
+    'instructions': bench_instructions,
+    'parser': bench_parser,
+    'ai-generation': bench_ai_generation,
+    'templates': bench_templates,
+    'translation': bench_translation,
+}
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(description="Run content pipeline micro-benchmarks")
+    parser.add_argument('benchmark', choices=sorted(BENCHMARKS), help='Benchmark to run')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per implementation (best time is reported)')
+    parser.add_argument('--inputs', type=int, default=500, help='Number of inputs on the synthetic form page')
+    parser.add_argument('--sections', type=int, default=200, help='Number of content sections on the synthetic page')
+    parser.add_argument('--items', type=int, default=48, help='Number of calculators for the AI generation benchmark')
+    parser.add_argument('--latency', type=float, default=0.5, help='Stub API latency in seconds')
+    parser.add_argument('--concurrency', type=int, default=8, help='AI requests in flight for the AI benchmark')
+    parser.add_argument('--pack', type=int, default=4, help='Calculators per packed AI request')
+    parser.add_argument('--records', type=int, default=20000, help='Number of records for the template benchmark')
+    parser.add_argument('--strings', type=int, default=200, help='Number of strings for the translation benchmark')
+    parser.add_argument('--handshake', type=float, default=0.1,
+                        help='Stub translation API delay per new connection in seconds')
+
+    args = parser.parse_args()
+    BENCHMARKS[args.benchmark](args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Client Pool - Long-Lived Translation Backend Clients
+
+Translation libraries are cheap to call but expensive to construct: each
+``deepl.Translator`` or googletrans ``Translator`` sets up its own HTTP session,
+so building one per string pays a new connection (and TLS handshake) every
+time. A ``ClientPool`` creates up to ``size`` clients lazily and hands them out
+one caller at a time, so connections stay open across calls and clients that
+aren't thread-safe are never shared between threads.
+
+Each checkout is timed, giving per-call latency stats for the backend.
+
+Usage:
+    pool = ClientPool(lambda: deepl.Translator(api_key), size=4)
+    with pool.client() as translator:
+        translator.translate_text(texts, target_lang='ES')
+"""
+
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List
+
+DEFAULT_POOL_SIZE = 4
+
+
+class ClientPool:
+    """Bounded pool of reusable backend clients with per-call latency stats."""
+
+    def __init__(self, factory: Callable[[], Any], size: int = DEFAULT_POOL_SIZE):
+        """Initialize an empty pool.
+
+        Args:
+            factory: Creates a new client
+            size: Maximum number of clients; callers wait when all are in use
+        """
+        self.factory = factory
+        self.size = max(1, size)
+        self.created = 0
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._latencies: List[float] = []
+        self.stats = {'calls': 0, 'waits': 0, 'setup': 0.0}
+
+    @contextmanager
+    def client(self) -> Iterator[Any]:
+        """Check out a client for one call and return it to the pool afterwards."""
+        instance = self._checkout()
+        start = time.perf_counter()
+        try:
+            yield instance
+        finally:
+            elapsed = time.perf_counter() - start
+            self._idle.put(instance)
+            with self._lock:
+                self.stats['calls'] += 1
+                self._latencies.append(elapsed)
+
+    def _checkout(self) -> Any:
+        """Take an idle client, create one if below the size limit, or wait for one."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            create = self.created < self.size
+            if create:
+                self.created += 1
+            else:
+                self.stats['waits'] += 1
+        if not create:
+            return self._idle.get()
+
+        start = time.perf_counter()
+        try:
+            instance = self.factory()
+        except Exception:
+            with self._lock:
+                self.created -= 1
+            raise
+        with self._lock:
+            self.stats['setup'] += time.perf_counter() - start
+        return instance
+
+    def summary(self) -> Dict[str, Any]:
+        """Pool size, clients created, calls and call latency (average, p50, p95) in seconds."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            stats = dict(self.stats)
+
+        def percentile(p: float) -> float:
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p))] if latencies else 0.0
+
+        return {
+            'size': self.size,
+            'created': self.created,
+            **stats,
+            'latency_avg': sum(latencies) / len(latencies) if latencies else 0.0,
+            'latency_p50': percentile(0.5),
+            'latency_p95': percentile(0.95),
+        }
+
+    def print_summary(self, name: str = 'client'):
+        """Print pool usage and per-call latency."""
+        stats = self.summary()
+        print(f"🔌 {name} pool: {stats['created']}/{stats['size']} clients created "
+              f"({stats['setup'] * 1000:.0f} ms setup), {stats['calls']} calls, "
+              f"latency avg {stats['latency_avg'] * 1000:.0f} ms / p50 {stats['latency_p50'] * 1000:.0f} ms / "
+              f"p95 {stats['latency_p95'] * 1000:.0f} ms, {stats['waits']} waits for a free client")
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Content Audit - Near-Duplicate Detection with MinHash LSH
+
+Finds boilerplate in the calculator corpus: text fields that are the same or
+nearly the same across many calculators (template output, stamped SEO
+benefits/steps/FAQs), and whole language sections that read like copies of
+each other.
+
+Every text field of every language section in ``content/calculators/*.json`` is
+split into word shingles and summarized by a MinHash signature (one-permutation
+hashing, so each text costs a single pass over its shingles). Signatures are
+banded into an LSH index, and only texts that share a bucket are compared, so
+the audit scales roughly linearly with the corpus instead of comparing every
+pair of texts.
+
+Usage:
+    python content_audit.py
+    python content_audit.py --threshold 0.7 --languages en,es --report /tmp/duplicates.json
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from slug_index import DEFAULT_CONTENT_DIR
+
+# Fields holding identifiers or references rather than prose
+SKIPPED_KEYS = ('slug', 'relatedCalculators', 'options', 'componentName', 'component')
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+# Added to a borrowed value per bin skipped during densification, so borrowed values stay distinct
+_DENSIFY_OFFSET = 1 << 64
+
+
+class TextField(NamedTuple):
+    """One text field of one language section."""
+    file: str
+    language: str
+    path: str
+    text: str
+
+
+def field_pattern(path: str) -> str:
+    """Field path with list indices removed, e.g. ``seoContent.faqs[].answer``."""
+    return re.sub(r'\[\d+\]', '[]', path)
+
+
+def iter_text_fields(data: Any, path: str = '') -> Iterator[Tuple[str, str]]:
+    """Yield (path, text) for every text field of a language section.
+
+    Lists of strings (steps, benefits, keywords) are joined into one text, since
+    they are written and stamped as a block; other strings are yielded one by one.
+    """
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if key not in SKIPPED_KEYS:
+                yield from iter_text_fields(value, f"{path}.{key}" if path else key)
+    elif isinstance(data, list):
+        if data and all(isinstance(item, str) for item in data):
+            yield path, '\n'.join(data)
+        else:
+            for i, item in enumerate(data):
+                yield from iter_text_fields(item, f"{path}[{i}]")
+    elif isinstance(data, str):
+        yield path, data
+
+
+def load_fields(content_dir: str, languages: Optional[List[str]] = None,
+                min_words: int = 5) -> List[TextField]:
+    """Collect the text fields of all calculator files.
+
+    Args:
+        content_dir: Directory of calculator JSON files (merged multi-language format,
+            or single-language files as written by content_generator.py)
+        languages: Only audit these language sections (None audits all)
+        min_words: Skip texts shorter than this many words (labels, units, names)
+
+    Returns:
+        Text fields in file order
+    """
+    fields = []
+    for filepath in sorted(glob.glob(os.path.join(content_dir, '*.json'))):
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Skipping {filepath}: {e}")
+            continue
+        if not isinstance(data, dict):
+            continue
+
+        filename = os.path.basename(filepath)
+        # Merged files have one section per two-letter language code
+        sections = {key: value for key, value in data.items() if len(key) == 2 and isinstance(value, dict)}
+        if not sections:
+            sections = {'': data}
+
+        for language, section in sections.items():
+            if languages and language not in languages:
+                continue
+            for path, text in iter_text_fields(section):
+                if len(WORD_RE.findall(text)) >= min_words:
+                    fields.append(TextField(filename, language, path, text))
+    return fields
+
+
+def shingle(text: str, size: int = 3) -> Set[int]:
+    """Hash the overlapping word n-grams of a text (the whole text if it is shorter)."""
+    words = WORD_RE.findall(text.lower())
+    grams = [' '.join(words[i:i + size]) for i in range(max(1, len(words) - size + 1))]
+    return {int.from_bytes(hashlib.blake2b(gram.encode('utf-8'), digest_size=8).digest(), 'little')
+            for gram in grams}
+
+
+class MinHashLSH:
+    """Clusters near-duplicate texts with MinHash signatures and banded LSH."""
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 64, rows: int = 4):
+        """Initialize an empty index.
+
+        Args:
+            threshold: Minimum Jaccard similarity of shingle sets for two texts to be clustered
+            num_perm: Signature length
+            rows: Signature rows per LSH band; fewer rows find more candidates
+        """
+        if num_perm % rows:
+            raise ValueError("num_perm must be a multiple of rows")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.rows = rows
+
+        self._shingles: List[Set[int]] = []
+        self._buckets: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        self.stats = {'texts': 0, 'candidates': 0, 'comparisons': 0}
+
+    def signature(self, shingles: Set[int]) -> List[int]:
+        """One-permutation MinHash: each shingle hash lands in one bin, and each bin keeps its minimum.
+
+        Empty bins borrow the value of the next non-empty bin (densification),
+        so short texts still get a complete signature.
+        """
+        n = self.num_perm
+        bins: List[Optional[int]] = [None] * n
+        for h in shingles:
+            i, value = h % n, h // n
+            if bins[i] is None or value < bins[i]:
+                bins[i] = value
+
+        signature = [0] * n
+        following, distance = None, 0
+        # Two passes from the right so empty bins at the end wrap around to the start
+        for i in list(range(n - 1, -1, -1)) * 2:
+            if bins[i] is not None:
+                following, distance = bins[i], 0
+                signature[i] = following
+            elif following is not None:
+                distance += 1
+                signature[i] = following + distance * _DENSIFY_OFFSET
+        return signature
+
+    def add(self, shingles: Set[int]) -> int:
+        """Index a text by its shingle set (see ``shingle``).
+
+        Returns:
+            Id of the text in this index
+        """
+        text_id = len(self._shingles)
+        self._shingles.append(shingles)
+        signature = self.signature(shingles)
+        for band in range(self.num_perm // self.rows):
+            rows = tuple(signature[band * self.rows:(band + 1) * self.rows])
+            self._buckets[(band, hash(rows))].append(text_id)
+        self.stats['texts'] += 1
+        return text_id
+
+    def shingles(self, text_id: int) -> Set[int]:
+        """Shingle set of an indexed text."""
+        return self._shingles[text_id]
+
+    def similarity(self, a: int, b: int) -> float:
+        """Jaccard similarity of two indexed texts' shingle sets."""
+        first, second = self._shingles[a], self._shingles[b]
+        union = len(first | second)
+        return len(first & second) / union if union else 1.0
+
+    def clusters(self) -> List[List[int]]:
+        """Group indexed texts into near-duplicate clusters.
+
+        Each bucket's members are compared with the bucket's first member only,
+        so the work stays linear in the bucket size even when thousands of
+        templated texts share a bucket.
+
+        Returns:
+            Clusters of two or more text ids, largest first
+        """
+        parent = list(range(len(self._shingles)))
+
+        def find(x: int) -> int:
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        for members in self._buckets.values():
+            if len(members) < 2:
+                continue
+            first = members[0]
+            for other in members[1:]:
+                self.stats['candidates'] += 1
+                if find(first) == find(other):
+                    continue
+                self.stats['comparisons'] += 1
+                if self.similarity(first, other) >= self.threshold:
+                    parent[find(other)] = find(first)
+
+        groups: Dict[int, List[int]] = defaultdict(list)
+        for text_id in range(len(parent)):
+            groups[find(text_id)].append(text_id)
+        return sorted((group for group in groups.values() if len(group) > 1), key=len, reverse=True)
+
+
+def _cluster_groups(keys: List[Any], shingles: Callable[[int], Set[int]],
+                    index: MinHashLSH) -> Tuple[List[List[int]], List[int]]:
+    """Index each distinct item once and cluster the items.
+
+    Args:
+        keys: Per item, a key that is equal for exact duplicates
+        shingles: Returns the shingle set of the item at a position
+        index: Empty index to fill
+
+    Returns:
+        Clusters of item positions (exact and near duplicates, largest first), and
+        the index id of each item
+    """
+    distinct: Dict[Any, int] = {}
+    ids: List[int] = []
+    positions: List[List[int]] = []
+    for position, key in enumerate(keys):
+        text_id = distinct.get(key)
+        if text_id is None:
+            text_id = distinct[key] = index.add(shingles(position))
+            positions.append([])
+        positions[text_id].append(position)
+        ids.append(text_id)
+
+    near = index.clusters()
+    clustered = {text_id for cluster in near for text_id in cluster}
+    groups = [[p for text_id in cluster for p in positions[text_id]] for cluster in near]
+    # Exact copies that have no near duplicates are clusters of their own
+    groups += [members for text_id, members in enumerate(positions) if len(members) > 1 and text_id not in clustered]
+    return sorted(groups, key=len, reverse=True), ids
+
+
+def audit(content_dir: str = DEFAULT_CONTENT_DIR, languages: Optional[List[str]] = None,
+          threshold: float = 0.8, page_threshold: float = 0.7, num_perm: int = 64, rows: int = 4,
+          shingle_size: int = 3, min_words: int = 5) -> Dict[str, Any]:
+    """Find near-duplicate fields and pages in the calculator corpus.
+
+    Args:
+        content_dir: Directory of calculator JSON files
+        languages: Only audit these language sections (None audits all)
+        threshold: Minimum Jaccard similarity for two fields to be near duplicates
+        page_threshold: Minimum Jaccard similarity for two language sections to be near duplicates
+        num_perm: MinHash signature length
+        rows: Signature rows per LSH band
+        shingle_size: Words per shingle
+        min_words: Skip texts shorter than this many words
+
+    Returns:
+        Report with field clusters, page clusters and per-field duplication rates
+    """
+    fields = load_fields(content_dir, languages, min_words)
+
+    field_index = MinHashLSH(threshold, num_perm, rows)
+    groups, field_ids = _cluster_groups([' '.join(WORD_RE.findall(field.text.lower())) for field in fields],
+                                        lambda position: shingle(fields[position].text, shingle_size), field_index)
+    field_clusters = []
+    duplicated: Counter = Counter()
+    for group in groups:
+        members = [fields[position] for position in group]
+        files = {member.file for member in members}
+        if len(files) < 2:
+            # Repeats within a single calculator aren't cross-page boilerplate
+            continue
+        patterns = Counter(field_pattern(member.path) for member in members)
+        for member in members:
+            duplicated[(member.language, field_pattern(member.path))] += 1
+        field_clusters.append({
+            'size': len(members),
+            'files': len(files),
+            'languages': sorted({member.language for member in members}),
+            'fields': dict(patterns.most_common()),
+            'sample': members[0].text,
+            'members': [[member.file, member.language, member.path] for member in members],
+        })
+
+    # Whole language sections, compared by the union of their fields' shingles
+    pages: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+    for field, text_id in zip(fields, field_ids):
+        pages[(field.file, field.language)].append(text_id)
+    page_keys = list(pages)
+    page_index = MinHashLSH(page_threshold, num_perm, rows)
+    page_groups, _ = _cluster_groups(
+        [tuple(pages[key]) for key in page_keys],
+        lambda position: set().union(*(field_index.shingles(text_id) for text_id in pages[page_keys[position]])),
+        page_index
+    )
+    page_clusters = [{'size': len(group), 'pages': [list(page_keys[position]) for position in group]}
+                     for group in page_groups]
+
+    totals = Counter((field.language, field_pattern(field.path)) for field in fields)
+    duplication = sorted(
+        ({'language': language, 'field': pattern, 'occurrences': count,
+          'duplicated': duplicated[(language, pattern)], 'rate': duplicated[(language, pattern)] / count}
+         for (language, pattern), count in totals.items()),
+        key=lambda row: (row['duplicated'], row['rate']), reverse=True
+    )
+
+    return {
+        'files': len({field.file for field in fields}),
+        'fields': len(fields),
+        'distinct_fields': field_index.stats['texts'],
+        'duplicated_fields': sum(cluster['size'] for cluster in field_clusters),
+        'field_clusters': field_clusters,
+        'page_clusters': page_clusters,
+        'duplication_by_field': duplication,
+        'lsh': {'fields': field_index.stats, 'pages': page_index.stats},
+    }
+
+
+def print_report(report: Dict[str, Any], top: int = 10):
+    """Print the largest clusters and the most duplicated fields."""
+    print(f"🔎 Audited {report['fields']} text fields in {report['files']} files "
+          f"({report['distinct_fields']} distinct texts)")
+    stats = report['lsh']['fields']
+    print(f"🧮 LSH: {stats['candidates']} candidate pairs, {stats['comparisons']} compared "
+          f"(all pairs would be {stats['texts'] * (stats['texts'] - 1) // 2})")
+    share = report['duplicated_fields'] / report['fields'] * 100 if report['fields'] else 0.0
+    print(f"📋 {report['duplicated_fields']} fields ({share:.1f}%) are in {len(report['field_clusters'])} "
+          f"near-duplicate clusters shared across calculators")
+
+    for cluster in report['field_clusters'][:top]:
+        fields = ', '.join(f"{pattern} ×{count}" for pattern, count in list(cluster['fields'].items())[:3])
+        sample = ' '.join(cluster['sample'].split())
+        print(f"\n   {cluster['size']} copies in {cluster['files']} files [{', '.join(cluster['languages'])}]: {fields}")
+        print(f"   \"{sample[:100]}{'...' if len(sample) > 100 else ''}\"")
+
+    print("\n📊 Most duplicated fields:")
+    for row in [row for row in report['duplication_by_field'] if row['duplicated']][:top]:
+        language = f"{row['language']} " if row['language'] else ''
+        print(f"   {language}{row['field']}: {row['duplicated']}/{row['occurrences']} ({row['rate']:.0%})")
+
+    print(f"\n📄 {len(report['page_clusters'])} clusters of near-duplicate pages")
+    for cluster in report['page_clusters'][:top]:
+        pages = ', '.join(f"{file} [{language}]" if language else file for file, language in cluster['pages'][:4])
+        more = f" and {cluster['size'] - 4} more" if cluster['size'] > 4 else ''
+        print(f"   {cluster['size']} pages: {pages}{more}")
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(description="Report near-duplicate calculator content with MinHash LSH")
+    parser.add_argument('--content-dir', default=DEFAULT_CONTENT_DIR, help='Directory of calculator JSON files')
+    parser.add_argument('--languages', help='Comma-separated language sections to audit (default: all)')
+    parser.add_argument('--threshold', type=float, default=0.8,
+                        help='Minimum Jaccard similarity for near-duplicate fields')
+    parser.add_argument('--page-threshold', type=float, default=0.7,
+                        help='Minimum Jaccard similarity for near-duplicate pages')
+    parser.add_argument('--num-perm', type=int, default=64, help='MinHash signature length')
+    parser.add_argument('--rows', type=int, default=4, help='Signature rows per LSH band')
+    parser.add_argument('--shingle', type=int, default=3, help='Words per shingle')
+    parser.add_argument('--min-words', type=int, default=5, help='Skip texts shorter than this many words')
+    parser.add_argument('--top', type=int, default=10, help='Number of clusters and fields to print')
+    parser.add_argument('--report', help='Write the full report (every cluster member) to this JSON file')
+
+    args = parser.parse_args()
+
+    report = audit(args.content_dir, args.languages.split(',') if args.languages else None,
+                   args.threshold, args.page_threshold, args.num_perm, args.rows, args.shingle, args.min_words)
+    print_report(report, args.top)
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Full report: {args.report}")
+
+
+if __name__ == '__main__':
+    main()
@@ -10,66 +10,252 @@ This script automates the process of:
 
 Usage:
     python content_generator.py --sitemap https://www.calculatorsoup.com/sitemap.xml --output /content/en/calculators/
+    python content_generator.py --from-archive --output /content/en/calculators/   # offline re-run
+    python content_generator.py --sitemap https://www.calculatorsoup.com/sitemap.xml --output /content/en/calculators/ \
+        --pipeline --concurrency 8   # overlapped fetch/parse/generate/write stages
 """
 
 import argparse
+import asyncio
 import json
+import multiprocessing
 import os
 import re
+import threading
 import time
-from typing import Dict, List, Optional, Any
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Tuple
 from urllib.parse import urljoin, urlparse
-from xml.etree import ElementTree as ET
 
 import requests
-from bs4 import BeautifulSoup
-import openai  # For content generation (optional)
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+
+try:
+    import lxml  # noqa: F401  (fast BeautifulSoup backend)
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+from ai_cache import DEFAULT_AI_CACHE_PATH, AIResponseCache
+from ai_generator import DEFAULT_API_BASE, DEFAULT_MODEL, DEFAULT_TOKENS_PER_MINUTE, AIGenerationStage
+from content_manifest import DEFAULT_MANIFEST_PATH, ContentManifest, content_hash
+from crawl_journal import DEFAULT_JOURNAL_PATH, STATES, CrawlJournal
+from http_client import DEFAULT_POOL_SIZE, DEFAULT_TIMEOUT, create_session
+from http_cache import DEFAULT_CACHE_DIR, HTTPCache
+from json_writer import JSONWriter
+from page_archive import DEFAULT_ARCHIVE_DIR, PageArchive
+from rate_limiter import THROTTLE_STATUS_CODES, AdaptiveRateLimiter
+from sitemap_reader import SitemapEntry, iter_sitemap
+from slug_index import DEFAULT_CONTENT_DIR, SlugIndex, slugify
+from staged_pipeline import DEFAULT_QUEUE_SIZE, Stage, StagedPipeline
+from streaming_json import parse_partial_json
+from template_engine import TemplateEngine
+
+# Limits for instructions/examples scraped from the source page
+MAX_EXISTING_INSTRUCTIONS = 10
+MAX_EXISTING_EXAMPLES = 5
+
+# Fields requested from the AI model, in prompt order
+AI_FIELDS = ('metaDescription', 'instructions', 'examples', 'applications')
+
+# HTML parser modes: BeautifulSoup backend and whether to parse only the regions the extractors use
+PARSER_MODES = {
+    'html.parser': ('html.parser', False),
+    'lxml': ('lxml', False),
+    'lxml-restricted': ('lxml', True),
+}
+
+# Regions kept by restricted parsing: head (title/meta), headings, forms, labels, lists and tables
+RESTRICTED_PARSE_TAGS = ['head', 'h1', 'form', 'input', 'label', 'ol', 'ul', 'table']
+
+CHARSET_RE = re.compile(r'charset\s*=\s*["\']?([^"\';\s]+)', re.IGNORECASE)
+
+
+def declared_encoding(content_type: Optional[str]) -> Optional[str]:
+    """Charset explicitly declared by a Content-Type header, if any.
+
+    ``response.encoding`` falls back to ISO-8859-1 for text/html without a
+    charset, which would override the page's own ``<meta charset>``; pages
+    without a declared charset are left to BeautifulSoup's detection instead.
+    """
+    match = CHARSET_RE.search(content_type or '')
+    return match.group(1) if match else None
 
 
 class CalculatorContentGenerator:
     """Main class for automated calculator content generation."""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+                 cache_max_mb: int = 500, parser: str = 'html.parser',
+                 journal_path: Optional[str] = DEFAULT_JOURNAL_PATH,
+                 manifest_path: Optional[str] = DEFAULT_MANIFEST_PATH,
+                 max_rate: float = 10.0, pool_size: int = DEFAULT_POOL_SIZE,
+                 timeout: float = DEFAULT_TIMEOUT[1], http2: bool = False,
+                 archive_dir: Optional[str] = DEFAULT_ARCHIVE_DIR, ai_base_url: str = DEFAULT_API_BASE,
+                 ai_model: str = DEFAULT_MODEL, ai_concurrency: int = 4,
+                 ai_tokens_per_minute: int = DEFAULT_TOKENS_PER_MINUTE, ai_pack_size: int = 1,
+                 ai_cache_path: Optional[str] = DEFAULT_AI_CACHE_PATH, ai_cache_max_mb: int = 100,
+                 ai_cache_ttl: Optional[float] = None, ai_stream: bool = True,
+                 reserved_slug_dir: Optional[str] = DEFAULT_CONTENT_DIR, write_behind: bool = False):
         """Initialize the content generator.
 
         Args:
             api_key: OpenAI API key for content generation (optional)
+            cache_dir: Directory for the persistent page cache, created on the first fetch
+                (None disables caching)
+            cache_max_mb: Maximum size of the page cache in megabytes
+            parser: HTML parser mode: 'html.parser', 'lxml' or 'lxml-restricted'
+            journal_path: Path of the crawl journal database, created when a crawl starts
+                (None disables it)
+            manifest_path: Path of the content manifest used by incremental runs (None disables it)
+            max_rate: Upper bound of the adaptive per-host request rate (requests/s)
+            pool_size: HTTP connections kept per host
+            timeout: Read timeout per request in seconds
+            http2: Fetch over HTTP/2 when httpx[http2] is installed
+            archive_dir: Directory of the raw page archive fetched pages are written to, created
+                on the first fetch (None disables it)
+            ai_base_url: Base URL of the OpenAI-compatible API used for AI generation
+            ai_model: Chat model used for AI generation
+            ai_concurrency: Maximum AI requests in flight
+            ai_tokens_per_minute: Token budget for AI generation
+            ai_pack_size: Maximum number of small calculators generated in one AI request
+            ai_cache_path: Path of the AI response cache (None disables it)
+            ai_cache_max_mb: Maximum size of the AI response cache in megabytes
+            ai_cache_ttl: Seconds after which cached AI responses expire (None keeps them)
+            ai_stream: Stream AI responses and parse them as they arrive
+            reserved_slug_dir: Directory of existing calculators whose slugs new pages must not
+                take (None disables the check)
+            write_behind: Write JSON files on a background thread
         """
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (compatible; CalculatorContentGenerator/1.0)'
-        })
+        if parser not in PARSER_MODES:
+            raise ValueError(f"Unsupported parser mode: {parser}")
+        if PARSER_MODES[parser][0] == 'lxml' and not LXML_AVAILABLE:
+            raise ImportError("lxml not installed. Run: pip install lxml")
+        self.parser_backend, restricted = PARSER_MODES[parser]
+        self.parse_only = SoupStrainer(RESTRICTED_PARSE_TAGS) if restricted else None
+        self.parser = parser
+        self.parse_stats = {'pages': 0, 'total_ms': 0.0}
+        self._stats_lock = threading.Lock()
+
+        # Per-host pool must cover --per-host so concurrent workers don't wait on sockets
+        self.session = create_session(pool_size=pool_size, timeout=(DEFAULT_TIMEOUT[0], timeout), http2=http2)
         self.api_key = api_key
-        if api_key:
-            openai.api_key = api_key
+        self.ai_stage = AIGenerationStage(
+            api_key, api_base=ai_base_url, model=ai_model, concurrency=ai_concurrency,
+            tokens_per_minute=ai_tokens_per_minute, pack_size=ai_pack_size,
+            cache=AIResponseCache(ai_cache_path, ai_cache_max_mb * 1024 * 1024, ai_cache_ttl) if ai_cache_path else None,
+            stream=ai_stream
+        ) if api_key else None
+        self._pending_generation: List[Tuple[str, Future]] = []
+        self.template_engine = TemplateEngine()
+        self.writer = JSONWriter(background=write_behind)
+
+        # Opened on first use, so generating content alone doesn't create them on disk
+        self._cache_dir, self._cache_max_bytes = cache_dir, cache_max_mb * 1024 * 1024
+        self._journal_path, self._archive_dir = journal_path, archive_dir
+        self._http_cache: Optional[HTTPCache] = None
+        self._journal: Optional[CrawlJournal] = None
+        self._archive: Optional[PageArchive] = None
+        self._open_lock = threading.Lock()
+        self.manifest = ContentManifest(manifest_path) if manifest_path else None
+        # Pages keep the slug they were written under in earlier runs
+        self.slug_index = SlugIndex(
+            [reserved_slug_dir] if reserved_slug_dir else [],
+            {os.path.abspath(entry['output']): url
+             for url, entry in (self.manifest.entries.items() if self.manifest else []) if entry.get('output')}
+        )
+        self.incremental_stats = {'unchanged_lastmod': 0, 'unchanged_content': 0}
+
+        # Starts at the old fixed pace of one request per second and adapts from there
+        self.rate_limiter = AdaptiveRateLimiter(initial_rate=1.0, max_rate=max_rate)
+        self.max_throttle_retries = 3
+
+    @property
+    def http_cache(self) -> Optional[HTTPCache]:
+        """Persistent page cache (None if disabled), opened on first use."""
+        if self._http_cache is None and self._cache_dir:
+            with self._open_lock:
+                if self._http_cache is None:
+                    self._http_cache = HTTPCache(self._cache_dir, self._cache_max_bytes)
+        return self._http_cache
+
+    @property
+    def journal(self) -> Optional[CrawlJournal]:
+        """Crawl journal (None if disabled), opened on first use."""
+        if self._journal is None and self._journal_path:
+            with self._open_lock:
+                if self._journal is None:
+                    self._journal = CrawlJournal(self._journal_path)
+        return self._journal
+
+    @property
+    def archive(self) -> Optional[PageArchive]:
+        """Raw page archive (None if disabled), opened on first use."""
+        if self._archive is None and self._archive_dir:
+            with self._open_lock:
+                if self._archive is None:
+                    self._archive = PageArchive(self._archive_dir)
+        return self._archive
+
+    def _fetch(self, url: str) -> requests.Response:
+        """Fetch a page under the per-host rate limiter.
+
+        Pages are revalidated against the persistent cache when it is enabled.
+        Throttled responses (429/503) slow the host down and are retried after
+        any Retry-After delay.
+        """
+        host = urlparse(url).netloc
+        for attempt in range(self.max_throttle_retries + 1):
+            self.rate_limiter.acquire(host)
+            start = time.perf_counter()
+            try:
+                if self.http_cache:
+                    response = self.http_cache.get(self.session, url)
+                else:
+                    response = self.session.get(url)
+            except requests.RequestException:
+                self.rate_limiter.record(host, error=True)
+                raise
+
+            self.rate_limiter.record(host, response.status_code, response.headers.get('Retry-After'),
+                                     time.perf_counter() - start)
+            if response.status_code not in THROTTLE_STATUS_CODES:
+                break
+            print(f"🚦 Throttled by {host} (HTTP {response.status_code}), attempt {attempt + 1}")
+        return response
 
     def parse_sitemap(self, sitemap_url: str) -> List[str]:
         """Parse sitemap XML and extract calculator URLs.
 
+        Sitemap index files are followed recursively and gzipped sitemaps are
+        decompressed on the fly.
+
         Args:
             sitemap_url: URL of the sitemap to parse
 
         Returns:
             List of calculator page URLs
         """
-        print(f"Fetching sitemap: {sitemap_url}")
+        return [entry.loc for entry in self.parse_sitemap_entries(sitemap_url)]
 
-        try:
-            response = self.session.get(sitemap_url)
-            response.raise_for_status()
+    def parse_sitemap_entries(self, sitemap_url: str) -> List[SitemapEntry]:
+        """Parse sitemap XML and extract calculator URLs with their <lastmod>.
 
-            # Parse XML
-            root = ET.fromstring(response.content)
+        Args:
+            sitemap_url: URL of the sitemap to parse
 
-            # Extract URLs (handle both sitemap formats)
-            urls = []
-            for url_elem in root.findall('.//{http://www.sitemaps.org/schemas/sitemap/0.9}loc'):
-                url = url_elem.text
-                if url and self._is_calculator_url(url):
-                    urls.append(url)
+        Returns:
+            List of SitemapEntry(loc, lastmod) for calculator pages
+        """
+        try:
+            # Stream entries so large and sharded (index) sitemaps stay cheap
+            entries = [
+                entry for entry in iter_sitemap(sitemap_url, self.session)
+                if self._is_calculator_url(entry.loc)
+            ]
 
-            print(f"Found {len(urls)} calculator URLs")
-            return urls
+            print(f"Found {len(entries)} calculator URLs")
+            return entries
 
         except Exception as e:
             print(f"Error parsing sitemap: {e}")
@@ -107,34 +293,57 @@ class CalculatorContentGenerator:
         print(f"Extracting content from: {url}")
 
         try:
-            response = self.session.get(url)
+            response = self._fetch(url)
             response.raise_for_status()
 
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            # Extract basic information
-            title = self._extract_title(soup)
-            description = self._extract_description(soup)
-            form_fields = self._extract_form_fields(soup)
-
-            # Try to extract existing instructions/examples
-            existing_instructions = self._extract_instructions(soup)
-            existing_examples = self._extract_examples(soup)
-
-            return {
-                'url': url,
-                'title': title,
-                'description': description,
-                'form_fields': form_fields,
-                'existing_instructions': existing_instructions,
-                'existing_examples': existing_examples,
-                'raw_html': str(soup)[:1000]  # Keep some raw HTML for reference
-            }
+            return self.extract_from_html(url, response.content,
+                                          declared_encoding(response.headers.get('Content-Type')))
 
         except Exception as e:
             print(f"Error extracting content from {url}: {e}")
             return {'url': url, 'error': str(e)}
 
+    def extract_from_html(self, url: str, content: bytes, encoding: Optional[str] = None) -> Dict[str, Any]:
+        """Extract content and form fields from an already fetched page.
+
+        Args:
+            url: Calculator page URL
+            content: Raw response body
+            encoding: Charset declared by the Content-Type header; None lets BeautifulSoup
+                detect it from the page (``<meta charset>``, BOM or content)
+
+        Returns:
+            Dictionary containing extracted content
+        """
+        start = time.perf_counter()
+        soup = BeautifulSoup(content, self.parser_backend, parse_only=self.parse_only,
+                             from_encoding=encoding)
+
+        # Extract basic information
+        title = self._extract_title(soup)
+        description = self._extract_description(soup)
+        form_fields = self._extract_form_fields(soup)
+
+        # Try to extract existing instructions/examples
+        existing_instructions, existing_examples = self._extract_instructions_and_examples(soup)
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._stats_lock:
+            self.parse_stats['pages'] += 1
+            self.parse_stats['total_ms'] += elapsed_ms
+        print(f"⏱️  Parsed {url} in {elapsed_ms:.1f} ms ({self.parser})")
+
+        return {
+            'url': url,
+            'title': title,
+            'description': description,
+            'form_fields': form_fields,
+            'existing_instructions': existing_instructions,
+            'existing_examples': existing_examples,
+            # Keep some raw HTML for reference, straight from the response bytes
+            'raw_html': content[:1000].decode(encoding or soup.original_encoding or 'utf-8', errors='ignore')
+        }
+
     def _extract_title(self, soup: BeautifulSoup) -> str:
         """Extract page title."""
         title_tag = soup.find('title')
@@ -161,86 +370,165 @@ class CalculatorContentGenerator:
         return ""
 
     def _extract_form_fields(self, soup: BeautifulSoup) -> List[Dict[str, str]]:
-        """Extract form input fields and their labels."""
+        """Extract form input fields and their labels.
+
+        Labels are indexed by their ``for`` attribute and parent texts are cached
+        in a single traversal, so pages with hundreds of inputs stay linear.
+        """
         fields = []
 
-        # Find all input elements
-        inputs = soup.find_all('input')
+        # Collect inputs and index labels in one pass over the document
+        inputs = []
+        labels_by_for: Dict[str, Any] = {}
+        for elem in soup.find_all(['input', 'label']):
+            if elem.name == 'input':
+                inputs.append(elem)
+            elif elem.get('for') is not None:
+                # Keep the first label per id, matching document order lookups
+                labels_by_for.setdefault(elem['for'], elem)
+
+        parent_texts: Dict[int, str] = {}
 
         for input_elem in inputs:
             input_type = input_elem.get('type', 'text')
+
+            # Skip submit buttons and hidden fields
+            if input_type in ['submit', 'button', 'hidden']:
+                continue
+
             input_name = input_elem.get('name', '')
             input_id = input_elem.get('id', '')
 
             # Try to find associated label
             label_text = ""
             if input_id:
-                label = soup.find('label', attrs={'for': input_id})
+                label = labels_by_for.get(input_id)
                 if label:
                     label_text = label.get_text().strip()
 
             # If no label found, look for nearby text
             if not label_text and input_name:
-                # Look for text in parent elements
+                # Look for text in parent elements, serializing each parent only once
                 parent = input_elem.parent
                 if parent:
-                    label_text = parent.get_text().strip()
+                    key = id(parent)
+                    if key not in parent_texts:
+                        parent_texts[key] = parent.get_text().strip()
+                    label_text = parent_texts[key]
                     # Remove the input value if present
                     if input_elem.get('value'):
                         label_text = label_text.replace(input_elem.get('value'), '').strip()
 
-            # Skip submit buttons and hidden fields
-            if input_type not in ['submit', 'button', 'hidden']:
-                fields.append({
-                    'name': input_name or f'field_{len(fields)}',
-                    'label': label_text or f'Input Field {len(fields) + 1}',
-                    'type': input_type,
-                    'id': input_id
-                })
+            fields.append({
+                'name': input_name or f'field_{len(fields)}',
+                'label': label_text or f'Input Field {len(fields) + 1}',
+                'type': input_type,
+                'id': input_id
+            })
 
         return fields
 
-    def _extract_instructions(self, soup: BeautifulSoup) -> List[str]:
-        """Extract existing instructions from the page."""
-        instructions = []
-
-        # Look for instruction sections
-        instruction_selectors = [
-            '.instructions', '.how-to', '.steps',
-            '[class*="instruction"]', '[class*="step"]',
-            'ol li', 'ul li'
-        ]
-
-        for selector in instruction_selectors:
-            elements = soup.select(selector)
-            for elem in elements:
-                text = elem.get_text().strip()
-                if len(text) > 10 and text not in instructions:
-                    instructions.append(text)
+    @staticmethod
+    def _instruction_rank(elem: Tag, classes: List[str], class_attr: str) -> Optional[int]:
+        """Priority of an instruction candidate, in the order of the original selectors.
 
-        return instructions[:10]  # Limit to first 10 instructions
-
-    def _extract_examples(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
-        """Extract existing examples from the page."""
-        examples = []
-
-        # Look for example sections
-        example_selectors = [
-            '.example', '.examples', '[class*="example"]',
-            'table tr', '.calculation'
-        ]
-
-        for selector in example_selectors:
-            elements = soup.select(selector)
-            for elem in elements:
-                text = elem.get_text().strip()
-                if len(text) > 20:
-                    examples.append({
-                        'text': text,
-                        'type': 'existing'
-                    })
+        ``.instructions``, ``.how-to``, ``.steps``, ``[class*="instruction"]``,
+        ``[class*="step"]``, ``ol li``, ``ul li``; None if it matches none of them.
+        """
+        if 'instructions' in classes:
+            return 0
+        if 'how-to' in classes:
+            return 1
+        if 'steps' in classes:
+            return 2
+        if 'instruction' in class_attr:
+            return 3
+        if 'step' in class_attr:
+            return 4
+        if elem.name == 'li':
+            if elem.find_parent('ol') is not None:
+                return 5
+            if elem.find_parent('ul') is not None:
+                return 6
+        return None
+
+    @staticmethod
+    def _example_rank(elem: Tag, classes: List[str], class_attr: str) -> Optional[int]:
+        """Priority of an example candidate: ``.example``, ``.examples``, ``[class*="example"]``,
+        ``table tr``, ``.calculation``; None if it matches none of them."""
+        if 'example' in classes:
+            return 0
+        if 'examples' in classes:
+            return 1
+        if 'example' in class_attr:
+            return 2
+        if elem.name == 'tr' and elem.find_parent('table') is not None:
+            return 3
+        if 'calculation' in classes:
+            return 4
+        return None
+
+    def _extract_instructions_and_examples(self, soup: BeautifulSoup) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """Extract existing instructions and examples in a single document traversal.
+
+        Each element goes into the bucket of the highest-priority selector it
+        matches (see ``_instruction_rank`` and ``_example_rank``), so dedicated
+        ``.instructions``/``.example`` sections win over generic list items and
+        table rows, as they did with one selector pass each. The limits are
+        filled from the highest-priority bucket down, in document order within
+        a bucket. The walk stops early once the top bucket of both lists is full.
 
-        return examples[:5]  # Limit to 5 examples
+        Returns:
+            Tuple of (up to 10 instructions, up to 5 examples)
+        """
+        instruction_buckets: List[List[str]] = [[] for _ in range(7)]
+        example_buckets: List[List[str]] = [[] for _ in range(5)]
+        seen_instructions = [set() for _ in instruction_buckets]
+        seen_examples = [set() for _ in example_buckets]
+
+        for elem in soup.descendants:
+            if not isinstance(elem, Tag):
+                continue
+            if (len(instruction_buckets[0]) >= MAX_EXISTING_INSTRUCTIONS
+                    and len(example_buckets[0]) >= MAX_EXISTING_EXAMPLES):
+                break
+
+            classes = elem.get('class') or []
+            class_attr = ' '.join(classes)
+            instruction_rank = self._instruction_rank(elem, classes, class_attr)
+            example_rank = self._example_rank(elem, classes, class_attr)
+            if instruction_rank is None and example_rank is None:
+                continue
+
+            text = elem.get_text().strip()
+            # A bucket never needs more than the limit: earlier buckets only push its items further down
+            if (instruction_rank is not None and len(text) > 10 and text not in seen_instructions[instruction_rank]
+                    and len(instruction_buckets[instruction_rank]) < MAX_EXISTING_INSTRUCTIONS):
+                seen_instructions[instruction_rank].add(text)
+                instruction_buckets[instruction_rank].append(text)
+            if (example_rank is not None and len(text) > 20 and text not in seen_examples[example_rank]
+                    and len(example_buckets[example_rank]) < MAX_EXISTING_EXAMPLES):
+                seen_examples[example_rank].add(text)
+                example_buckets[example_rank].append(text)
+
+        instructions = self._merge_buckets(instruction_buckets, MAX_EXISTING_INSTRUCTIONS)
+        examples = [{'text': text, 'type': 'existing'}
+                    for text in self._merge_buckets(example_buckets, MAX_EXISTING_EXAMPLES)]
+        return instructions, examples
+
+    @staticmethod
+    def _merge_buckets(buckets: List[List[str]], limit: int) -> List[str]:
+        """Concatenate buckets in priority order, dropping texts already taken, up to a limit."""
+        merged: List[str] = []
+        seen = set()
+        for bucket in buckets:
+            for text in bucket:
+                if text not in seen:
+                    seen.add(text)
+                    merged.append(text)
+                    if len(merged) == limit:
+                        return merged
+        return merged
 
     def generate_expanded_content(self, extracted_data: Dict[str, Any]) -> Dict[str, Any]:
         """Generate expanded, SEO-friendly content from extracted data.
@@ -259,26 +547,43 @@ class CalculatorContentGenerator:
         else:
             return self._generate_with_templates(extracted_data)
 
-    def _generate_with_ai(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate content using OpenAI API."""
-        try:
-            prompt = self._build_ai_prompt(data)
+    def generate_expanded_content_batch(self, extracted_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Generate expanded content for many calculators at once.
 
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=2000,
-                temperature=0.7
-            )
+        With an API key, all prompts go through the AI stage concurrently
+        (and packed, if enabled); items whose request fails fall back to
+        templates individually. Without one, the whole batch is rendered by
+        the precompiled template engine.
 
-            ai_content = response.choices[0].message.content
+        Args:
+            extracted_items: Data extracted from calculator pages
 
-            # Parse AI response into structured format
-            return self._parse_ai_response(ai_content, data)
+        Returns:
+            Expanded content dictionaries, in input order
+        """
+        for data in extracted_items:
+            print(f"Generating expanded content for: {data.get('title', 'Unknown')}")
 
-        except Exception as e:
-            print(f"AI generation failed: {e}")
-            return self._generate_with_templates(data)
+        if not self.ai_stage:
+            return self.template_engine.render_batch(extracted_items)
+
+        responses = self.ai_stage.run([self._build_ai_prompt(data) for data in extracted_items])
+        return [self._ai_result(data, ai_content)[0] for data, ai_content in zip(extracted_items, responses)]
+
+    def _generate_with_ai(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate content using the AI generation stage."""
+        ai_content = self.ai_stage.run([self._build_ai_prompt(data)])[0]
+        return self._ai_result(data, ai_content)[0]
+
+    def _ai_result(self, data: Dict[str, Any], ai_content: Optional[str]) -> Tuple[Dict[str, Any], bool]:
+        """Parse an AI response, falling back to templates if the request failed.
+
+        Returns:
+            Tuple of (expanded content, whether any of it came from templates)
+        """
+        if ai_content is None:
+            return self._generate_with_templates(data), True
+        return self._parse_ai_response(ai_content, data)
 
     def _build_ai_prompt(self, data: Dict[str, Any]) -> str:
         """Build prompt for AI content generation."""
@@ -313,247 +618,716 @@ Output as JSON with this structure:
 """
         return prompt
 
-    def _parse_ai_response(self, ai_content: str, original_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Parse AI response into structured format."""
-        try:
-            # Try to extract JSON from response
-            json_match = re.search(r'\{.*\}', ai_content, re.DOTALL)
-            if json_match:
-                parsed = json.loads(json_match.group())
-                return {
-                    'title': original_data.get('title', ''),
-                    'metaDescription': parsed.get('metaDescription', ''),
-                    'instructions': parsed.get('instructions', []),
-                    'examples': parsed.get('examples', []),
-                    'applications': parsed.get('applications', ''),
-                    'formFields': original_data.get('form_fields', [])
-                }
-        except:
-            pass
-
-        # Fallback to template generation
-        return self._generate_with_templates(original_data)
+    def _parse_ai_response(self, ai_content: str, original_data: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        """Parse AI response into structured format.
+
+        Every complete field of the JSON object is kept, even if the response
+        was cut off or has a malformed field; only missing fields are filled
+        in from templates.
+
+        Returns:
+            Tuple of (expanded content, whether any field came from templates)
+        """
+        parsed = parse_partial_json(ai_content)
+        if not parsed:
+            # Fallback to template generation
+            return self._generate_with_templates(original_data), True
+
+        missing = [field for field in AI_FIELDS if field not in parsed]
+        if missing:
+            print(f"⚠️  Incomplete AI response for {original_data.get('title', 'Unknown')}, "
+                  f"using templates for: {', '.join(missing)}")
+            templated = self._generate_with_templates(original_data)
+            parsed = {**{field: templated[field] for field in missing}, **parsed}
+
+        return {
+            'title': original_data.get('title', ''),
+            'metaDescription': parsed['metaDescription'],
+            'instructions': parsed['instructions'],
+            'examples': parsed['examples'],
+            'applications': parsed['applications'],
+            'formFields': original_data.get('form_fields', [])
+        }, bool(missing)
 
     def _generate_with_templates(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate content using template-based expansion."""
-        title = data.get('title', 'Calculator')
-        description = data.get('description', '')
-        form_fields = data.get('form_fields', [])
+        """Generate content using the precompiled template engine."""
+        return self.template_engine.render(data)
 
-        # Generate meta description
-        meta_desc = self._generate_meta_description(title, description)
+    def generate_slug(self, title: str) -> str:
+        """Generate URL slug from title."""
+        return slugify(title)
 
-        # Generate expanded instructions
-        instructions = self._generate_instructions(form_fields, data.get('existing_instructions', []))
+    def save_calculator_json(self, calculator_data: Dict[str, Any], output_dir: str,
+                             url: Optional[str] = None) -> str:
+        """Save calculator data as JSON file.
 
-        # Generate examples
-        examples = self._generate_examples(form_fields, data.get('existing_examples', []))
+        The filename is the title slug, unless another page or an existing
+        calculator already has it (see SlugIndex).
 
-        # Generate applications text
-        applications = self._generate_applications(title)
+        Args:
+            calculator_data: Generated calculator content
+            output_dir: Output directory for JSON files
+            url: Source page URL, which identifies the page across runs (defaults to the title)
 
-        return {
-            'title': title,
-            'metaDescription': meta_desc,
-            'instructions': instructions,
-            'examples': examples,
-            'applications': applications,
-            'formFields': form_fields
-        }
+        Returns:
+            Path of the written file
+        """
+        title = calculator_data.get('title', 'Unknown Calculator')
+        slug = self.slug_index.claim(output_dir, self.generate_slug(title), url or title)
+
+        # Save JSON file (the writer creates the directory and skips unchanged content)
+        filename = f"{slug}.json"
+        filepath = os.path.join(output_dir, filename)
 
-    def _generate_meta_description(self, title: str, description: str) -> str:
-        """Generate SEO-friendly meta description."""
-        if description and len(description) > 50:
-            # Truncate and clean existing description
-            clean_desc = re.sub(r'[^\w\s.,-]', '', description)
-            if len(clean_desc) > 140:
-                clean_desc = clean_desc[:137] + "..."
-            return clean_desc
-
-        # Generate from title
-        base_desc = f"Use our free online {title.lower()} to quickly calculate results. Get accurate calculations with detailed explanations and examples."
-        return base_desc[:155] + "..." if len(base_desc) > 155 else base_desc
-
-    def _generate_instructions(self, form_fields: List[Dict], existing: List[str]) -> List[str]:
-        """Generate expanded instructions."""
-        instructions = []
-
-        # Use existing instructions if available
-        if existing:
-            for instr in existing[:4]:
-                # Expand each instruction to 2-3 sentences
-                expanded = self._expand_instruction(instr)
-                instructions.append(expanded)
+        if self.writer.write(filepath, calculator_data):
+            print(f"Saved: {filepath}")
         else:
-            # Generate from form fields
-            for i, field in enumerate(form_fields[:4]):
-                field_name = field.get('label', f'Field {i+1}')
-                instr = f"Enter the {field_name.lower()}. This is an important input that affects your calculation results. Make sure to enter accurate values for the best results."
-                instructions.append(instr)
-
-        # Add general instruction
-        instructions.append("Click the 'Calculate' button to process your inputs. The calculator will instantly display the results along with any additional information or explanations.")
-
-        return instructions
-
-    def _expand_instruction(self, instruction: str) -> str:
-        """Expand a single instruction to be more detailed."""
-        if len(instruction) > 100:
-            return instruction  # Already detailed
-
-        # Add context and detail
-        expanded = instruction
-        if not instruction.endswith('.'):
-            expanded += '.'
-
-        expanded += " This step is crucial for obtaining accurate calculation results. Take your time to enter the correct information."
-
-        return expanded
-
-    def _generate_examples(self, form_fields: List[Dict], existing: List[Dict]) -> List[Dict]:
-        """Generate practical examples."""
-        examples = []
-
-        # Use existing examples if available
-        for existing_example in existing[:3]:
-            if 'input' in existing_example or 'text' in existing_example:
-                examples.append(existing_example)
-
-        # Generate additional examples if needed
-        while len(examples) < 3:
-            example = self._generate_example(form_fields, len(examples))
-            examples.append(example)
-
-        return examples
-
-    def _generate_example(self, form_fields: List[Dict], index: int) -> Dict[str, Any]:
-        """Generate a single example."""
-        # Create sample inputs based on field types
-        inputs = {}
-        for field in form_fields[:3]:  # Use first 3 fields
-            field_name = field.get('name', f'field_{len(inputs)}')
-            field_type = field.get('type', 'number')
-
-            if field_type == 'number':
-                # Generate realistic sample values
-                if 'amount' in field_name.lower() or 'price' in field_name.lower():
-                    inputs[field_name] = [1000, 5000, 10000][index % 3]
-                elif 'rate' in field_name.lower() or 'percent' in field_name.lower():
-                    inputs[field_name] = [3.5, 5.0, 7.5][index % 3]
-                elif 'month' in field_name.lower() or 'year' in field_name.lower():
-                    inputs[field_name] = [12, 24, 36][index % 3]
-                else:
-                    inputs[field_name] = [10, 25, 50][index % 3]
-            else:
-                inputs[field_name] = f"Sample {field_name}"
+            print(f"Unchanged: {filepath}")
+        return filepath
 
-        return {
-            'input': inputs,
-            'output': f"Calculation result {index + 1}: ${[150.75, 287.50, 412.25][index % 3]} - This demonstrates a typical calculation scenario.",
-            'type': 'generated'
-        }
+    def _process_url(self, url: str, output_dir: str, lastmod: Optional[str] = None,
+                     incremental: bool = False) -> bool:
+        """Run extraction, generation and saving for a single URL.
 
-    def _generate_applications(self, title: str) -> str:
-        """Generate applications text."""
-        calculator_type = title.lower().replace(' calculator', '')
+        Args:
+            url: Calculator page URL
+            output_dir: Output directory for JSON files
+            lastmod: Sitemap <lastmod> of the URL, recorded in the content manifest
+            incremental: Skip generation if the extracted content didn't change
 
-        applications_text = f"""
-This {calculator_type} is useful in many real-world scenarios. Students can use it to verify homework calculations and understand mathematical concepts. Professionals in finance, engineering, and other technical fields rely on accurate calculations for their work. Homeowners and individuals can make informed decisions by quickly calculating different scenarios.
+        Returns:
+            True if the calculator JSON was saved (or is already up to date)
+        """
+        try:
+            # Fetch and extract content
+            print(f"Extracting content from: {url}")
+            response = self._fetch(url)
+            response.raise_for_status()
+            content_type = response.headers.get('Content-Type')
+            encoding = declared_encoding(content_type)
+            if self.archive is not None:
+                self.archive.add(url, response.content, content_type, encoding)
+            self._record(url, 'fetched')
 
-Beyond basic calculations, this tool helps users understand the relationships between different variables and how changes in one input affect the final result. Whether you're planning a budget, analyzing investment options, or solving complex mathematical problems, having access to reliable calculation tools is essential in today's data-driven world.
+            return self._process_page(url, response.content, encoding, output_dir, lastmod, incremental)
 
-The calculator's step-by-step approach also makes it an excellent educational tool, helping users learn the underlying mathematical principles while getting practical results they can apply immediately.
-"""
+        except Exception as e:
+            print(f"❌ Processing failed for {url}: {e}")
+            self._record(url, 'failed', str(e))
+            return False
 
-        return applications_text.strip()
+    def _process_page(self, url: str, content: bytes, encoding: Optional[str], output_dir: str,
+                      lastmod: Optional[str] = None, incremental: bool = False,
+                      batch: Optional[List[Tuple[str, Dict[str, Any], Optional[str], str]]] = None) -> bool:
+        """Run extraction, generation and saving for an already fetched page.
 
-    def generate_slug(self, title: str) -> str:
-        """Generate URL slug from title."""
-        # Convert to lowercase, replace spaces with hyphens, remove special chars
-        slug = re.sub(r'[^\w\s-]', '', title.lower())
-        slug = re.sub(r'[-\s]+', '-', slug).strip('-')
-        return slug
+        Args:
+            url: Calculator page URL
+            content: Raw page body
+            encoding: Charset declared by the Content-Type header, if any
+            output_dir: Output directory for JSON files
+            lastmod: Sitemap <lastmod> of the URL, recorded in the content manifest
+            incremental: Skip generation if the extracted content didn't change
+            batch: Without an AI stage, collect (url, extracted, lastmod, digest) here
+                instead of generating, to be rendered and saved together later
 
-    def save_calculator_json(self, calculator_data: Dict[str, Any], output_dir: str):
-        """Save calculator data as JSON file."""
-        title = calculator_data.get('title', 'Unknown Calculator')
-        slug = self.generate_slug(title)
+        Returns:
+            True if the calculator JSON was saved, queued (or is already up to date)
+        """
+        try:
+            extracted = self.extract_from_html(url, content, encoding)
+            self._record(url, 'extracted')
+
+            digest = content_hash(extracted)
+            if incremental and self.manifest and self.manifest.has_same_content(url, digest, output_dir):
+                print(f"⏭️  Content unchanged, keeping existing JSON: {url}")
+                self.manifest.update(url, lastmod, digest)
+                with self._stats_lock:
+                    self.incremental_stats['unchanged_content'] += 1
+                self._record(url, 'saved')
+                return True
+
+            if self.ai_stage:
+                # Generated concurrently by the AI stage and saved when the response arrives
+                print(f"Generating expanded content for: {extracted.get('title', 'Unknown')}")
+
+                def save(ai_content: Optional[str]) -> bool:
+                    expanded, fallback = self._ai_result(extracted, ai_content)
+                    return self._save_generated(url, expanded, output_dir, lastmod, None if fallback else digest)
+
+                future = self.ai_stage.submit(self._build_ai_prompt(extracted), save)
+                self._pending_generation.append((url, future))
+                return True
+
+            if batch is not None:
+                batch.append((url, extracted, lastmod, digest))
+                return True
+
+            # Generate expanded content
+            expanded = self.generate_expanded_content(extracted)
+            return self._save_generated(url, expanded, output_dir, lastmod, digest)
 
-        # Create output directory if it doesn't exist
-        os.makedirs(output_dir, exist_ok=True)
+        except Exception as e:
+            print(f"❌ Processing failed for {url}: {e}")
+            self._record(url, 'failed', str(e))
+            return False
 
-        # Save JSON file
-        filename = f"{slug}.json"
-        filepath = os.path.join(output_dir, filename)
+    def _save_generated(self, url: str, expanded: Dict[str, Any], output_dir: str,
+                        lastmod: Optional[str], digest: Optional[str]) -> bool:
+        """Save generated content and record it in the journal and manifest.
+
+        A ``digest`` of None marks content that fell back to templates after a
+        failed or truncated AI response: neither the digest nor the lastmod is
+        recorded, so the next incremental run generates the page again.
+        """
+        self._record(url, 'generated')
+        filepath = self.save_calculator_json(expanded, output_dir, url)
+        if self.manifest:
+            self.manifest.update(url, lastmod if digest else None, digest, filepath)
+        self._record(url, 'saved')
+        return True
+
+    def _save_rendered_batch(self, batch: List[Tuple[str, Dict[str, Any], Optional[str], str]],
+                             output_dir: str) -> int:
+        """Render collected pages with one template engine call and save them.
+
+        Args:
+            batch: (url, extracted, lastmod, digest) of the pages to generate
+            output_dir: Output directory for JSON files
+
+        Returns:
+            Number of calculators that failed to save
+        """
+        if not batch:
+            return 0
+
+        print(f"\n🧩 Rendering {len(batch)} calculators from templates")
+        rendered = self.template_engine.render_batch([extracted for _, extracted, _, _ in batch])
+        failed = 0
+        for (url, _, lastmod, digest), expanded in zip(batch, rendered):
+            try:
+                self._save_generated(url, expanded, output_dir, lastmod, digest)
+            except Exception as e:
+                print(f"❌ Processing failed for {url}: {e}")
+                self._record(url, 'failed', str(e))
+                failed += 1
+        return failed
+
+    def _finalize_slugs(self):
+        """Rename the pages whose provisional slug changed once collisions are resolved in order.
+
+        Files are moved aside first, so pages that swap slugs don't overwrite each other.
+        """
+        moves = self.slug_index.finalize()
+        staged = []
+        for move in moves:
+            src = os.path.join(move.output_dir, f"{move.claimed}.json")
+            if os.path.exists(src):
+                self.writer.move(src, f"{src}.slug-move")
+                staged.append((move, f"{src}.slug-move"))
+        for move, tmp_path in staged:
+            dst = os.path.join(move.output_dir, f"{move.final}.json")
+            self.writer.move(tmp_path, dst)
+            print(f"🔀 Renamed {move.claimed}.json → {move.final}.json ({move.url})")
+            entry = self.manifest.entries.get(move.url) if self.manifest else None
+            if entry:
+                self.manifest.update(move.url, entry.get('lastmod'), entry.get('content_hash'), dst)
+
+    def _finish_generation(self) -> int:
+        """Wait for calculators queued on the AI stage to be generated and saved.
+
+        Returns:
+            Number of calculators that failed after being queued
+        """
+        if not self.ai_stage:
+            return 0
+
+        self.ai_stage.flush()
+        pending, self._pending_generation = self._pending_generation, []
+        failed = 0
+        for url, future in pending:
+            try:
+                future.result()
+            except Exception as e:
+                print(f"❌ Processing failed for {url}: {e}")
+                self._record(url, 'failed', str(e))
+                failed += 1
+        return failed
+
+    def _record(self, url: str, state: str, error: Optional[str] = None):
+        """Record a URL's progress in the crawl journal, if enabled."""
+        if self.journal:
+            self.journal.mark(url, state, error)
+
+    async def _crawl_async(self, urls: List[str], output_dir: str, concurrency: int, per_host: int,
+                           lastmods: Dict[str, Optional[str]], incremental: bool = False) -> int:
+        """Process URLs concurrently with a global and a per-host cap.
+
+        Blocking fetch/extract/save work runs on a thread pool so that many
+        requests are in flight while the event loop schedules the rest.
+
+        Args:
+            urls: Calculator page URLs
+            output_dir: Output directory for JSON files
+            concurrency: Maximum number of URLs processed at once
+            per_host: Maximum number of concurrent requests to a single host
+            lastmods: Sitemap <lastmod> per URL
+            incremental: Skip generation for pages whose content didn't change
+
+        Returns:
+            Number of successfully processed calculators
+        """
+        loop = asyncio.get_running_loop()
+        host_limits: Dict[str, asyncio.Semaphore] = {}
+
+        async def worker(i: int, url: str) -> bool:
+            host = urlparse(url).netloc
+            limit = host_limits.setdefault(host, asyncio.Semaphore(per_host))
+            async with limit:
+                print(f"\n🔄 Processing {i}/{len(urls)}: {url}")
+                return await loop.run_in_executor(executor, self._process_url, url, output_dir,
+                                                  lastmods.get(url), incremental)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = await asyncio.gather(*(worker(i, url) for i, url in enumerate(urls, 1)))
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(calculator_data, f, indent=2, ensure_ascii=False)
+        return sum(results)
 
-        print(f"Saved: {filepath}")
+    def _crawl_pipeline(self, urls: List[str], output_dir: str, fetch_workers: int, per_host: int,
+                        lastmods: Dict[str, Optional[str]], incremental: bool = False,
+                        parse_workers: Optional[int] = None, generate_workers: int = 2, write_workers: int = 2,
+                        queue_size: int = DEFAULT_QUEUE_SIZE) -> int:
+        """Process URLs in overlapped fetch → parse → generate → write stages.
+
+        Each stage has its own workers and a bounded input queue, so pages are
+        fetched while earlier ones are parsed, generated and written. Parsing
+        runs in worker processes; the other stages are I/O-bound and use threads.
+
+        Args:
+            urls: Calculator page URLs
+            output_dir: Output directory for JSON files
+            fetch_workers: Number of concurrent fetches
+            per_host: Maximum number of concurrent requests to a single host
+            lastmods: Sitemap <lastmod> per URL
+            incremental: Skip generation for pages whose content didn't change
+            parse_workers: Number of parser processes (None uses one per CPU)
+            generate_workers: Number of content generation threads
+            write_workers: Number of JSON writer threads
+            queue_size: Maximum number of items waiting between two stages
+
+        Returns:
+            Number of successfully processed calculators
+        """
+        host_limits: Dict[str, threading.BoundedSemaphore] = {}
+        unchanged = [0]
+        # Spawned (not forked) workers, since the pipeline's threads are already running
+        parse_pool = ProcessPoolExecutor(max_workers=parse_workers or os.cpu_count() or 1,
+                                         mp_context=multiprocessing.get_context('spawn'),
+                                         initializer=_init_parse_worker, initargs=(self.parser,))
+
+        def fetch(url: str) -> Optional[Tuple[str, bytes, Optional[str]]]:
+            with self._stats_lock:
+                limit = host_limits.setdefault(urlparse(url).netloc, threading.BoundedSemaphore(per_host))
+            try:
+                with limit:
+                    response = self._fetch(url)
+                response.raise_for_status()
+                content_type = response.headers.get('Content-Type')
+                encoding = declared_encoding(content_type)
+                if self.archive is not None:
+                    self.archive.add(url, response.content, content_type, encoding)
+                self._record(url, 'fetched')
+                return url, response.content, encoding
+            except Exception as e:
+                print(f"❌ Processing failed for {url}: {e}")
+                self._record(url, 'failed', str(e))
+                return None
 
-    def process_sitemap(self, sitemap_url: str, output_dir: str, limit: Optional[int] = None):
-        """Complete pipeline: sitemap → content extraction → generation → JSON output."""
+        def parse(page: Tuple[str, bytes, Optional[str]]) -> Optional[Tuple[str, Dict[str, Any]]]:
+            url, content, encoding = page
+            try:
+                extracted, elapsed_ms = parse_pool.submit(_extract_page, url, content, encoding).result()
+            except Exception as e:
+                print(f"❌ Processing failed for {url}: {e}")
+                self._record(url, 'failed', str(e))
+                return None
+            with self._stats_lock:
+                self.parse_stats['pages'] += 1
+                self.parse_stats['total_ms'] += elapsed_ms
+            self._record(url, 'extracted')
+            return url, extracted
+
+        def generate(parsed: Tuple[str, Dict[str, Any]]) -> Optional[Tuple[str, Dict[str, Any], str]]:
+            url, extracted = parsed
+            digest = content_hash(extracted)
+            if incremental and self.manifest and self.manifest.has_same_content(url, digest, output_dir):
+                print(f"⏭️  Content unchanged, keeping existing JSON: {url}")
+                self.manifest.update(url, lastmods.get(url), digest)
+                with self._stats_lock:
+                    self.incremental_stats['unchanged_content'] += 1
+                    unchanged[0] += 1
+                self._record(url, 'saved')
+                return None
+
+            print(f"Generating expanded content for: {extracted.get('title', 'Unknown')}")
+            if self.ai_stage:
+                # The AI stage generates concurrently and hands results to the writers when they arrive
+                def queue_write(ai_content: Optional[str]):
+                    expanded, fallback = self._ai_result(extracted, ai_content)
+                    write_stage.put((url, expanded, None if fallback else digest))
+
+                future = self.ai_stage.submit(self._build_ai_prompt(extracted), queue_write)
+                with self._stats_lock:
+                    self._pending_generation.append((url, future))
+                return None
+            return url, self.generate_expanded_content(extracted), digest
+
+        def write(generated: Tuple[str, Dict[str, Any], Optional[str]]) -> Optional[str]:
+            url, expanded, digest = generated
+            try:
+                self._save_generated(url, expanded, output_dir, lastmods.get(url), digest)
+                return url
+            except Exception as e:
+                print(f"❌ Processing failed for {url}: {e}")
+                self._record(url, 'failed', str(e))
+                return None
+
+        write_stage = Stage('write', write, write_workers, queue_size)
+        pipeline = StagedPipeline([
+            Stage('fetch', fetch, fetch_workers, queue_size),
+            Stage('parse', parse, parse_workers or os.cpu_count() or 1, queue_size),
+            # Queued AI generations must reach the writers before their input ends
+            Stage('generate', generate, generate_workers, queue_size, finish=self._finish_generation),
+            write_stage,
+        ])
+        try:
+            saved = pipeline.run(urls)
+        finally:
+            parse_pool.shutdown()
+        pipeline.print_summary()
+        return saved + unchanged[0]
+
+    def process_sitemap(self, sitemap_url: str, output_dir: str, limit: Optional[int] = None,
+                        concurrency: int = 1, per_host: int = 4, resume: bool = False,
+                        max_retries: int = 3, incremental: bool = False, pipeline: bool = False,
+                        parse_workers: Optional[int] = None, generate_workers: int = 2, write_workers: int = 2,
+                        queue_size: int = DEFAULT_QUEUE_SIZE):
+        """Complete pipeline: sitemap → content extraction → generation → JSON output.
+
+        Args:
+            sitemap_url: URL of the sitemap to crawl
+            output_dir: Output directory for JSON files
+            limit: Maximum number of calculators to process
+            concurrency: Number of URLs processed at once (1 = sequential crawl)
+            per_host: Maximum concurrent requests per host in concurrent mode
+            resume: Skip URLs the crawl journal already saved and retry failed ones
+            max_retries: Maximum failed attempts per URL before resume gives up on it
+            incremental: Skip URLs whose sitemap <lastmod> or extracted content is unchanged
+            pipeline: Run fetch, parse, generate and write as overlapped stages
+                (``concurrency`` sets the number of fetch workers)
+            parse_workers: Parser processes in pipeline mode (None uses one per CPU)
+            generate_workers: Content generation threads in pipeline mode
+            write_workers: JSON writer threads in pipeline mode
+            queue_size: Maximum items waiting between two stages in pipeline mode
+        """
         print("🚀 Starting calculator content generation pipeline")
         print(f"📍 Sitemap: {sitemap_url}")
         print(f"📁 Output: {output_dir}")
 
         # Step 1: Parse sitemap
-        calculator_urls = self.parse_sitemap(sitemap_url)
-        if not calculator_urls:
+        entries = self.parse_sitemap_entries(sitemap_url)
+        if not entries:
             print("❌ No calculator URLs found")
             return
 
         # Limit processing if specified
         if limit:
-            calculator_urls = calculator_urls[:limit]
+            entries = entries[:limit]
+
+        lastmods = {entry.loc: entry.lastmod for entry in entries}
+        calculator_urls = [entry.loc for entry in entries]
+        # Pages with colliding titles get their slugs in sitemap order
+        self.slug_index.set_order(calculator_urls)
+
+        if incremental and self.manifest:
+            # Skip URLs whose <lastmod> hasn't moved since the last run, before fetching anything
+            changed = [url for url in calculator_urls
+                       if not self.manifest.is_unchanged(url, lastmods[url], output_dir)]
+            self.incremental_stats['unchanged_lastmod'] = len(calculator_urls) - len(changed)
+            print(f"🔁 Incremental: {self.incremental_stats['unchanged_lastmod']} unchanged since last run, "
+                  f"{len(changed)} new or changed")
+            calculator_urls = changed
+            if not calculator_urls:
+                print("✅ Everything is up to date")
+                return
+        elif incremental:
+            print("⚠️  Content manifest disabled, --incremental has no effect")
+
+        if self.journal:
+            self.journal.discover(calculator_urls, reset=not resume)
+            if resume:
+                pending = self.journal.pending(calculator_urls, max_retries)
+                print(f"⏯️  Resuming: {len(calculator_urls) - len(pending)} calculators done or out of retries, "
+                      f"{len(pending)} remaining")
+                calculator_urls = pending
+                if not calculator_urls:
+                    print("✅ Nothing left to process")
+                    return
+        elif resume:
+            print("⚠️  Crawl journal disabled, --resume has no effect")
 
         print(f"📊 Processing {len(calculator_urls)} calculators")
 
         # Step 2-4: Process each calculator
+        start = time.perf_counter()
+        if pipeline:
+            print(f"🧵 Pipeline mode: {concurrency} fetch workers, {per_host} per host, "
+                  f"{parse_workers or os.cpu_count()} parser processes, queues of {queue_size}")
+            successful = self._crawl_pipeline(calculator_urls, output_dir, concurrency, per_host, lastmods,
+                                              incremental, parse_workers, generate_workers, write_workers,
+                                              queue_size)
+        elif concurrency > 1:
+            print(f"⚡ Concurrent mode: {concurrency} workers, {per_host} per host")
+            successful = asyncio.run(
+                self._crawl_async(calculator_urls, output_dir, concurrency, per_host, lastmods, incremental)
+            )
+        else:
+            successful = 0
+            for i, url in enumerate(calculator_urls, 1):
+                print(f"\n🔄 Processing {i}/{len(calculator_urls)}: {url}")
+
+                if self._process_url(url, output_dir, lastmods[url], incremental):
+                    successful += 1
+        # Pipeline mode waits for (and counts) AI generation itself
+        if not pipeline:
+            successful -= self._finish_generation()
+        self.writer.flush()
+        self._finalize_slugs()
+        elapsed = time.perf_counter() - start
+
+        if self.manifest:
+            self.manifest.save()
+
+        failed = len(calculator_urls) - successful
+        print(f"\n✅ Pipeline complete! Successfully processed {successful}/{len(calculator_urls)} calculators")
+        print(f"📈 {successful} succeeded, {failed} failed in {elapsed:.1f}s "
+              f"({len(calculator_urls) / elapsed if elapsed else 0:.2f} pages/s)")
+        if self.parse_stats['pages']:
+            print(f"⏱️  Parse time: {self.parse_stats['total_ms'] / self.parse_stats['pages']:.1f} ms/page "
+                  f"average over {self.parse_stats['pages']} pages ({self.parser})")
+        self.rate_limiter.print_summary()
+        self.writer.print_summary()
+        self.slug_index.print_summary()
+        if self.ai_stage:
+            self.ai_stage.print_summary()
+        if self._http_cache:
+            self._http_cache.print_summary()
+        if self._archive is not None:
+            stats = self._archive.summary()
+            print(f"🗄️  Archive: {stats['written']} pages written ({stats['bytes_written'] / 1024:.1f} KB compressed), "
+                  f"{stats['deduplicated']} duplicates")
+        if self.journal:
+            counts = self.journal.counts()
+            print("📒 Journal: " + ", ".join(f"{state} {counts[state]}" for state in STATES if state in counts))
+        if incremental:
+            print(f"🔁 Skipped {self.incremental_stats['unchanged_lastmod']} by lastmod, "
+                  f"{self.incremental_stats['unchanged_content']} by unchanged content")
+
+    def process_archive(self, archive_dir: str, output_dir: str, limit: Optional[int] = None,
+                        incremental: bool = False):
+        """Offline pipeline: archived pages → content extraction → generation → JSON output.
+
+        Replays pages written to the page archive by earlier crawls, so
+        extractor changes can be re-run without fetching anything.
+
+        Args:
+            archive_dir: Directory of the page archive
+            output_dir: Output directory for JSON files
+            limit: Maximum number of calculators to process
+            incremental: Skip generation for pages whose extracted content didn't change
+        """
+        print("🚀 Starting calculator content generation from archive")
+        print(f"🗄️  Archive: {archive_dir}")
+        print(f"📁 Output: {output_dir}")
+
+        if not os.path.exists(os.path.join(archive_dir, 'index.db')):
+            print("❌ No page archive found")
+            return
+
+        archive = PageArchive(archive_dir)
+        total = min(len(archive), limit) if limit else len(archive)
+        print(f"📊 Processing {total} archived calculators")
+
         successful = 0
-        for i, url in enumerate(calculator_urls, 1):
-            print(f"\n🔄 Processing {i}/{len(calculator_urls)}: {url}")
+        templated: List[Tuple[str, Dict[str, Any], Optional[str], str]] = []
+        start = time.perf_counter()
+        for i, page in enumerate(archive, 1):
+            if i > total:
+                break
+            print(f"\n🔄 Processing {i}/{total}: {page.url}")
+            # Keep the sitemap <lastmod> from the crawl so later incremental crawls still match it
+            lastmod = self.manifest.entries.get(page.url, {}).get('lastmod') if self.manifest else None
+            # Archives written before charset detection stored ISO-8859-1 for pages without one
+            encoding = declared_encoding(page.content_type)
+            if self._process_page(page.url, page.content, encoding, output_dir, lastmod, incremental, templated):
+                successful += 1
+        successful -= self._finish_generation()
+        successful -= self._save_rendered_batch(templated, output_dir)
+        self.writer.flush()
+        self._finalize_slugs()
+        elapsed = time.perf_counter() - start
+        archive.close()
 
-            try:
-                # Extract content
-                extracted = self.extract_calculator_content(url)
+        if self.manifest:
+            self.manifest.save()
 
-                if 'error' in extracted:
-                    print(f"❌ Extraction failed: {extracted['error']}")
-                    continue
+        print(f"\n✅ Replay complete! Successfully processed {successful}/{total} calculators")
+        print(f"📈 {successful} succeeded, {total - successful} failed in {elapsed:.1f}s "
+              f"({total / elapsed if elapsed else 0:.2f} pages/s)")
+        if self.parse_stats['pages']:
+            print(f"⏱️  Parse time: {self.parse_stats['total_ms'] / self.parse_stats['pages']:.1f} ms/page "
+                  f"average over {self.parse_stats['pages']} pages ({self.parser})")
+        self.writer.print_summary()
+        self.slug_index.print_summary()
+        if self.ai_stage:
+            self.ai_stage.print_summary()
 
-                # Generate expanded content
-                expanded = self.generate_expanded_content(extracted)
 
-                # Save JSON
-                self.save_calculator_json(expanded, output_dir)
+# Extractor of a parser process in pipeline mode (see _crawl_pipeline)
+_parse_worker: Optional[CalculatorContentGenerator] = None
 
-                successful += 1
 
-                # Rate limiting
-                time.sleep(1)
+def _init_parse_worker(parser: str):
+    """Process pool initializer: build an extractor without cache, journal, manifest or archive."""
+    global _parse_worker
+    _parse_worker = CalculatorContentGenerator(cache_dir=None, parser=parser, journal_path=None,
+                                               manifest_path=None, archive_dir=None, ai_cache_path=None,
+                                               reserved_slug_dir=None)
 
-            except Exception as e:
-                print(f"❌ Processing failed for {url}: {e}")
 
-        print(f"\n✅ Pipeline complete! Successfully processed {successful}/{len(calculator_urls)} calculators")
+def _extract_page(url: str, content: bytes, encoding: Optional[str]) -> Tuple[Dict[str, Any], float]:
+    """Parse one page in a worker process.
+
+    Returns:
+        Extracted content and the parse time in milliseconds
+    """
+    start = time.perf_counter()
+    extracted = _parse_worker.extract_from_html(url, content, encoding)
+    return extracted, (time.perf_counter() - start) * 1000
 
 
 def main():
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(description="Generate calculator content from sitemaps")
-    parser.add_argument('--sitemap', required=True, help='Sitemap URL to process')
+    parser.add_argument('--sitemap', help='Sitemap URL to process')
     parser.add_argument('--output', required=True, help='Output directory for JSON files')
     parser.add_argument('--limit', type=int, help='Limit number of calculators to process')
     parser.add_argument('--openai-key', help='OpenAI API key for AI-powered content generation')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help='Directory for the persistent page cache')
+    parser.add_argument('--cache-max-mb', type=int, default=500,
+                        help='Maximum page cache size in MB (least recently used pages are evicted)')
+    parser.add_argument('--no-cache', action='store_true', help='Disable the persistent page cache')
+    parser.add_argument('--parser', choices=sorted(PARSER_MODES), default='html.parser',
+                        help='HTML parser: html.parser, lxml (faster) or lxml-restricted '
+                             '(parses only head, form, label, list and table regions)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue an interrupted run: skip saved URLs and retry failed ones')
+    parser.add_argument('--max-retries', type=int, default=3,
+                        help='Maximum failed attempts per URL when resuming')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only regenerate new or changed pages (by sitemap lastmod and content hash)')
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST_PATH,
+                        help='Path of the content manifest used by --incremental')
+    parser.add_argument('--journal', default=DEFAULT_JOURNAL_PATH, help='Path of the crawl journal database')
+    parser.add_argument('--max-rate', type=float, default=10.0,
+                        help='Maximum requests per second per host (the rate adapts below this)')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT[1],
+                        help='Read timeout per request in seconds')
+    parser.add_argument('--http2', action='store_true', help='Fetch over HTTP/2 (requires httpx[http2])')
+    parser.add_argument('--concurrency', type=int, default=1,
+                        help='Number of pages to crawl concurrently (default: 1, sequential)')
+    parser.add_argument('--per-host', type=int, default=4,
+                        help='Maximum concurrent requests per host in concurrent mode')
+    parser.add_argument('--reserved-slugs', default=DEFAULT_CONTENT_DIR, metavar='DIR',
+                        help='Existing calculators whose slugs new pages must not take')
+    parser.add_argument('--no-reserved-slugs', action='store_true',
+                        help='Let new pages take the slugs of existing calculators')
+    parser.add_argument('--write-behind', action='store_true',
+                        help='Write JSON files on a background thread')
+    parser.add_argument('--pipeline', action='store_true',
+                        help='Overlap fetching, parsing, generation and writing in separate worker pools '
+                             '(--concurrency sets the fetch workers)')
+    parser.add_argument('--parse-workers', type=int, help='Parser processes in pipeline mode (default: one per CPU)')
+    parser.add_argument('--generate-workers', type=int, default=2,
+                        help='Content generation threads in pipeline mode')
+    parser.add_argument('--write-workers', type=int, default=2, help='JSON writer threads in pipeline mode')
+    parser.add_argument('--queue-size', type=int, default=DEFAULT_QUEUE_SIZE,
+                        help='Maximum items waiting between two pipeline stages')
+    parser.add_argument('--ai-base-url', default=DEFAULT_API_BASE,
+                        help='Base URL of the OpenAI-compatible API (e.g. ai_stub_server.py for benchmarks)')
+    parser.add_argument('--ai-model', default=DEFAULT_MODEL, help='Chat model used for AI generation')
+    parser.add_argument('--ai-concurrency', type=int, default=4, help='Maximum AI requests in flight')
+    parser.add_argument('--ai-tpm', type=int, default=DEFAULT_TOKENS_PER_MINUTE,
+                        help='Tokens-per-minute budget for AI generation')
+    parser.add_argument('--ai-pack', type=int, default=1,
+                        help='Pack up to this many small calculators into one AI request (default: 1, no packing)')
+    parser.add_argument('--ai-cache', default=DEFAULT_AI_CACHE_PATH, help='Path of the AI response cache')
+    parser.add_argument('--ai-cache-max-mb', type=int, default=100,
+                        help='Maximum AI response cache size in MB (least recently used responses are evicted)')
+    parser.add_argument('--ai-cache-ttl-days', type=float,
+                        help='Regenerate cached AI responses older than this many days')
+    parser.add_argument('--no-ai-cache', action='store_true', help='Always call the AI API, bypassing the cache')
+    parser.add_argument('--no-ai-stream', action='store_true',
+                        help='Wait for complete AI responses instead of streaming them')
+    parser.add_argument('--archive', default=DEFAULT_ARCHIVE_DIR,
+                        help='Directory of the raw page archive fetched pages are written to')
+    parser.add_argument('--no-archive', action='store_true', help='Do not archive fetched pages')
+    parser.add_argument('--from-archive', nargs='?', const=DEFAULT_ARCHIVE_DIR, metavar='DIR',
+                        help='Re-run extraction and generation from archived pages, without network access '
+                             f'(default archive: {DEFAULT_ARCHIVE_DIR})')
 
     args = parser.parse_args()
+    if not args.sitemap and not args.from_archive:
+        parser.error('one of --sitemap or --from-archive is required')
 
     # Initialize generator
-    generator = CalculatorContentGenerator(api_key=args.openai_key)
+    generator = CalculatorContentGenerator(
+        api_key=args.openai_key,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        cache_max_mb=args.cache_max_mb,
+        parser=args.parser,
+        journal_path=args.journal,
+        manifest_path=args.manifest,
+        max_rate=args.max_rate,
+        pool_size=max(DEFAULT_POOL_SIZE, args.per_host),
+        timeout=args.timeout,
+        http2=args.http2,
+        # Replays read the archive, they don't write to it
+        archive_dir=None if args.no_archive or args.from_archive else args.archive,
+        ai_base_url=args.ai_base_url,
+        ai_model=args.ai_model,
+        ai_concurrency=args.ai_concurrency,
+        ai_tokens_per_minute=args.ai_tpm,
+        ai_pack_size=args.ai_pack,
+        ai_cache_path=None if args.no_ai_cache else args.ai_cache,
+        ai_cache_max_mb=args.ai_cache_max_mb,
+        ai_cache_ttl=args.ai_cache_ttl_days * 86400 if args.ai_cache_ttl_days else None,
+        ai_stream=not args.no_ai_stream,
+        reserved_slug_dir=None if args.no_reserved_slugs else args.reserved_slugs,
+        write_behind=args.write_behind
+    )
 
     # Run pipeline
-    generator.process_sitemap(args.sitemap, args.output, args.limit)
+    if args.from_archive:
+        generator.process_archive(args.from_archive, args.output, args.limit, incremental=args.incremental)
+    else:
+        generator.process_sitemap(args.sitemap, args.output, args.limit,
+                                  concurrency=args.concurrency, per_host=args.per_host,
+                                  resume=args.resume, max_retries=args.max_retries,
+                                  incremental=args.incremental, pipeline=args.pipeline,
+                                  parse_workers=args.parse_workers, generate_workers=args.generate_workers,
+                                  write_workers=args.write_workers, queue_size=args.queue_size)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Content Manifest - Incremental Crawls
+
+Remembers, for every crawled URL, the sitemap ``<lastmod>`` it was processed
+at, a hash of the content extracted from it and the JSON file it produced.
+Incremental runs use it to skip unchanged URLs before fetching them, and to
+skip regeneration when a page was re-fetched but its extracted content is the
+same as last time.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Optional
+
+DEFAULT_MANIFEST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.content_manifest.json')
+
+# Extracted fields that determine the generated output
+HASHED_FIELDS = ('title', 'description', 'form_fields', 'existing_instructions', 'existing_examples')
+
+# Bump when the templates, the AI prompt or the output format change, so that
+# incremental runs regenerate pages whose extracted content is the same
+GENERATOR_VERSION = 1
+
+
+def content_hash(extracted: Dict[str, Any]) -> str:
+    """Hash the parts of an extracted page that feed content generation, and the generator version."""
+    payload = json.dumps({'version': GENERATOR_VERSION, **{field: extracted.get(field) for field in HASHED_FIELDS}},
+                         sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ContentManifest:
+    """Per-URL record of sitemap lastmod, extracted content hash and output file."""
+
+    def __init__(self, path: str = DEFAULT_MANIFEST_PATH, flush_every: int = 50):
+        """Load the manifest from disk if it exists.
+
+        Args:
+            path: Path of the manifest JSON file
+            flush_every: Write the manifest to disk after this many updates
+        """
+        self.path = path
+        self.flush_every = flush_every
+        self._lock = threading.Lock()
+        self._dirty = 0
+        self.entries: Dict[str, Dict[str, Any]] = {}
+
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+
+    def is_unchanged(self, url: str, lastmod: Optional[str], output_dir: Optional[str] = None) -> bool:
+        """Check whether a URL can be skipped before fetching it.
+
+        A URL is unchanged when the sitemap reports the same ``<lastmod>`` as the
+        last successful run and the JSON file written back then still exists
+        (in ``output_dir``, if given).
+        """
+        entry = self.entries.get(url)
+        if not entry or not lastmod or entry.get('lastmod') != lastmod:
+            return False
+        return self._has_output(entry, output_dir)
+
+    def has_same_content(self, url: str, digest: str, output_dir: Optional[str] = None) -> bool:
+        """Check whether freshly extracted content matches the last run (and its output is in ``output_dir``)."""
+        entry = self.entries.get(url)
+        if not entry or entry.get('content_hash') != digest:
+            return False
+        return self._has_output(entry, output_dir)
+
+    @staticmethod
+    def _has_output(entry: Dict[str, Any], output_dir: Optional[str]) -> bool:
+        """Whether the entry's JSON file exists, inside ``output_dir`` if one is given.
+
+        A run into another output directory regenerates every page, since the
+        files written by earlier runs are elsewhere.
+        """
+        output = entry.get('output')
+        if not output or not os.path.exists(output):
+            return False
+        return output_dir is None or os.path.dirname(os.path.abspath(output)) == os.path.abspath(output_dir)
+
+    def update(self, url: str, lastmod: Optional[str], digest: Optional[str], output: Optional[str] = None):
+        """Record a processed URL.
+
+        Args:
+            url: Crawled URL
+            lastmod: Sitemap <lastmod> of the URL
+            digest: Hash of the extracted content (None if the page must be regenerated next run)
+            output: Path of the generated JSON file (kept from the last run if omitted)
+        """
+        with self._lock:
+            entry = self.entries.setdefault(url, {})
+            entry['lastmod'] = lastmod
+            entry['content_hash'] = digest
+            if output:
+                entry['output'] = output
+            self._dirty += 1
+            if self._dirty >= self.flush_every:
+                self._write()
+
+    def save(self):
+        """Write the manifest to disk."""
+        with self._lock:
+            self._write()
+
+    def _write(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self._dirty = 0
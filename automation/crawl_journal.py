@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Crawl Journal - Resumable Pipeline Runs
+
+Records the state of every crawled URL in a SQLite database (WAL mode, one
+commit per transition), so an interrupted ``process_sitemap`` run can be
+resumed with ``--resume`` and continue with the URLs that haven't been saved.
+
+URL states, in pipeline order:
+    discovered → fetched → extracted → generated → saved
+and ``failed`` (with the error message and number of failed attempts).
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+DEFAULT_JOURNAL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.crawl_journal.db')
+
+STATES = ('discovered', 'fetched', 'extracted', 'generated', 'saved', 'failed')
+
+
+class CrawlJournal:
+    """Crash-safe record of per-URL crawl progress."""
+
+    def __init__(self, path: str = DEFAULT_JOURNAL_PATH):
+        """Open (or create) the journal database.
+
+        Args:
+            path: Path of the SQLite journal file
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS urls (
+                url TEXT PRIMARY KEY,
+                state TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._db.commit()
+
+    def discover(self, urls: List[str], reset: bool = False):
+        """Register URLs found in the sitemap.
+
+        Args:
+            urls: URLs to register
+            reset: Start every URL over from 'discovered' (a fresh, non-resumed run)
+        """
+        now = time.time()
+        with self._lock:
+            if reset:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO urls (url, state, attempts, error, updated_at) "
+                    "VALUES (?, 'discovered', 0, NULL, ?)",
+                    ((url, now) for url in urls)
+                )
+            else:
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO urls (url, state, updated_at) VALUES (?, 'discovered', ?)",
+                    ((url, now) for url in urls)
+                )
+            self._db.commit()
+
+    def mark(self, url: str, state: str, error: Optional[str] = None):
+        """Record a state transition for a URL.
+
+        Args:
+            url: Crawled URL
+            state: New state (one of STATES)
+            error: Error message when the state is 'failed'
+        """
+        if state not in STATES:
+            raise ValueError(f"Unknown crawl state: {state}")
+
+        with self._lock:
+            if state == 'failed':
+                self._db.execute(
+                    "UPDATE urls SET state = ?, attempts = attempts + 1, error = ?, updated_at = ? WHERE url = ?",
+                    (state, error, time.time(), url)
+                )
+            else:
+                self._db.execute(
+                    "UPDATE urls SET state = ?, error = NULL, updated_at = ? WHERE url = ?",
+                    (state, time.time(), url)
+                )
+            self._db.commit()
+
+    def pending(self, urls: List[str], max_retries: int) -> List[str]:
+        """Filter URLs down to those that still need processing.
+
+        Saved URLs are skipped, and failed URLs are retried until they have
+        failed ``max_retries`` times.
+
+        Args:
+            urls: Candidate URLs, in processing order
+            max_retries: Maximum number of failed attempts per URL
+
+        Returns:
+            URLs that are unfinished, in their original order
+        """
+        with self._lock:
+            rows = dict(
+                (url, (state, attempts)) for url, state, attempts
+                in self._db.execute("SELECT url, state, attempts FROM urls")
+            )
+
+        result = []
+        for url in urls:
+            state, attempts = rows.get(url, ('discovered', 0))
+            if state == 'saved':
+                continue
+            if state == 'failed' and attempts >= max_retries:
+                continue
+            result.append(url)
+        return result
+
+    def counts(self) -> Dict[str, int]:
+        """Return the number of URLs in each state."""
+        with self._lock:
+            rows = self._db.execute("SELECT state, COUNT(*) FROM urls GROUP BY state").fetchall()
+        return dict(rows)
+
+    def close(self):
+        """Close the journal database."""
+        with self._lock:
+            self._db.close()
@@ -5,12 +5,14 @@ Extract Calculators from CalculatorSoup Sitemap
 Parses the sitemap.xml and extracts calculator URLs, prioritizing by traffic potential.
 """
 
-import xml.etree.ElementTree as ET
-import requests
+import io
 import json
 from urllib.parse import urlparse
 from typing import List, Dict, Any
 
+from http_client import create_session
+from sitemap_reader import iter_sitemap, iter_sitemap_stream
+
 # High-value calculator keywords (based on search volume)
 HIGH_VALUE_KEYWORDS = [
     'mortgage', 'loan', 'credit', 'retirement', 'savings', 'investment',
@@ -22,20 +24,14 @@ HIGH_VALUE_KEYWORDS = [
 def fetch_sitemap(url: str) -> str:
     """Fetch sitemap XML content."""
     print(f"📡 Fetching sitemap: {url}")
-    response = requests.get(url)
+    response = create_session().get(url)
     response.raise_for_status()
     return response.text
 
 def parse_sitemap(xml_content: str) -> List[str]:
     """Parse sitemap XML and extract URLs."""
-    root = ET.fromstring(xml_content)
-    urls = []
-
-    for url_elem in root.findall('.//{http://www.sitemaps.org/schemas/sitemap/0.9}loc'):
-        if url_elem.text:
-            urls.append(url_elem.text)
-
-    return urls
+    stream = io.BytesIO(xml_content.encode('utf-8'))
+    return [entry.loc for entry in iter_sitemap_stream(stream)]
 
 def is_calculator_url(url: str) -> bool:
     """Check if URL is a calculator page."""
@@ -164,14 +160,15 @@ def main():
     sitemap_url = "https://www.calculatorsoup.com/sitemap.xml"
 
     try:
-        # Fetch and parse sitemap
-        xml_content = fetch_sitemap(sitemap_url)
-        all_urls = parse_sitemap(xml_content)
-
-        print(f"📊 Found {len(all_urls)} total URLs in sitemap")
-
-        # Extract calculator URLs
-        calculator_urls = [url for url in all_urls if is_calculator_url(url)]
+        # Stream the sitemap (and any sitemap index children), keeping calculator URLs only
+        total_urls = 0
+        calculator_urls = []
+        for entry in iter_sitemap(sitemap_url, create_session()):
+            total_urls += 1
+            if is_calculator_url(entry.loc):
+                calculator_urls.append(entry.loc)
+
+        print(f"📊 Found {total_urls} total URLs in sitemap")
         print(f"🧮 Found {len(calculator_urls)} calculator URLs")
 
         # Process calculators
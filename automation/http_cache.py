@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Persistent HTTP Cache - Conditional Page Fetches
+
+Stores fetched pages on disk, keyed by URL, together with their ETag and
+Last-Modified validators. Later fetches send If-None-Match / If-Modified-Since
+and serve 304 Not Modified responses from disk, so re-running the pipeline only
+downloads pages that actually changed upstream.
+
+The cache is capped in size; the least recently used entries are evicted first.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.http_cache')
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024
+
+# Response headers worth keeping to rebuild a cached response
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+
+class HTTPCache:
+    """On-disk HTTP cache with ETag/Last-Modified revalidation and LRU eviction."""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the index database and page bodies
+            max_bytes: Maximum total size of cached bodies before LRU eviction
+        """
+        self.cache_dir = cache_dir
+        self.body_dir = os.path.join(cache_dir, 'bodies')
+        self.max_bytes = max_bytes
+        os.makedirs(self.body_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(cache_dir, 'index.db'), check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                body_file TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._db.commit()
+        self.total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+        self.stats = {'hits': 0, 'misses': 0, 'bytes_saved': 0, 'evictions': 0}
+
+    def _lookup(self, url: str) -> Optional[Dict[str, str]]:
+        """Return the stored headers of a URL, or None if it isn't cached."""
+        with self._lock:
+            row = self._db.execute("SELECT headers FROM entries WHERE url = ?", (url,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _body_path(self, url: str) -> str:
+        return os.path.join(self.body_dir, hashlib.sha256(url.encode('utf-8')).hexdigest())
+
+    def _read_body(self, url: str) -> Optional[bytes]:
+        try:
+            with open(self._body_path(url), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _store(self, url: str, response: requests.Response):
+        """Write a 200 response to disk and evict old entries if over the cap."""
+        headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+        body = response.content
+        body_path = self._body_path(url)
+
+        tmp_path = f"{body_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(body)
+        os.replace(tmp_path, body_path)
+
+        with self._lock:
+            row = self._db.execute("SELECT size FROM entries WHERE url = ?", (url,)).fetchone()
+            if row:
+                self.total_bytes -= row[0]
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (url, body_file, size, headers, last_access) VALUES (?, ?, ?, ?, ?)",
+                (url, os.path.basename(body_path), len(body), json.dumps(headers), time.time())
+            )
+            self.total_bytes += len(body)
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits its size cap."""
+        while self.total_bytes > self.max_bytes:
+            row = self._db.execute(
+                "SELECT url, body_file, size FROM entries ORDER BY last_access LIMIT 1"
+            ).fetchone()
+            if not row:
+                break
+            url, body_file, size = row
+            self._db.execute("DELETE FROM entries WHERE url = ?", (url,))
+            try:
+                os.remove(os.path.join(self.body_dir, body_file))
+            except OSError:
+                pass
+            self.total_bytes -= size
+            self.stats['evictions'] += 1
+
+    def _touch(self, url: str):
+        with self._lock:
+            self._db.execute("UPDATE entries SET last_access = ? WHERE url = ?", (time.time(), url))
+            self._db.commit()
+
+    def get(self, session: requests.Session, url: str, **kwargs) -> requests.Response:
+        """Fetch a URL, revalidating any cached copy with a conditional request.
+
+        Args:
+            session: HTTP session used for the request
+            url: URL to fetch
+            **kwargs: Extra arguments passed to ``session.get``
+
+        Returns:
+            The live response, or a response rebuilt from disk on 304 Not Modified
+        """
+        cached_headers = self._lookup(url)
+        base_headers = dict(kwargs.pop('headers', None) or {})
+        request_headers = dict(base_headers)
+        if cached_headers:
+            if 'ETag' in cached_headers:
+                request_headers['If-None-Match'] = cached_headers['ETag']
+            if 'Last-Modified' in cached_headers:
+                request_headers['If-Modified-Since'] = cached_headers['Last-Modified']
+
+        response = session.get(url, headers=request_headers, **kwargs)
+
+        if response.status_code == 304 and cached_headers:
+            body = self._read_body(url)
+            if body is not None:
+                self._touch(url)
+                with self._lock:
+                    self.stats['hits'] += 1
+                    self.stats['bytes_saved'] += len(body)
+                return self._rebuild_response(url, body, cached_headers, response)
+
+            # Body went missing on disk; fetch it again unconditionally
+            response = session.get(url, headers=base_headers, **kwargs)
+
+        with self._lock:
+            self.stats['misses'] += 1
+
+        if response.status_code == 200 and ('ETag' in response.headers or 'Last-Modified' in response.headers):
+            self._store(url, response)
+
+        return response
+
+    def _rebuild_response(self, url: str, body: bytes, headers: Dict[str, str],
+                          not_modified: requests.Response) -> requests.Response:
+        """Build a 200 response from a cached body."""
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = body
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.request = not_modified.request
+        response.elapsed = not_modified.elapsed
+        return response
+
+    def print_summary(self):
+        """Print hit/miss statistics for this run."""
+        hits, misses = self.stats['hits'], self.stats['misses']
+        total = hits + misses
+        hit_rate = (hits / total * 100) if total else 0.0
+        print(f"💾 HTTP cache: {hits} hits, {misses} misses ({hit_rate:.1f}% hit rate), "
+              f"{self.stats['bytes_saved'] / 1024:.1f} KB saved, "
+              f"{self.stats['evictions']} evicted, {self.total_bytes / 1024 / 1024:.1f} MB on disk")
+
+    def close(self):
+        """Close the index database."""
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP Client - Pooled, Retrying Sessions
+
+Every fetch in the automation pipeline (sitemaps, calculator pages, cached
+revalidations) goes through a session created here, so all scripts share the
+same tuning:
+
+- connection pools sized for concurrent crawling, with keep-alive
+- connect/read timeouts on every request, so a hung host can't stall a run
+- retries with jittered exponential backoff for idempotent requests on
+  connection errors and 500/502/504 responses (429/503 are left to the
+  adaptive rate limiter, which honours Retry-After)
+- optional HTTP/2 through httpx, when installed
+
+Usage:
+    from http_client import create_session
+
+    session = create_session(pool_size=32)
+    response = session.get('https://www.calculatorsoup.com/sitemap.xml')
+"""
+
+import random
+from typing import Any, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+try:
+    import httpx
+    import h2  # noqa: F401  (required by httpx for HTTP/2)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (compatible; CalculatorContentGenerator/1.0)'
+
+# (connect, read) timeouts in seconds
+DEFAULT_TIMEOUT = (5.0, 30.0)
+DEFAULT_POOL_SIZE = 10
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+
+RETRY_STATUS_CODES = (500, 502, 504)
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+class JitteredRetry(Retry):
+    """urllib3 Retry with full-jitter exponential backoff.
+
+    Spreading retries randomly over [0, backoff] keeps concurrent workers that
+    failed together from retrying in lockstep.
+    """
+
+    def get_backoff_time(self) -> float:
+        return random.uniform(0, super().get_backoff_time())
+
+
+class TimeoutSession(requests.Session):
+    """requests Session that applies a default timeout to every request."""
+
+    def __init__(self, timeout: Timeout = DEFAULT_TIMEOUT):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        kwargs.setdefault('timeout', self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+class HTTPXRawStream:
+    """``requests.Response.raw`` stand-in over a streamed httpx response.
+
+    ``iter_content`` reads through ``stream``; the body is decoded by httpx,
+    like urllib3 does with ``decode_content=True``.
+    """
+
+    def __init__(self, result: 'httpx.Response'):
+        self._result = result
+
+    def stream(self, chunk_size: Optional[int] = None, decode_content: bool = True):
+        try:
+            yield from self._result.iter_bytes(chunk_size)
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(str(e)) from e
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(str(e)) from e
+
+    def close(self):
+        self._result.close()
+
+
+class HTTP2Session:
+    """Minimal requests-compatible session backed by an HTTP/2 httpx client.
+
+    Only ``get`` is provided; responses are converted to ``requests.Response``
+    objects so callers don't need to know which backend is used. They are fully
+    buffered unless ``stream=True``, in which case the body is read through
+    ``iter_content`` and the connection released by ``close()``.
+    """
+
+    def __init__(self, pool_size: int, timeout: Timeout, retries: int):
+        connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        self.headers = CaseInsensitiveDict()
+        self._client = httpx.Client(
+            http2=True,
+            timeout=httpx.Timeout(read, connect=connect),
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            transport=httpx.HTTPTransport(http2=True, retries=retries),
+            follow_redirects=True,
+        )
+
+    def get(self, url: str, headers: Optional[dict] = None, timeout: Optional[Timeout] = None,
+            stream: bool = False, **kwargs: Any) -> requests.Response:
+        merged = dict(self.headers)
+        merged.update(headers or {})
+        options = {}
+        if timeout is not None:
+            connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+            options['timeout'] = httpx.Timeout(read, connect=connect)
+        try:
+            request = self._client.build_request('GET', url, headers=merged, **options)
+            result = self._client.send(request, stream=stream)
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(str(e)) from e
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(str(e)) from e
+
+        response = requests.Response()
+        response.status_code = result.status_code
+        response.reason = result.reason_phrase
+        response.url = str(result.url)
+        response.headers = CaseInsensitiveDict(result.headers)
+        if stream:
+            response.raw = HTTPXRawStream(result)
+        else:
+            response._content = result.content
+            response._content_consumed = True
+        response.encoding = result.charset_encoding
+        return response
+
+    def mount(self, prefix: str, adapter: HTTPAdapter):
+        """Connection pools are managed by httpx; adapters don't apply."""
+
+    def close(self):
+        self._client.close()
+
+
+def create_session(pool_size: int = DEFAULT_POOL_SIZE, timeout: Timeout = DEFAULT_TIMEOUT,
+                   retries: int = DEFAULT_RETRIES, backoff: float = DEFAULT_BACKOFF,
+                   http2: bool = False, user_agent: str = DEFAULT_USER_AGENT) -> requests.Session:
+    """Create a pooled, retrying HTTP session.
+
+    Args:
+        pool_size: Connections kept per host (set to at least the crawl concurrency)
+        timeout: Default (connect, read) timeout in seconds
+        retries: Retries for connection errors and 500/502/504 on idempotent requests
+        backoff: Base of the exponential backoff between retries, in seconds
+        http2: Use HTTP/2 via httpx if available (falls back to HTTP/1.1)
+        user_agent: User-Agent header sent with every request
+
+    Returns:
+        A configured session
+    """
+    if http2:
+        if HTTP2_AVAILABLE:
+            session = HTTP2Session(pool_size, timeout, retries)
+            session.headers['User-Agent'] = user_agent
+            return session
+        print("⚠️  HTTP/2 requires httpx[http2] (pip install 'httpx[http2]'), using HTTP/1.1")
+
+    session = TimeoutSession(timeout)
+    session.headers['User-Agent'] = user_agent
+
+    retry = JitteredRetry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+JSON Writer - Skip-If-Unchanged, Atomic JSON Output
+
+Shared by the content generator, the translator and the content maintenance
+scripts in the project root. Each file is serialized exactly like
+``json.dump(data, f, indent=2, ensure_ascii=False)`` and compared with what is
+already on disk (by size first, then byte for byte; files written earlier in the
+run are compared by SHA-256). Identical output is not rewritten, so reruns
+don't touch file modification times, the Next.js build cache or git.
+
+Changed files are written to a temporary file next to the target and renamed
+over it, so a crash never leaves a half-written JSON file behind. Writes can
+optionally be handed to a background thread so callers don't wait on the disk.
+
+Usage:
+    writer = JSONWriter()
+    writer.write('content/calculators/bmi-calculator.json', data)
+    writer.close()
+    writer.print_summary()
+"""
+
+import hashlib
+import json
+import os
+import queue
+import stat
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_MAX_PENDING = 64
+
+
+class JSONWriter:
+    """Writes JSON files atomically, skipping files whose content wouldn't change."""
+
+    def __init__(self, background: bool = False, max_pending: int = DEFAULT_MAX_PENDING):
+        """Initialize the writer.
+
+        Args:
+            background: Write changed files on a background thread (call ``flush`` or
+                ``close`` before relying on them being on disk)
+            max_pending: Maximum number of queued background writes before ``write`` blocks
+        """
+        self.background = background
+        self.stats = {'written': 0, 'skipped': 0, 'bytes_written': 0, 'bytes_saved': 0}
+        self._lock = threading.Lock()
+        # Digest of the latest content written (or queued) per path in this run
+        self._digests: Dict[str, str] = {}
+        self._error: Optional[Exception] = None
+
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        if background:
+            self._queue = queue.Queue(maxsize=max_pending)
+            self._thread = threading.Thread(target=self._work, name='json-writer', daemon=True)
+            self._thread.start()
+
+    def write(self, path: str, data: Any, indent: int = 2, trailing_newline: bool = False) -> bool:
+        """Write data as JSON unless the file already has exactly that content.
+
+        Args:
+            path: Output file path (parent directories are created)
+            data: JSON-serializable data; it is serialized before this call returns,
+                so the caller may modify it afterwards
+            indent: Indentation passed to ``json.dumps``
+            trailing_newline: End the file with a newline
+
+        Returns:
+            True if the file is (or will be) rewritten, False if it was unchanged
+        """
+        payload = json.dumps(data, indent=indent, ensure_ascii=False)
+        if trailing_newline:
+            payload += '\n'
+        encoded = payload.encode('utf-8')
+        digest = hashlib.sha256(encoded).hexdigest()
+        key = os.path.abspath(path)
+
+        with self._lock:
+            unchanged = self._digests[key] == digest if key in self._digests else self._matches_disk(key, encoded)
+            if unchanged:
+                self.stats['skipped'] += 1
+                self.stats['bytes_saved'] += len(encoded)
+                return False
+            self._digests[key] = digest
+            self.stats['written'] += 1
+            self.stats['bytes_written'] += len(encoded)
+
+        if self._queue is not None:
+            self._raise_error()
+            self._queue.put((key, encoded))
+        else:
+            try:
+                self._write_atomic(key, encoded)
+            except Exception:
+                with self._lock:
+                    self._digests.pop(key, None)
+                raise
+        return True
+
+    def flush(self):
+        """Wait until all queued background writes are on disk.
+
+        Raises:
+            The first error a background write ran into
+        """
+        if self._queue is not None:
+            self._queue.join()
+        self._raise_error()
+
+    def move(self, src: str, dst: str):
+        """Rename a written file, keeping track of its content under the new path.
+
+        Queued writes are flushed first, so the file is complete when it moves.
+        """
+        self.flush()
+        src, dst = os.path.abspath(src), os.path.abspath(dst)
+        with self._lock:
+            os.replace(src, dst)
+            digest = self._digests.pop(src, None)
+            if digest is None:
+                self._digests.pop(dst, None)
+            else:
+                self._digests[dst] = digest
+
+    def close(self):
+        """Flush queued writes and stop the background thread."""
+        if self._queue is not None and self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        self._raise_error()
+
+    def print_summary(self):
+        """Print written vs skipped files and the bytes the skipped writes saved."""
+        print(f"💾 JSON files: {self.stats['written']} written ({self.stats['bytes_written'] / 1024:.1f} KB), "
+              f"{self.stats['skipped']} unchanged and skipped ({self.stats['bytes_saved'] / 1024:.1f} KB saved)")
+
+    @staticmethod
+    def _matches_disk(path: str, encoded: bytes) -> bool:
+        """Compare serialized output with the file on disk (by size first, then content)."""
+        try:
+            if os.path.getsize(path) != len(encoded):
+                return False
+            with open(path, 'rb') as f:
+                return f.read() == encoded
+        except OSError:
+            return False
+
+    @staticmethod
+    def _write_atomic(path: str, encoded: bytes):
+        """Write to a temporary file in the same directory and rename it over the target."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Not *.json, so directory scans never pick up a half-written file
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(encoded)
+            if os.path.exists(path):
+                os.chmod(tmp_path, stat.S_IMODE(os.stat(path).st_mode))
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _work(self):
+        """Background thread: write queued files until the stop marker."""
+        while True:
+            item: Optional[Tuple[str, bytes]] = self._queue.get()
+            try:
+                if item is None:
+                    return
+                try:
+                    self._write_atomic(*item)
+                except Exception as e:
+                    print(f"❌ Writing {item[0]} failed: {e}")
+                    with self._lock:
+                        self._error = self._error or e
+                        # Forget the digest so a retry isn't skipped as unchanged
+                        self._digests.pop(item[0], None)
+            finally:
+                self._queue.task_done()
+
+    def _raise_error(self):
+        """Re-raise the first background write error in the caller's thread."""
+        with self._lock:
+            error, self._error = self._error, None
+        if error:
+            raise error
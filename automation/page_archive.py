@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Page Archive - Offline Replay of Crawled Pages
+
+An append-only, content-addressed archive of fetched calculator pages, so the
+extractors can be re-run against thousands of pages without touching the
+network (``content_generator.py --from-archive``).
+
+Layout (WARC-style):
+    archive/
+    ├── segment-00000.warc.gz   one gzip member per record, appended only
+    ├── segment-00001.warc.gz   a new segment starts once one exceeds its size limit
+    └── index.db                SQLite offset index
+
+Each record is a WARC/1.1 ``resource`` record compressed as its own gzip
+member, so it can be read back by seeking to its offset. Payloads are
+addressed by SHA-256: a page whose body was already archived (under any URL)
+only gets an index entry, not a second copy.
+"""
+
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, Iterator, NamedTuple, Optional
+
+DEFAULT_ARCHIVE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.page_archive')
+DEFAULT_SEGMENT_BYTES = 256 * 1024 * 1024
+
+
+class ArchivedPage(NamedTuple):
+    """A page read back from the archive."""
+    url: str
+    content: bytes
+    content_type: Optional[str]
+    encoding: Optional[str]
+
+
+class PageArchive:
+    """Append-only, content-addressed store of raw page bodies."""
+
+    def __init__(self, archive_dir: str, max_segment_bytes: int = DEFAULT_SEGMENT_BYTES):
+        """Open (or create) an archive.
+
+        Args:
+            archive_dir: Directory holding segments and the index
+            max_segment_bytes: Start a new segment once the current one exceeds this size
+        """
+        self.archive_dir = archive_dir
+        self.max_segment_bytes = max_segment_bytes
+        os.makedirs(archive_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(archive_dir, 'index.db'), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS payloads (
+                digest TEXT PRIMARY KEY,
+                segment TEXT NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                digest TEXT NOT NULL REFERENCES payloads(digest),
+                content_type TEXT,
+                encoding TEXT,
+                fetched_at TEXT NOT NULL
+            );
+        """)
+        self._db.commit()
+
+        self.stats = {'written': 0, 'deduplicated': 0, 'bytes_written': 0}
+
+        # Segment new records are appended to, and its size; only this archive appends to it
+        segments = sorted(name for name in os.listdir(archive_dir) if name.endswith('.warc.gz'))
+        if segments:
+            self._segment_number = int(segments[-1].split('-')[1].split('.')[0])
+            self._segment_size = os.path.getsize(os.path.join(archive_dir, segments[-1]))
+        else:
+            self._segment_number = 0
+            self._segment_size = 0
+
+    def _current_segment(self) -> str:
+        """Return the name of the segment new records are appended to, starting a new one when it is full."""
+        if self._segment_size >= self.max_segment_bytes:
+            self._segment_number += 1
+            self._segment_size = 0
+        return f"segment-{self._segment_number:05d}.warc.gz"
+
+    def _build_record(self, url: str, content: bytes, content_type: Optional[str], digest: str,
+                      fetched_at: str) -> bytes:
+        """Serialize a WARC resource record."""
+        headers = [
+            'WARC/1.1',
+            'WARC-Type: resource',
+            f'WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>',
+            f'WARC-Date: {fetched_at}',
+            f'WARC-Target-URI: {url}',
+            f'WARC-Payload-Digest: sha256:{digest}',
+            f'Content-Type: {content_type or "application/octet-stream"}',
+            f'Content-Length: {len(content)}',
+        ]
+        return '\r\n'.join(headers).encode('utf-8') + b'\r\n\r\n' + content + b'\r\n\r\n'
+
+    def add(self, url: str, content: bytes, content_type: Optional[str] = None,
+            encoding: Optional[str] = None) -> str:
+        """Archive a fetched page.
+
+        Args:
+            url: Page URL
+            content: Raw response body
+            content_type: Response Content-Type header
+            encoding: Response text encoding, if known
+
+        Returns:
+            SHA-256 digest of the body
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        fetched_at = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+        with self._lock:
+            known = self._db.execute("SELECT 1 FROM payloads WHERE digest = ?", (digest,)).fetchone()
+            if known:
+                self.stats['deduplicated'] += 1
+            else:
+                record = gzip.compress(self._build_record(url, content, content_type, digest, fetched_at))
+                segment = self._current_segment()
+                with open(os.path.join(self.archive_dir, segment), 'ab') as f:
+                    offset = f.tell()
+                    f.write(record)
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._segment_size = offset + len(record)
+                self._db.execute(
+                    "INSERT INTO payloads (digest, segment, offset, length) VALUES (?, ?, ?, ?)",
+                    (digest, segment, offset, len(record))
+                )
+                self.stats['written'] += 1
+                self.stats['bytes_written'] += len(record)
+
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages (url, digest, content_type, encoding, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (url, digest, content_type, encoding, fetched_at)
+            )
+            self._db.commit()
+
+        return digest
+
+    def _read_payload(self, segment: str, offset: int, length: int) -> bytes:
+        """Read a record's body back from its segment."""
+        with open(os.path.join(self.archive_dir, segment), 'rb') as f:
+            f.seek(offset)
+            record = gzip.decompress(f.read(length))
+        header_block, _, rest = record.partition(b'\r\n\r\n')
+        content_length = 0
+        for line in header_block.split(b'\r\n'):
+            name, _, value = line.partition(b':')
+            if name.strip().lower() == b'content-length':
+                content_length = int(value.strip())
+        return rest[:content_length]
+
+    def get(self, url: str) -> Optional[ArchivedPage]:
+        """Return the latest archived copy of a URL, or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT p.url, p.content_type, p.encoding, l.segment, l.offset, l.length "
+                "FROM pages p JOIN payloads l ON l.digest = p.digest WHERE p.url = ?", (url,)
+            ).fetchone()
+        if not row:
+            return None
+        url, content_type, encoding, segment, offset, length = row
+        return ArchivedPage(url, self._read_payload(segment, offset, length), content_type, encoding)
+
+    def __iter__(self) -> Iterator[ArchivedPage]:
+        """Iterate over all archived pages, reading segments sequentially."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT p.url, p.content_type, p.encoding, l.segment, l.offset, l.length "
+                "FROM pages p JOIN payloads l ON l.digest = p.digest ORDER BY l.segment, l.offset"
+            ).fetchall()
+        for url, content_type, encoding, segment, offset, length in rows:
+            yield ArchivedPage(url, self._read_payload(segment, offset, length), content_type, encoding)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def summary(self) -> Dict[str, int]:
+        """Return write statistics for this run."""
+        return dict(self.stats)
+
+    def close(self):
+        """Close the index database."""
+        with self._lock:
+            self._db.close()
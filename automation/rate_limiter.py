@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Adaptive Rate Limiter - Per-Host Request Pacing
+
+A token bucket per remote host whose refill rate is tuned with AIMD
+(additive increase, multiplicative decrease):
+
+- every healthy, fast response adds ``increase`` requests/s to the rate
+- 429 / 503 responses and errors multiply the rate by ``decrease``
+- responses slower than ``latency_target`` back off gently
+- Retry-After headers pause the host for the requested time
+
+Shared by the crawler (content_generator.py) and the translator
+(translate_content.py) in place of fixed ``time.sleep`` calls.
+"""
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+THROTTLE_STATUS_CODES = (429, 503)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (seconds or HTTP date) into seconds to wait."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class _HostBucket:
+    """Token bucket state for a single host."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+        self.requests = 0
+        self.throttles = 0
+        self.errors = 0
+        self.waited = 0.0
+        self.first_request: Optional[float] = None
+        self.last_request: Optional[float] = None
+
+
+class AdaptiveRateLimiter:
+    """Per-host token bucket rate limiter with AIMD backoff."""
+
+    def __init__(self, initial_rate: float = 1.0, min_rate: float = 0.1, max_rate: float = 10.0,
+                 burst: float = 1.0, increase: float = 0.5, decrease: float = 0.5,
+                 latency_target: float = 2.0):
+        """Initialize the limiter.
+
+        Args:
+            initial_rate: Starting rate per host (requests/s)
+            min_rate: Lowest rate backoff can reach
+            max_rate: Highest rate additive increase can reach
+            burst: Bucket capacity (requests that may be sent back to back)
+            increase: Requests/s added after each healthy response
+            decrease: Factor applied to the rate on throttling or errors
+            latency_target: Responses slower than this (seconds) reduce the rate
+        """
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target = latency_target
+
+        self._buckets: Dict[str, _HostBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host: str) -> _HostBucket:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = _HostBucket(self.initial_rate, self.burst)
+            return bucket
+
+    def acquire(self, host: str) -> float:
+        """Block until a request to ``host`` may be sent.
+
+        Args:
+            host: Remote host name
+
+        Returns:
+            Seconds spent waiting
+        """
+        bucket = self._bucket(host)
+        with bucket.lock:
+            now = time.monotonic()
+            bucket.tokens = min(bucket.burst, bucket.tokens + (now - bucket.updated) * bucket.rate)
+            bucket.updated = now
+
+            # Reserve a token now; a negative balance is paid back by waiting
+            bucket.tokens -= 1
+            wait = max(-bucket.tokens / bucket.rate if bucket.tokens < 0 else 0.0,
+                       bucket.blocked_until - now)
+
+            bucket.requests += 1
+            bucket.waited += wait
+            bucket.first_request = bucket.first_request or now + wait
+            bucket.last_request = now + wait
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def record(self, host: str, status_code: Optional[int] = None, retry_after: Optional[str] = None,
+               latency: Optional[float] = None, error: bool = False):
+        """Feed the outcome of a request back into the host's rate.
+
+        Args:
+            host: Remote host name
+            status_code: HTTP status of the response, if any
+            retry_after: Raw Retry-After header value, if any
+            latency: Request duration in seconds
+            error: The request failed without a usable response
+        """
+        bucket = self._bucket(host)
+        with bucket.lock:
+            if status_code in THROTTLE_STATUS_CODES or error:
+                if status_code in THROTTLE_STATUS_CODES:
+                    bucket.throttles += 1
+                else:
+                    bucket.errors += 1
+                bucket.rate = max(self.min_rate, bucket.rate * self.decrease)
+                # Drop any saved-up burst so the slower rate applies immediately
+                bucket.tokens = min(bucket.tokens, 0.0)
+
+                delay = parse_retry_after(retry_after)
+                if delay:
+                    bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + delay)
+            elif latency is not None and latency > self.latency_target:
+                bucket.rate = max(self.min_rate, bucket.rate * 0.9)
+            else:
+                bucket.rate = min(self.max_rate, bucket.rate + self.increase)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Return per-host request counts, throttling events and effective rate."""
+        result = {}
+        with self._lock:
+            buckets = dict(self._buckets)
+        for host, bucket in buckets.items():
+            with bucket.lock:
+                span = (bucket.last_request or 0) - (bucket.first_request or 0)
+                result[host] = {
+                    'requests': bucket.requests,
+                    'effective_rate': (bucket.requests - 1) / span if span > 0 else 0.0,
+                    'current_rate': bucket.rate,
+                    'throttles': bucket.throttles,
+                    'errors': bucket.errors,
+                    'waited': bucket.waited,
+                }
+        return result
+
+    def print_summary(self):
+        """Print the effective request rate and throttling events per host."""
+        for host, s in self.stats().items():
+            print(f"🚦 {host}: {s['requests']} requests at {s['effective_rate']:.2f} req/s effective "
+                  f"(now {s['current_rate']:.2f} req/s), {s['throttles']} throttled, {s['errors']} errors, "
+                  f"{s['waited']:.1f}s waiting")
@@ -42,7 +42,8 @@ class ContentPipeline:
         self.content_dir.mkdir(exist_ok=True)
         (self.content_dir / "en" / "calculators").mkdir(parents=True, exist_ok=True)
 
-    def run_content_generation(self, sitemap_url: str, limit: int = None, use_ai: bool = False):
+    def run_content_generation(self, sitemap_url: str, limit: int = None, use_ai: bool = False,
+                               resume: bool = False):
         """Run content generation phase."""
         print("🚀 Phase 1: Content Generation")
         print("=" * 50)
@@ -60,14 +61,17 @@ class ContentPipeline:
         if use_ai and os.getenv('OPENAI_API_KEY'):
             cmd.extend(["--openai-key", os.getenv('OPENAI_API_KEY')])
 
+        if resume:
+            cmd.append("--resume")
+
         result = subprocess.run(cmd, cwd=self.automation_dir)
         if result.returncode != 0:
             raise RuntimeError("Content generation failed")
 
     def run_translation(self, languages: list, service: str = 'google'):
         """Run translation phase."""
-        print("
-🌍 Phase 2: Content Translation"        print("=" * 50)
+        print("\n🌍 Phase 2: Content Translation")
+        print("=" * 50)
 
         if not languages:
             print("⚠️  No languages specified, skipping translation")
@@ -92,8 +96,8 @@ class ContentPipeline:
 
     def update_content_registry(self):
         """Update the content registry with new calculators."""
-        print("
-📝 Phase 3: Update Content Registry"        print("=" * 50)
+        print("\n📝 Phase 3: Update Content Registry")
+        print("=" * 50)
 
         # Import the registry update function
         try:
@@ -109,7 +113,8 @@ class ContentPipeline:
             print("   Run 'npm run build' to update the registry manually")
 
     def run_full_pipeline(self, sitemap_url: str, languages: list = None,
-                         limit: int = None, use_ai: bool = False, service: str = 'google'):
+                         limit: int = None, use_ai: bool = False, service: str = 'google',
+                         resume: bool = False):
         """Run the complete pipeline."""
         print("🎯 Calculator Content Generation Pipeline")
         print("=" * 60)
@@ -119,11 +124,13 @@ class ContentPipeline:
         print(f"🔄 Translation Service: {service}")
         if limit:
             print(f"📊 Limit: {limit} calculators")
+        if resume:
+            print("⏯️  Resuming previous run")
         print()
 
         try:
             # Phase 1: Generate English content
-            self.run_content_generation(sitemap_url, limit, use_ai)
+            self.run_content_generation(sitemap_url, limit, use_ai, resume)
 
             # Phase 2: Translate to other languages
             if languages:
@@ -132,8 +139,8 @@ class ContentPipeline:
             # Phase 3: Update registry
             self.update_content_registry()
 
-            print("
-✅ Pipeline completed successfully!"            print(f"📁 Content saved to: {self.content_dir}")
+            print("\n✅ Pipeline completed successfully!")
+            print(f"📁 Content saved to: {self.content_dir}")
             print("🔄 Next steps:")
             print("   1. Review generated content for quality")
             print("   2. Run 'npm run build' to update the application")
@@ -191,6 +198,9 @@ Examples:
   # Generate basic content (no AI) for testing
   python run_pipeline.py --sitemap https://example.com/sitemap.xml --limit 5
 
+  # Continue a crawl that was interrupted
+  python run_pipeline.py --sitemap https://example.com/sitemap.xml --resume
+
   # Use DeepL for high-quality translations
   export DEEPL_API_KEY=your_key_here
   python run_pipeline.py --sitemap https://example.com/sitemap.xml --service deepl --languages de,fr
@@ -203,6 +213,8 @@ Examples:
     parser.add_argument('--ai', action='store_true', help='Use OpenAI for enhanced content generation')
     parser.add_argument('--service', choices=['google', 'deepl'], default='google',
                        help='Translation service to use')
+    parser.add_argument('--resume', action='store_true',
+                       help='Resume an interrupted crawl, skipping calculators that were already saved')
 
     args = parser.parse_args()
 
@@ -234,7 +246,8 @@ Examples:
         languages=languages,
         limit=args.limit,
         use_ai=args.ai,
-        service=args.service
+        service=args.service,
+        resume=args.resume
     )
 
 
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Slug Index - Collision-Safe Output Filenames
+
+Keeps every slug that is already taken in memory: the calculators in the
+site's content directory (``content/calculators/``), the files already in the
+output directory, and everything written during the run. Each page claims a
+slug before its JSON is written, so two pages titled "Loan Calculator" no
+longer overwrite each other, and a crawled page can't replace an existing
+calculator.
+
+Collisions are resolved deterministically, in this order:
+
+1. the title slug: ``loan-calculator``
+2. the slug plus the URL's parent path segment: ``loan-calculator-auto``
+3. the slug plus a short hash of the URL: ``loan-calculator-3f2a9c1b``
+
+A URL that wrote a file in an earlier run (according to the content manifest)
+keeps its slug, so reruns overwrite their own output instead of piling up
+suffixed copies.
+
+Pages are saved in completion order, which varies between concurrent runs, so
+the slugs handed out during a run are provisional. ``finalize`` replays the
+run's claims in sitemap order (``set_order``; URLs outside it follow, sorted)
+and lists the pages to rename, so the same crawl always produces the same files.
+"""
+
+import glob
+import hashlib
+import os
+import re
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+# Calculators already on the site; crawled pages never take their slugs
+DEFAULT_CONTENT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                   'content', 'calculators')
+
+# Owner of a file found in the output directory that no manifest entry accounts for
+_UNKNOWN = object()
+
+
+class SlugCollision(NamedTuple):
+    """A page whose title slug was already taken."""
+    slug: str
+    url: str
+    taken_by: str
+    resolved: str
+
+
+class SlugMove(NamedTuple):
+    """A page whose provisional slug changed when the run's claims were replayed in order."""
+    output_dir: str
+    url: str
+    claimed: str
+    final: str
+
+
+def slugify(text: str) -> str:
+    """Lowercase text with runs of spaces and hyphens collapsed to one hyphen and other punctuation dropped."""
+    slug = re.sub(r'[^\w\s-]', '', text.lower())
+    return re.sub(r'[-\s]+', '-', slug).strip('-')
+
+
+class SlugIndex:
+    """In-memory index of taken slugs with deterministic collision resolution."""
+
+    def __init__(self, reserved_dirs: Optional[List[str]] = None, owners: Optional[Dict[str, str]] = None):
+        """Initialize the index; directories are scanned on first use.
+
+        Args:
+            reserved_dirs: Directories whose calculator slugs are never taken by new pages
+            owners: Absolute output file path → URL that wrote it in an earlier run
+        """
+        self.reserved_dirs = [os.path.abspath(directory) for directory in reserved_dirs or []]
+        self.owners = owners or {}
+        self.collisions: List[SlugCollision] = []
+
+        self._lock = threading.Lock()
+        self._reserved: Optional[Dict[str, Optional[str]]] = None
+        # Per output directory: slug → URL that owns it (or _UNKNOWN for files from earlier runs)
+        self._taken: Dict[str, Dict[str, object]] = {}
+        # Per output directory: the slugs taken before the run, and URL → (title slug, claimed slug)
+        self._initial: Dict[str, Dict[str, object]] = {}
+        self._claims: Dict[str, Dict[str, Tuple[str, str]]] = {}
+        self._ranks: Dict[str, int] = {}
+
+    def set_order(self, urls: Iterable[str]):
+        """Set the order (usually the sitemap's) in which colliding pages get their slugs."""
+        with self._lock:
+            self._ranks = {}
+            for url in urls:
+                self._ranks.setdefault(url, len(self._ranks))
+
+    def claim(self, output_dir: str, slug: str, url: str) -> str:
+        """Reserve a slug for a page, resolving collisions.
+
+        Args:
+            output_dir: Directory the page's JSON is written to
+            slug: Slug derived from the page title
+            url: Page URL, which identifies the owner of the slug
+
+        Returns:
+            The slug to write the page under
+        """
+        with self._lock:
+            taken = self._directory(output_dir)
+            candidate = self._resolve(taken, slug, url, self.collisions)
+            self._claims[os.path.abspath(output_dir)][url] = (slug, candidate)
+            return candidate
+
+    def finalize(self) -> List[SlugMove]:
+        """Replay this run's claims in URL order and list the pages whose slug changes.
+
+        Each output directory is reset to the slugs it had before the run and
+        every page claims again, ranked by ``set_order`` (then by URL), so the
+        result no longer depends on the order in which pages were saved. The
+        collisions are recomputed accordingly.
+
+        Returns:
+            The pages to rename, as (output dir, url, provisional slug, final slug)
+        """
+        with self._lock:
+            moves: List[SlugMove] = []
+            collisions: List[SlugCollision] = []
+            for output_dir, claims in self._claims.items():
+                taken = self._taken[output_dir] = dict(self._initial[output_dir])
+                for url in sorted(claims, key=lambda url: (self._ranks.get(url, len(self._ranks)), url)):
+                    slug, claimed = claims[url]
+                    final = self._resolve(taken, slug, url, collisions)
+                    if final != claimed:
+                        moves.append(SlugMove(output_dir, url, claimed, final))
+                        claims[url] = (slug, final)
+            self.collisions = collisions
+            return moves
+
+    def _resolve(self, taken: Dict[str, object], slug: str, url: str, collisions: List[SlugCollision]) -> str:
+        """Pick the first free candidate slug for a page and mark it taken."""
+        reserved = self._reserved_slugs()
+        candidates = self._candidates(slug, url)
+        for candidate in candidates:
+            owner = taken.get(candidate)
+            if candidate in reserved and reserved[candidate] != url:
+                continue
+            # Files left by earlier runs without a manifest entry go to the first page claiming them
+            if owner is None or owner is _UNKNOWN or owner == url:
+                break
+        else:
+            counter = 2
+            while f"{candidates[-1]}-{counter}" in taken or f"{candidates[-1]}-{counter}" in reserved:
+                counter += 1
+            candidate = f"{candidates[-1]}-{counter}"
+
+        taken[candidate] = url
+        if candidate != slug:
+            owner = taken.get(slug)
+            collisions.append(SlugCollision(
+                slug, url, owner if isinstance(owner, str) else 'existing content', candidate
+            ))
+        return candidate
+
+    def __contains__(self, slug: str) -> bool:
+        """Whether a slug is taken by existing content or by any page written so far."""
+        with self._lock:
+            return slug in self._reserved_slugs() or any(slug in taken for taken in self._taken.values())
+
+    def _candidates(self, slug: str, url: str) -> List[str]:
+        """Slugs to try for a page, in order of preference."""
+        candidates = [slug]
+        segments = [segment for segment in urlparse(url).path.split('/') if segment]
+        parent = slugify(segments[-2]) if len(segments) > 1 else ''
+        if parent and parent not in slug.split('-'):
+            candidates.append(f"{slug}-{parent}")
+        candidates.append(f"{slug}-{hashlib.sha1(url.encode('utf-8')).hexdigest()[:8]}")
+        return candidates
+
+    def _reserved_slugs(self) -> Dict[str, Optional[str]]:
+        """Slugs of the reserved directories, mapped to the URL that wrote them (if any)."""
+        if self._reserved is None:
+            self._reserved = {}
+            for directory in self.reserved_dirs:
+                for path in glob.glob(os.path.join(directory, '*.json')):
+                    slug = os.path.splitext(os.path.basename(path))[0]
+                    self._reserved[slug] = self.owners.get(path)
+        return self._reserved
+
+    def _directory(self, output_dir: str) -> Dict[str, object]:
+        """Slugs already present in an output directory, scanned once."""
+        output_dir = os.path.abspath(output_dir)
+        taken = self._taken.get(output_dir)
+        if taken is None:
+            taken = self._taken[output_dir] = {}
+            for path in glob.glob(os.path.join(output_dir, '*.json')):
+                slug = os.path.splitext(os.path.basename(path))[0]
+                taken[slug] = self.owners.get(path, _UNKNOWN)
+            self._initial[output_dir] = dict(taken)
+            self._claims[output_dir] = {}
+        return taken
+
+    def print_summary(self, limit: int = 10):
+        """Print the duplicate slugs found during the run and how they were resolved."""
+        if not self.collisions:
+            return
+        print(f"🔀 Slug collisions: {len(self.collisions)} pages renamed")
+        for collision in self.collisions[:limit]:
+            print(f"   {collision.slug} (taken by {collision.taken_by}): {collision.url} → {collision.resolved}")
+        if len(self.collisions) > limit:
+            print(f"   ... and {len(self.collisions) - limit} more")
+
+    def duplicate_slugs(self) -> Set[str]:
+        """Title slugs that more than one page (or existing content) wanted."""
+        return {collision.slug for collision in self.collisions}
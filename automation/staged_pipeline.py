@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Staged Pipeline - Overlapped Producer/Consumer Stages
+
+Runs a sequence of stages (for the crawler: fetch → parse → generate → write)
+concurrently, each with its own pool of worker threads and a bounded input
+queue. While one page is being parsed the next ones are already being
+fetched, and a full queue blocks its producers (backpressure), so a fast
+stage can't run arbitrarily far ahead of a slow one.
+
+CPU-bound stages hand their work to a process pool from their worker threads,
+so the pipeline itself only deals in threads.
+
+Per-stage stats (busy time, queue depth, time producers were blocked on a
+full queue) show which stage is the bottleneck.
+
+Usage:
+    fetch = Stage('fetch', fetch_page, workers=8)
+    parse = Stage('parse', parse_page, workers=4)
+    pipeline = StagedPipeline([fetch, parse])
+    pipeline.run(urls)
+    pipeline.print_summary()
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+DEFAULT_QUEUE_SIZE = 32
+
+# Tells a worker that its stage has no more input
+_DONE = object()
+
+
+class Stage:
+    """One pipeline stage: a worker function, a thread pool and a bounded input queue."""
+
+    def __init__(self, name: str, func: Callable[[Any], Any], workers: int = 1,
+                 queue_size: int = DEFAULT_QUEUE_SIZE, finish: Optional[Callable[[], Any]] = None):
+        """Initialize the stage.
+
+        Args:
+            name: Stage name used in stats
+            func: Called with each input item; its return value is passed to the
+                next stage (None passes nothing on)
+            workers: Number of worker threads
+            queue_size: Maximum number of items waiting in the input queue
+            finish: Called once after all workers are done and before the next stage
+                is told its input has ended (e.g. to wait for asynchronous work that
+                still feeds the next stage through ``put``)
+        """
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.finish = finish
+        self.queue: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+        self.next: Optional['Stage'] = None
+
+        self.stats = {'items': 0, 'emitted': 0, 'errors': 0, 'busy': 0.0, 'blocked': 0.0,
+                      'depth_total': 0, 'depth_samples': 0, 'max_depth': 0}
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+
+    def put(self, item: Any):
+        """Queue an item for this stage, blocking while the queue is full."""
+        start = time.perf_counter()
+        self.queue.put(item)
+        blocked = time.perf_counter() - start
+        depth = self.queue.qsize()
+        with self._lock:
+            self.stats['blocked'] += blocked
+            self.stats['depth_total'] += depth
+            self.stats['depth_samples'] += 1
+            self.stats['max_depth'] = max(self.stats['max_depth'], depth)
+
+    def start(self):
+        """Start the worker threads."""
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"{self.name}-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def close(self):
+        """Let the workers drain the queue, wait for them and run ``finish``."""
+        for _ in self._threads:
+            self.queue.put(_DONE)
+        for thread in self._threads:
+            thread.join()
+        if self.finish:
+            self.finish()
+
+    def _work(self):
+        """Worker: process items until the end-of-input marker."""
+        while True:
+            item = self.queue.get()
+            if item is _DONE:
+                return
+
+            start = time.perf_counter()
+            try:
+                result = self.func(item)
+                error = False
+            except Exception as e:
+                print(f"❌ {self.name} stage failed: {e}")
+                result, error = None, True
+            elapsed = time.perf_counter() - start
+
+            with self._lock:
+                self.stats['items'] += 1
+                self.stats['errors'] += error
+                self.stats['busy'] += elapsed
+                self.stats['emitted'] += result is not None
+
+            if result is not None and self.next:
+                self.next.put(result)
+
+
+class StagedPipeline:
+    """Chain of stages connected by bounded queues."""
+
+    def __init__(self, stages: List[Stage]):
+        """Connect the stages in order.
+
+        Args:
+            stages: Stages in processing order; each stage's results feed the next one
+        """
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        self.stages = stages
+        for stage, following in zip(stages, stages[1:]):
+            stage.next = following
+        self.elapsed = 0.0
+
+    def run(self, items: Iterable[Any]) -> int:
+        """Feed items through all stages and wait until the last one is done.
+
+        Returns:
+            Number of results produced by the last stage
+        """
+        start = time.perf_counter()
+        for stage in self.stages:
+            stage.start()
+
+        first = self.stages[0]
+        for item in items:
+            first.put(item)
+
+        # Close stages in order, so each one sees the end of its input only after
+        # everything upstream has finished
+        for stage in self.stages:
+            stage.close()
+
+        self.elapsed = time.perf_counter() - start
+        return self.stages[-1].stats['emitted']
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage stats: items, errors, utilization, queue depth and blocked producer time."""
+        summary = {}
+        for stage in self.stages:
+            stats = stage.stats
+            capacity = stage.workers * self.elapsed
+            summary[stage.name] = {
+                'workers': stage.workers,
+                'items': stats['items'],
+                'errors': stats['errors'],
+                'utilization': stats['busy'] / capacity if capacity else 0.0,
+                'queue_avg': stats['depth_total'] / stats['depth_samples'] if stats['depth_samples'] else 0.0,
+                'queue_max': stats['max_depth'],
+                'blocked': stats['blocked'],
+            }
+        return summary
+
+    def bottleneck(self) -> str:
+        """Name of the stage with the highest worker utilization."""
+        summary = self.summary()
+        return max(summary, key=lambda name: summary[name]['utilization'])
+
+    def print_summary(self):
+        """Print a per-stage utilization and queue-depth table."""
+        print(f"🧵 Pipeline stages ({self.elapsed:.1f}s, bottleneck: {self.bottleneck()}):")
+        for name, stats in self.summary().items():
+            print(f"   {name:<9} {stats['workers']:>3} workers  {stats['items']:>6} items  "
+                  f"{stats['utilization']:>6.1%} busy  queue avg {stats['queue_avg']:.1f} / max {stats['queue_max']}  "
+                  f"producers blocked {stats['blocked']:.1f}s"
+                  + (f"  {stats['errors']} errors" if stats['errors'] else ""))
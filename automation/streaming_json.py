@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Streaming JSON - Incremental Parsing of AI Output
+
+Parses the first top-level JSON object (or array) in a stream of text chunks
+as they arrive. Each top-level member is decoded on its own as soon as it is
+structurally complete, so:
+
+- fields are usable before the last token of a long completion arrives
+- a truncated or partly malformed completion still yields every member that
+  was complete, instead of failing as a whole
+
+Usage:
+    parser = StreamingJSONParser()
+    for chunk in chunks:
+        if parser.feed(chunk):
+            print(parser.fields)
+"""
+
+import json
+from typing import Any, Dict, List, Union
+
+
+class StreamingJSONParser:
+    """Incremental parser for the first top-level JSON object or array in a text stream."""
+
+    def __init__(self, start: str = '{'):
+        """Initialize the parser.
+
+        Args:
+            start: '{' to parse an object (members are fields), '[' to parse an array
+                (members are items); any text before it, such as prose or a code
+                fence, is skipped
+        """
+        if start not in ('{', '['):
+            raise ValueError(f"Unsupported container: {start}")
+        self.start = start
+        self.fields: Dict[str, Any] = {}
+        self.items: List[Any] = []
+        self.errors = 0
+        self.complete = False
+
+        self._text = ''
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member_start = None
+
+    def feed(self, chunk: str) -> int:
+        """Consume the next chunk of text.
+
+        Returns:
+            Number of top-level members completed by this chunk
+        """
+        self._text += chunk
+        text = self._text
+        completed = 0
+        i = self._pos
+
+        while i < len(text) and not self.complete:
+            ch = text[i]
+            if self._member_start is None:
+                if ch == self.start:
+                    self._depth = 1
+                    self._member_start = i + 1
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in '{[':
+                self._depth += 1
+            elif ch in '}]':
+                self._depth -= 1
+                if self._depth == 0:
+                    completed += self._end_member(text[self._member_start:i])
+                    self.complete = True
+            elif ch == ',' and self._depth == 1:
+                completed += self._end_member(text[self._member_start:i])
+                self._member_start = i + 1
+            i += 1
+
+        self._pos = i
+        return completed
+
+    def _end_member(self, member: str) -> int:
+        """Decode one complete top-level member; malformed members are counted and skipped."""
+        member = member.strip()
+        if not member:
+            return 0
+        try:
+            if self.start == '{':
+                self.fields.update(json.loads('{' + member + '}'))
+            else:
+                self.items.append(json.loads(member))
+            return 1
+        except ValueError:
+            self.errors += 1
+            return 0
+
+    @property
+    def value(self) -> Union[Dict[str, Any], List[Any]]:
+        """Members decoded so far: a dict of fields, or a list of items."""
+        return self.fields if self.start == '{' else self.items
+
+
+def parse_partial_json(text: str, start: str = '{') -> Union[Dict[str, Any], List[Any]]:
+    """Decode every complete top-level member of a possibly truncated JSON text.
+
+    Args:
+        text: Text containing a JSON object or array, possibly cut off or surrounded by prose
+        start: '{' for an object, '[' for an array
+
+    Returns:
+        The complete fields (object) or items (array) found
+    """
+    parser = StreamingJSONParser(start)
+    parser.feed(text)
+    return parser.value
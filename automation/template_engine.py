@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Template Engine - Bulk Template-Based Content Generation
+
+The text templates used when content is generated without AI, plus the
+precompiled renderer that all template-based generation goes through.
+
+``TemplateEngine`` compiles the templates and regexes once. It also caches the
+parts that repeat across calculators (field instructions, sample inputs) and
+renders each record by concatenation, so a whole batch of extracted records
+(or the whole corpus, after a template tweak) is rendered in one call.
+
+Usage:
+    engine = TemplateEngine()
+    contents = engine.render_batch(extracted_records)
+"""
+
+import re
+from typing import Any, Dict, List, Tuple, Union
+
+# Characters stripped from scraped descriptions before they are used as meta descriptions
+CLEAN_DESCRIPTION_RE = re.compile(r'[^\w\s.,-]')
+
+META_DESCRIPTION = ("Use our free online {title} to quickly calculate results. "
+                    "Get accurate calculations with detailed explanations and examples.")
+
+FIELD_INSTRUCTION = ("Enter the {label}. This is an important input that affects your calculation results. "
+                     "Make sure to enter accurate values for the best results.")
+
+INSTRUCTION_DETAIL = (" This step is crucial for obtaining accurate calculation results. "
+                      "Take your time to enter the correct information.")
+
+CALCULATE_INSTRUCTION = ("Click the 'Calculate' button to process your inputs. The calculator will instantly "
+                         "display the results along with any additional information or explanations.")
+
+EXAMPLE_OUTPUT = "Calculation result {number}: ${result} - This demonstrates a typical calculation scenario."
+EXAMPLE_RESULTS = [150.75, 287.50, 412.25]
+
+APPLICATIONS = """This {calculator_type} is useful in many real-world scenarios. Students can use it to verify homework calculations and understand mathematical concepts. Professionals in finance, engineering, and other technical fields rely on accurate calculations for their work. Homeowners and individuals can make informed decisions by quickly calculating different scenarios.
+
+Beyond basic calculations, this tool helps users understand the relationships between different variables and how changes in one input affect the final result. Whether you're planning a budget, analyzing investment options, or solving complex mathematical problems, having access to reliable calculation tools is essential in today's data-driven world.
+
+The calculator's step-by-step approach also makes it an excellent educational tool, helping users learn the underlying mathematical principles while getting practical results they can apply immediately."""
+
+# Cached per-label/per-field-set renderings are dropped once a cache grows past this size
+MAX_CACHE_ENTRIES = 100000
+
+_MISSING = object()
+
+
+def _split(template: str, placeholder: str) -> Tuple[str, str]:
+    """Split a single-placeholder template into its prefix and suffix."""
+    prefix, _, suffix = template.partition('{' + placeholder + '}')
+    return prefix, suffix
+
+
+class TemplateEngine:
+    """Precompiled renderer for template-based calculator content."""
+
+    def __init__(self):
+        self._meta_prefix, self._meta_suffix = _split(META_DESCRIPTION, 'title')
+        self._meta_fixed_length = len(self._meta_prefix) + len(self._meta_suffix)
+        self._field_prefix, self._field_suffix = _split(FIELD_INSTRUCTION, 'label')
+        self._applications_prefix, self._applications_suffix = _split(APPLICATIONS, 'calculator_type')
+        self._example_outputs = [EXAMPLE_OUTPUT.format(number=i + 1, result=EXAMPLE_RESULTS[i % 3])
+                                 for i in range(3)]
+        self._clean = CLEAN_DESCRIPTION_RE.sub
+
+        self._field_instructions: Dict[str, str] = {}
+        self._sample_inputs: Dict[Tuple, List[Dict[str, Any]]] = {}
+
+    def render(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Render content for a single extracted record."""
+        title = data.get('title', 'Calculator')
+        form_fields = data.get('form_fields', [])
+        return {
+            'title': title,
+            'metaDescription': self._meta_description(title, data.get('description', '')),
+            'instructions': self._instructions(form_fields, data.get('existing_instructions', [])),
+            'examples': self._examples(form_fields, data.get('existing_examples', [])),
+            'applications': (self._applications_prefix + title.lower().replace(' calculator', '')
+                             + self._applications_suffix),
+            'formFields': form_fields
+        }
+
+    def render_batch(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Render content for a batch of extracted records, in order."""
+        render = self.render
+        return [render(data) for data in records]
+
+    def _meta_description(self, title: str, description: str) -> str:
+        if description and len(description) > 50:
+            clean_desc = self._clean('', description)
+            return clean_desc[:137] + "..." if len(clean_desc) > 140 else clean_desc
+
+        lowered = title.lower()
+        base_desc = self._meta_prefix + lowered + self._meta_suffix
+        return base_desc[:155] + "..." if self._meta_fixed_length + len(lowered) > 155 else base_desc
+
+    def _instructions(self, form_fields: List[Dict], existing: List[str]) -> List[str]:
+        if existing:
+            instructions = [
+                instr if len(instr) > 100 else (instr if instr.endswith('.') else instr + '.') + INSTRUCTION_DETAIL
+                for instr in existing[:4]
+            ]
+        else:
+            cache = self._field_instructions
+            instructions = []
+            for i, field in enumerate(form_fields[:4]):
+                label = field.get('label', f'Field {i+1}')
+                instruction = cache.get(label)
+                if instruction is None:
+                    if len(cache) >= MAX_CACHE_ENTRIES:
+                        cache.clear()
+                    instruction = cache[label] = self._field_prefix + label.lower() + self._field_suffix
+                instructions.append(instruction)
+
+        instructions.append(CALCULATE_INSTRUCTION)
+        return instructions
+
+    def _examples(self, form_fields: List[Dict], existing: List[Dict]) -> List[Dict]:
+        examples = [example for example in existing[:3] if 'input' in example or 'text' in example]
+        if len(examples) >= 3:
+            return examples
+
+        key = tuple([(field.get('name', _MISSING), field.get('type', 'number')) for field in form_fields[:3]])
+        inputs = self._sample_inputs.get(key)
+        if inputs is None:
+            if len(self._sample_inputs) >= MAX_CACHE_ENTRIES:
+                self._sample_inputs.clear()
+            inputs = self._sample_inputs[key] = [self._build_inputs(key, index) for index in range(3)]
+
+        outputs = self._example_outputs
+        for index in range(len(examples), 3):
+            examples.append({'input': inputs[index].copy(), 'output': outputs[index], 'type': 'generated'})
+        return examples
+
+    @staticmethod
+    def _build_inputs(key: Tuple, index: int) -> Dict[str, Union[int, float, str]]:
+        """Sample inputs for the first three fields of a record."""
+        inputs: Dict[str, Union[int, float, str]] = {}
+        for name, field_type in key:
+            field_name = f'field_{len(inputs)}' if name is _MISSING else name
+
+            if field_type == 'number':
+                lowered = field_name.lower()
+                if 'amount' in lowered or 'price' in lowered:
+                    inputs[field_name] = [1000, 5000, 10000][index % 3]
+                elif 'rate' in lowered or 'percent' in lowered:
+                    inputs[field_name] = [3.5, 5.0, 7.5][index % 3]
+                elif 'month' in lowered or 'year' in lowered:
+                    inputs[field_name] = [12, 24, 36][index % 3]
+                else:
+                    inputs[field_name] = [10, 25, 50][index % 3]
+            else:
+                inputs[field_name] = f"Sample {field_name}"
+        return inputs
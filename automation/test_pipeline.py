@@ -11,6 +11,7 @@ Usage:
 
 import json
 import os
+import time
 from pathlib import Path
 from content_generator import CalculatorContentGenerator
 
@@ -153,6 +154,1090 @@ def test_file_operations():
     print(f"📊 Test files saved to: {test_dir}")
 
 
+def test_sitemap_reader():
+    """Test streaming sitemap parsing with index files and gzip."""
+    import gzip
+    import io
+    from sitemap_reader import iter_sitemap_stream
+
+    print("\n🗺️  Testing Sitemap Reader")
+    print("=" * 50)
+
+    urlset = (
+        '<?xml version="1.0"?>'
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        '<url><loc>https://example.com/loan-calculator</loc><lastmod>2024-01-15</lastmod></url>'
+        '<url><loc>https://example.com/bmi-calculator</loc></url>'
+        '</urlset>'
+    ).encode('utf-8')
+
+    entries = list(iter_sitemap_stream(io.BytesIO(gzip.compress(urlset))))
+    assert [e.loc for e in entries] == ['https://example.com/loan-calculator', 'https://example.com/bmi-calculator']
+    assert entries[0].lastmod == '2024-01-15' and entries[1].lastmod is None
+    print(f"✅ Parsed {len(entries)} URLs from gzipped sitemap")
+
+    index = (
+        '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        '<sitemap><loc>https://example.com/sitemap-1.xml.gz</loc></sitemap>'
+        '</sitemapindex>'
+    ).encode('utf-8')
+
+    children = []
+    assert list(iter_sitemap_stream(io.BytesIO(index), children)) == []
+    assert children == ['https://example.com/sitemap-1.xml.gz']
+    print(f"✅ Found {len(children)} child sitemap in sitemap index")
+
+
+def test_crawl_journal():
+    """Test resumable crawl bookkeeping."""
+    import tempfile
+    from crawl_journal import CrawlJournal
+
+    print("\n📒 Testing Crawl Journal")
+    print("=" * 50)
+
+    urls = [f'https://example.com/calc-{i}-calculator' for i in range(4)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = CrawlJournal(os.path.join(tmp, 'journal.db'))
+        journal.discover(urls)
+        journal.mark(urls[0], 'saved')
+        journal.mark(urls[1], 'fetched')
+        journal.mark(urls[2], 'failed', 'HTTP 500')
+
+        # Saved URLs are skipped; interrupted and failed ones are retried
+        assert journal.pending(urls, max_retries=3) == urls[1:]
+
+        journal.mark(urls[2], 'failed', 'HTTP 500')
+        journal.mark(urls[2], 'failed', 'HTTP 500')
+        assert journal.pending(urls, max_retries=3) == [urls[1], urls[3]]
+
+        print(f"✅ Journal state counts: {journal.counts()}")
+        journal.close()
+
+    # The journal, page cache and archive are only created once a crawl uses them
+    with tempfile.TemporaryDirectory() as tmp:
+        generator = CalculatorContentGenerator(cache_dir=os.path.join(tmp, 'cache'),
+                                               journal_path=os.path.join(tmp, 'journal.db'),
+                                               archive_dir=os.path.join(tmp, 'archive'), manifest_path=None)
+        generator.generate_expanded_content({'title': 'Loan Calculator'})
+        assert os.listdir(tmp) == []
+        generator._record(urls[0], 'fetched')
+        assert os.path.exists(os.path.join(tmp, 'journal.db')) and not os.path.exists(os.path.join(tmp, 'cache'))
+        generator.journal.close()
+
+
+def test_content_manifest():
+    """Test incremental crawl bookkeeping."""
+    import tempfile
+    from content_manifest import ContentManifest, content_hash
+
+    print("\n🔁 Testing Content Manifest")
+    print("=" * 50)
+
+    url = 'https://example.com/loan-calculator'
+    extracted = {'title': 'Loan Calculator', 'description': 'Calculate loan payments.', 'form_fields': []}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, 'loan-calculator.json')
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write('{}')
+
+        manifest = ContentManifest(os.path.join(tmp, 'manifest.json'))
+        assert not manifest.is_unchanged(url, '2024-01-15')
+
+        manifest.update(url, '2024-01-15', content_hash(extracted), output)
+        manifest.save()
+
+        reloaded = ContentManifest(os.path.join(tmp, 'manifest.json'))
+        assert reloaded.is_unchanged(url, '2024-01-15')
+        assert not reloaded.is_unchanged(url, '2024-02-01')
+        assert reloaded.has_same_content(url, content_hash(dict(extracted)))
+        assert not reloaded.has_same_content(url, content_hash({**extracted, 'title': 'Car Loan Calculator'}))
+        # Runs into another output directory don't skip pages written elsewhere
+        assert reloaded.is_unchanged(url, '2024-01-15', tmp)
+        assert not reloaded.is_unchanged(url, '2024-01-15', os.path.join(tmp, 'other'))
+        assert not reloaded.has_same_content(url, content_hash(extracted), os.path.join(tmp, 'other'))
+
+        # A deleted output file forces regeneration
+        os.remove(output)
+        assert not reloaded.is_unchanged(url, '2024-01-15')
+
+        # Pages that fell back to templates after a failed AI request are generated again next run
+        generator = CalculatorContentGenerator(cache_dir=None, journal_path=None, archive_dir=None,
+                                               manifest_path=os.path.join(tmp, 'generator-manifest.json'))
+        expanded, fallback = generator._ai_result(extracted, None)
+        assert fallback
+        generator._save_generated(url, expanded, tmp, '2024-01-15', None if fallback else content_hash(extracted))
+        assert not generator.manifest.is_unchanged(url, '2024-01-15')
+        assert not generator.manifest.has_same_content(url, content_hash(extracted))
+        assert generator._ai_result(extracted, json.dumps(
+            {'metaDescription': 'Loan payments.', 'instructions': [], 'examples': [], 'applications': ''}))[1] is False
+
+    print("✅ Unchanged pages are skipped by lastmod and content hash")
+
+
+def test_rate_limiter():
+    """Test AIMD rate adaptation."""
+    from rate_limiter import AdaptiveRateLimiter, parse_retry_after
+
+    print("\n🚦 Testing Rate Limiter")
+    print("=" * 50)
+
+    limiter = AdaptiveRateLimiter(initial_rate=4.0, min_rate=0.5, max_rate=5.0, increase=0.5, decrease=0.5)
+    host = 'example.com'
+
+    limiter.acquire(host)
+    limiter.record(host, 200, latency=0.1)
+    assert limiter.stats()[host]['current_rate'] == 4.5
+
+    limiter.record(host, 429)
+    assert limiter.stats()[host]['current_rate'] == 2.25
+    assert limiter.stats()[host]['throttles'] == 1
+
+    for _ in range(10):
+        limiter.record(host, 200, latency=0.1)
+    assert limiter.stats()[host]['current_rate'] == 5.0
+
+    assert parse_retry_after('3') == 3.0
+    assert parse_retry_after('not a date') is None
+    print(f"✅ Rate adapts between throttling and healthy responses: {limiter.stats()[host]}")
+
+
+def test_page_archive():
+    """Test archiving and offline replay of fetched pages."""
+    import tempfile
+    from page_archive import PageArchive
+
+    print("\n🗄️  Testing Page Archive")
+    print("=" * 50)
+
+    page = b'<html><head><title>Loan Calculator</title></head><body><h1>Loan Calculator</h1></body></html>'
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = PageArchive(tmp, max_segment_bytes=1)
+        archive.add('https://example.com/loan-calculator', page, 'text/html', 'utf-8')
+        # Same body under another URL is stored once
+        archive.add('https://example.com/loan-calculator?ref=nav', page, 'text/html', 'utf-8')
+        archive.add('https://example.com/bmi-calculator', page.replace(b'Loan', b'BMI'), 'text/html', 'utf-8')
+        assert archive.summary()['written'] == 2
+        assert archive.summary()['deduplicated'] == 1
+        archive.close()
+
+        # The tiny segment limit starts a new segment per record
+        assert sorted(name for name in os.listdir(tmp) if name.endswith('.warc.gz')) == [
+            'segment-00000.warc.gz', 'segment-00001.warc.gz']
+
+        reopened = PageArchive(tmp)
+        assert len(reopened) == 3
+        assert reopened.get('https://example.com/loan-calculator').content == page
+        assert reopened.get('https://example.com/missing-calculator') is None
+
+        generator = CalculatorContentGenerator(cache_dir=None, journal_path=None, manifest_path=None,
+                                               archive_dir=None)
+        titles = [generator.extract_from_html(p.url, p.content, p.encoding)['title'] for p in reopened]
+        assert sorted(titles) == ['BMI Calculator', 'Loan Calculator', 'Loan Calculator']
+        reopened.close()
+
+        # A reopened archive carries on from the last segment on disk
+        appending = PageArchive(tmp, max_segment_bytes=1)
+        appending.add('https://example.com/tip-calculator', page.replace(b'Loan', b'Tip'), 'text/html', 'utf-8')
+        appending.close()
+        assert 'segment-00002.warc.gz' in os.listdir(tmp)
+
+    print("✅ Pages are archived once per body and replayed offline")
+
+
+def test_existing_instructions_and_examples():
+    """Test the single-pass extraction of instructions and examples from a source page."""
+    from bs4 import BeautifulSoup
+
+    print("\n📋 Testing Instruction and Example Extraction")
+    print("=" * 50)
+
+    page = """<html><body><h1>Loan Calculator</h1>
+        <p class="step-note">Choose the loan term in months</p>
+        <ol><li>Enter the loan amount</li><li>Enter the interest rate</li><li>Short</li></ol>
+        <ul class="nav"><li>Enter the loan amount</li></ul>
+        <table><tr><td>Example 1</td><td>$10,000 at 5% for 36 months</td></tr><tr><td>Too short</td></tr></table>
+        <div class="example">Borrowing $5,000 at 4% costs $92 per month</div>
+        <div class="example">Borrowing $5,000 at 4% costs $92 per month</div>
+        <p class="calculation">12 x 100 = 1,200 in total payments</p>
+    </body></html>"""
+
+    generator = CalculatorContentGenerator(cache_dir=None, journal_path=None, manifest_path=None,
+                                           archive_dir=None)
+    # Dedicated sections rank above generic list items and table rows; duplicates and short texts dropped
+    instructions, examples = generator._extract_instructions_and_examples(BeautifulSoup(page, 'html.parser'))
+    assert instructions == ['Choose the loan term in months', 'Enter the loan amount', 'Enter the interest rate']
+    assert examples == [{'text': 'Borrowing $5,000 at 4% costs $92 per month', 'type': 'existing'},
+                        {'text': 'Example 1$10,000 at 5% for 36 months', 'type': 'existing'},
+                        {'text': '12 x 100 = 1,200 in total payments', 'type': 'existing'}]
+
+    # A navigation menu ahead of the instructions does not crowd them out
+    nav = ''.join(f'<li><a href="/calc{i}">Calculator number {i}</a></li>' for i in range(12))
+    instructions, _ = generator._extract_instructions_and_examples(BeautifulSoup(
+        f'<ul class="menu">{nav}</ul><div class="instructions">Enter your gross pay and pay period</div>'
+        '<ol><li>Pick the filing status</li></ol>', 'html.parser'))
+    assert instructions == ['Enter your gross pay and pay period', 'Pick the filing status'] + \
+        [f'Calculator number {i}' for i in range(8)]
+
+    # Both lists stop at their limits, keeping the first items
+    steps = ''.join(f'<li>Enter the value of step {i}</li>' for i in range(15))
+    rows = ''.join(f'<tr><td>Example {i}: principal $1,000 at {i}%</td></tr>' for i in range(8))
+    instructions, examples = generator._extract_instructions_and_examples(
+        BeautifulSoup(f'<ol>{steps}</ol><table>{rows}</table>', 'html.parser'))
+    assert instructions == [f'Enter the value of step {i}' for i in range(10)]
+    assert [example['text'] for example in examples] == [f'Example {i}: principal $1,000 at {i}%' for i in range(5)]
+
+    print("✅ Instructions and examples are found in selector priority order without duplicates")
+
+
+def test_declared_encoding():
+    """Test that pages without a charset header are decoded from their <meta charset>."""
+    import contextlib
+    import io
+    import tempfile
+    import requests
+    from content_generator import declared_encoding
+    from page_archive import PageArchive
+
+    print("\n🔤 Testing Page Encoding Detection")
+    print("=" * 50)
+
+    assert declared_encoding('text/html') is None and declared_encoding(None) is None
+    assert declared_encoding('text/html; charset="UTF-8"') == 'UTF-8'
+
+    page = ('<html><head><meta charset="utf-8"><title>Café Calculator – €</title></head>'
+            '<body><h1>Café Calculator – €</h1></body></html>').encode('utf-8')
+    response = requests.Response()
+    response.status_code = 200
+    response._content = page
+    response.headers['Content-Type'] = 'text/html'
+    # What requests reports for text/html without a charset
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    assert response.encoding == 'ISO-8859-1'
+
+    generator = CalculatorContentGenerator(cache_dir=None, journal_path=None, manifest_path=None,
+                                           archive_dir=None)
+    generator._fetch = lambda url: response
+    with contextlib.redirect_stdout(io.StringIO()):
+        extracted = generator.extract_calculator_content('https://example.com/cafe-calculator')
+    assert extracted['title'] == 'Café Calculator – €'
+    assert 'Café Calculator – €' in extracted['raw_html']
+
+    # Archives written earlier stored the ISO-8859-1 fallback; replays ignore it
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = PageArchive(tmp)
+        archive.add('https://example.com/cafe-calculator', page, 'text/html', 'ISO-8859-1')
+        archive.close()
+        output_dir = os.path.join(tmp, 'out')
+        with contextlib.redirect_stdout(io.StringIO()):
+            generator.process_archive(tmp, output_dir)
+        written = [name for name in os.listdir(output_dir) if name.endswith('.json')]
+        with open(os.path.join(output_dir, written[0]), encoding='utf-8') as f:
+            assert json.load(f)['title'] == 'Café Calculator – €'
+
+    print("✅ Pages are decoded with their declared charset, or detected from the page")
+
+
+def test_ai_generation():
+    """Test concurrent, packed AI generation with per-item template fallback."""
+    from ai_stub_server import start_stub_server
+
+    print("\n🤖 Testing AI Generation Stage")
+    print("=" * 50)
+
+    items = [{'title': f'Test {i} Calculator', 'description': 'Calculates a test value.', 'form_fields': []}
+             for i in range(5)]
+    options = dict(api_key='test', cache_dir=None, journal_path=None, manifest_path=None, archive_dir=None,
+                   ai_cache_path=None, ai_concurrency=4, ai_pack_size=2)
+
+    server = start_stub_server(latency=0.01)
+    generator = CalculatorContentGenerator(ai_base_url=f"http://127.0.0.1:{server.server_port}/v1", **options)
+    results = generator.generate_expanded_content_batch(items)
+    assert [r['title'] for r in results] == [item['title'] for item in items]
+    assert all(r['metaDescription'].startswith('Free online Test') for r in results)
+    # Five small calculators, two per request
+    assert generator.ai_stage.summary()['requests'] == 3
+    generator.ai_stage.close()
+    server.shutdown()
+
+    failing = start_stub_server(latency=0.01, error_rate=1.0)
+    generator = CalculatorContentGenerator(ai_base_url=f"http://127.0.0.1:{failing.server_port}/v1", **options)
+    results = generator.generate_expanded_content_batch(items)
+    assert results == [generator._generate_with_templates(item) for item in items]
+    assert generator.ai_stage.summary()['failed_items'] == 5
+    generator.ai_stage.close()
+    failing.shutdown()
+
+    print("✅ AI requests run concurrently, packed, with template fallback per item")
+
+
+def test_ai_cache():
+    """Test the AI response cache: hits, TTL expiry and LRU eviction."""
+    import tempfile
+    from ai_cache import AIResponseCache, cache_key
+    from ai_generator import AIGenerationStage
+    from ai_stub_server import start_stub_server
+
+    print("\n🧠 Testing AI Response Cache")
+    print("=" * 50)
+
+    assert cache_key('gpt-3.5-turbo', 'prompt', 0.7) == cache_key('gpt-3.5-turbo', 'prompt', 0.7)
+    assert cache_key('gpt-3.5-turbo', 'prompt', 0.7) != cache_key('gpt-3.5-turbo', 'prompt', 0.2)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = AIResponseCache(os.path.join(tmp, 'ai.db'), max_bytes=10)
+        cache.put('a', '12345', 100)
+        cache.get('a')
+        cache.put('b', '67890', 100)
+        cache.put('c', 'abcde', 100)
+        # Over the 10-byte cap: the least recently used entry goes first
+        assert cache.get('a') is None and cache.get('c') == 'abcde'
+        cache.close()
+
+        expiring = AIResponseCache(os.path.join(tmp, 'ttl.db'), ttl=-1)
+        expiring.put('a', 'stale', 100)
+        assert expiring.get('a') is None and expiring.stats['expired'] == 1
+        expiring.close()
+
+        server = start_stub_server(latency=0.01)
+        prompts = [f"Title: Cached {i} Calculator" for i in range(4)]
+        for run in range(2):
+            stage = AIGenerationStage('test', api_base=f"http://127.0.0.1:{server.server_port}/v1",
+                                      cache=AIResponseCache(os.path.join(tmp, 'stage.db')))
+            responses = stage.run(prompts)
+            assert all('Cached' in response for response in responses)
+            stats = stage.summary()
+            stage.print_summary()
+            assert stats['requests'] == (4 if run == 0 else 0)
+            assert stage.cache.stats['tokens_avoided'] == (0 if run == 0 else sum(
+                len(p) // 4 + len(r) // 4 for p, r in zip(prompts, responses)))
+            stage.close()
+        server.shutdown()
+
+    print("✅ Repeated prompts are served from the cache")
+
+
+def test_streaming_ai_response():
+    """Test incremental parsing and salvage of truncated AI responses."""
+    import contextlib
+    import io
+    from ai_generator import AIGenerationStage
+    from ai_stub_server import start_stub_server
+    from streaming_json import StreamingJSONParser, parse_partial_json
+
+    print("\n📡 Testing Streaming AI Responses")
+    print("=" * 50)
+
+    text = '```json\n{"metaDescription": "Fast {braces} \\"quoted\\"", "instructions": ["a", "b"], "examples": [{"x": 1}]}\n```'
+    parser = StreamingJSONParser()
+    completed = [parser.feed(text[i:i + 7]) for i in range(0, len(text), 7)]
+    assert sum(completed) == 3 and parser.complete
+    assert parser.fields == json.loads(text[8:-4])
+
+    # Cut off mid-field, and a malformed field: the complete fields survive
+    assert parse_partial_json(text[:text.index('"examples"') + 15]) == {
+        'metaDescription': 'Fast {braces} "quoted"', 'instructions': ['a', 'b']}
+    assert parse_partial_json('{"a": 1, "b": tru, "c": [2]}') == {'a': 1, 'c': [2]}
+    assert parse_partial_json('[{"a": 1}, {"b": 2}, {"c"', '[') == [{'a': 1}, {'b': 2}]
+
+    generator = CalculatorContentGenerator(cache_dir=None, journal_path=None, manifest_path=None, archive_dir=None)
+    data = {'title': 'Loan Calculator', 'description': 'Calculates loans.', 'form_fields': []}
+    salvaged, fallback = generator._parse_ai_response(
+        '{"metaDescription": "Loan payments, fast.", "instructions": ["St', data)
+    assert fallback
+    assert salvaged['metaDescription'] == 'Loan payments, fast.'
+    assert salvaged['instructions'] == generator._generate_with_templates(data)['instructions']
+
+    server = start_stub_server(latency=0.01, truncate_rate=1.0)
+    stage = AIGenerationStage('test', api_base=f"http://127.0.0.1:{server.server_port}/v1")
+    responses = stage.run([f"Title: Stream {i} Calculator" for i in range(3)])
+    stats = stage.summary()
+    assert stats['truncated'] == 3 and stats['failed_items'] == 0
+    assert all(response.startswith('{') for response in responses)
+    assert stats['latency_p50'] is not None
+    stage.close()
+    server.shutdown()
+
+    class _Stream:
+        def __init__(self, lines):
+            self.lines = lines
+
+        def iter_lines(self):
+            return iter(self.lines)
+
+        def close(self):
+            pass
+
+    def event(content, finish_reason=None):
+        choice = {'index': 0, 'delta': {'content': content} if content else {}, 'finish_reason': finish_reason}
+        return b'data: ' + json.dumps({'choices': [choice]}).encode('utf-8')
+
+    # A stream missing its finish reason or [DONE] is truncated, not a full answer
+    complete = [event('{"a": 1}'), event(None, 'stop'), b'data: [DONE]']
+    for lines, finish_reason in [(complete, 'stop'), (complete[:1] + complete[2:], 'incomplete'),
+                                 (complete[:2], 'incomplete'), (complete[:1] + [event(None, 'length')], 'length')]:
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert stage._read_stream(_Stream(lines), '{', 0.0, []) == ('{"a": 1}', {}, finish_reason)
+
+    print("✅ Complete fields are parsed as they stream in and salvaged from truncated output")
+
+
+def test_template_engine():
+    """Test bulk template rendering and the generator paths that use it."""
+    import contextlib
+    import io
+    from template_engine import CALCULATE_INSTRUCTION, INSTRUCTION_DETAIL, TemplateEngine
+
+    print("\n🧩 Testing Template Engine")
+    print("=" * 50)
+
+    fields = [{'name': 'loan_amount', 'label': 'Loan Amount ($)', 'type': 'number'},
+              {'name': 'rate', 'label': 'Rate (%)', 'type': 'number'},
+              {'label': 'Notes', 'type': 'text'},
+              {'name': 'years', 'type': 'number'}]
+    records = [
+        {'title': 'Loan Calculator', 'description': 'Calculate monthly loan payments & total interest (fast, free).',
+         'form_fields': fields},
+        {'title': 'A ' + 'Very ' * 40 + 'Long Calculator', 'form_fields': fields[1:]},
+        {'description': 'short', 'existing_instructions': ['Enter the principal', 'x' * 120, 'Done.'],
+         'existing_examples': [{'text': 'Example: 10 x 5 = 50'}, {'other': 1}]},
+        {},
+    ]
+
+    engine = TemplateEngine()
+    expected = [engine.render(record) for record in records]
+    loan, long_title, existing, empty = expected
+    assert loan['metaDescription'] == 'Calculate monthly loan payments  total interest fast, free.'
+    assert loan['instructions'][0].startswith('Enter the loan amount ($). This is an important input')
+    assert loan['instructions'][-1] == CALCULATE_INSTRUCTION and len(loan['instructions']) == 5
+    assert [example['input'] for example in loan['examples']] == [
+        {'loan_amount': 1000, 'rate': 3.5, 'field_2': 'Sample field_2'},
+        {'loan_amount': 5000, 'rate': 5.0, 'field_2': 'Sample field_2'},
+        {'loan_amount': 10000, 'rate': 7.5, 'field_2': 'Sample field_2'}]
+    assert loan['examples'][1]['output'].startswith('Calculation result 2: $287.5 - ')
+    assert loan['applications'].startswith('This loan is useful in many real-world scenarios.')
+    assert len(long_title['metaDescription']) == 158 and long_title['metaDescription'].endswith('...')
+    assert existing['instructions'][:3] == ['Enter the principal.' + INSTRUCTION_DETAIL, 'x' * 120,
+                                            'Done.' + INSTRUCTION_DETAIL]
+    assert existing['examples'][0] == {'text': 'Example: 10 x 5 = 50'} and len(existing['examples']) == 3
+    assert empty['title'] == 'Calculator' and empty['instructions'] == [CALCULATE_INSTRUCTION]
+
+    assert engine.render_batch(records) == expected
+    # Rendering again from warm caches gives the same, independent results
+    second = engine.render_batch(records)
+    assert second == expected
+    second[0]['examples'][0]['input']['loan_amount'] = 0
+    assert engine.render_batch(records) == expected
+
+    generator = CalculatorContentGenerator(cache_dir=None, journal_path=None, manifest_path=None, archive_dir=None)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert [generator.generate_expanded_content(record) for record in records] == expected
+        assert generator.generate_expanded_content_batch(records) == expected
+
+    print("✅ Template content is rendered by the precompiled engine, one record or a batch at a time")
+
+
+def test_staged_pipeline():
+    """Test the bounded producer/consumer pipeline."""
+    from staged_pipeline import Stage, StagedPipeline
+
+    print("\n🧵 Testing Staged Pipeline")
+    print("=" * 50)
+
+    results = []
+
+    def slow_double(x):
+        time.sleep(0.002)
+        return x * 2
+
+    def keep_multiples_of_four(x):
+        if x == 20:
+            raise ValueError("bad item")
+        return x if x % 4 == 0 else None
+
+    collect = Stage('collect', results.append, workers=2, queue_size=2)
+    # finish runs before the collect stage sees the end of its input
+    check = Stage('check', keep_multiples_of_four, workers=3, queue_size=2, finish=lambda: collect.put('late'))
+    pipeline = StagedPipeline([Stage('double', slow_double, workers=4, queue_size=2), check, collect])
+    pipeline.run(range(50))
+
+    assert sorted(r for r in results if r != 'late') == [x for x in range(0, 100, 4) if x != 20]
+    assert 'late' in results
+    summary = pipeline.summary()
+    assert list(summary) == ['double', 'check', 'collect']
+    assert summary['double']['items'] == 50 and summary['check']['errors'] == 1
+    assert all(stats['queue_max'] <= 2 for stats in summary.values())
+    assert pipeline.bottleneck() in summary
+
+    print("✅ Stages overlap with bounded queues and report utilization")
+
+
+def test_content_audit():
+    """Test near-duplicate detection across calculator files."""
+    import tempfile
+    from content_audit import audit
+
+    print("\n🔎 Testing Content Audit")
+    print("=" * 50)
+
+    boilerplate = ("Our {name} helps students, professionals and homeowners get accurate results "
+                   "in seconds with clear explanations of every step of the calculation.")
+    unique = {
+        'loan': "Loan payments depend on principal, interest rate and term; amortization front-loads interest.",
+        'bmi': "Body mass index divides weight in kilograms by the square of height in meters.",
+        'tip': "Tipping customs vary widely, so split the bill and pick a percentage that fits the service.",
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, text in unique.items():
+            content = {
+                'en': {'slug': f'{name}-calculator', 'title': f'{name} calculator',
+                       'seoContent': {'introduction': text, 'whoItsFor': boilerplate.format(name=f'{name} calculator'),
+                                      'steps': ['Enter your values in the input fields provided',
+                                                'Review the automatic calculations and results']}},
+                'es': {'seoContent': {'introduction': f"Texto propio del {name}: {text}"}},
+            }
+            with open(os.path.join(tmp, f'{name}-calculator.json'), 'w', encoding='utf-8') as f:
+                json.dump(content, f)
+
+        report = audit(tmp, threshold=0.6)
+
+    # whoItsFor differs only by calculator name, steps are identical; introductions are unique
+    clustered = {field for cluster in report['field_clusters'] for field in cluster['fields']}
+    assert clustered == {'seoContent.whoItsFor', 'seoContent.steps'}
+    assert all(cluster['files'] == 3 for cluster in report['field_clusters'])
+    assert report['files'] == 3 and report['fields'] == 12
+
+    print("✅ Boilerplate fields are clustered across calculators, unique text is not")
+
+
+def test_slug_index():
+    """Test collision-safe slugs for calculator output files."""
+    import contextlib
+    import io
+    import tempfile
+    from slug_index import SlugIndex
+
+    print("\n🔀 Testing Slug Index")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as reserved, tempfile.TemporaryDirectory() as output:
+        for directory, name in ((reserved, 'bmi-calculator'), (reserved, 'tip-calculator'), (output, 'old-calculator')):
+            with open(os.path.join(directory, f'{name}.json'), 'w', encoding='utf-8') as f:
+                f.write('{}')
+
+        owners = {os.path.join(reserved, 'tip-calculator.json'): 'https://example.com/tip-calculator'}
+        index = SlugIndex([reserved], owners)
+        # Existing calculators keep their slug; a page that wrote one before may rewrite it
+        assert index.claim(output, 'bmi-calculator', 'https://example.com/health/bmi') == 'bmi-calculator-health'
+        assert index.claim(output, 'tip-calculator', 'https://example.com/tip-calculator') == 'tip-calculator'
+
+        # Same title from different pages: parent path segment, then URL hash
+        assert index.claim(output, 'loan-calculator', 'https://example.com/finance/loan') == 'loan-calculator'
+        assert index.claim(output, 'loan-calculator', 'https://example.com/finance/loan') == 'loan-calculator'
+        assert index.claim(output, 'loan-calculator', 'https://example.com/auto/loan') == 'loan-calculator-auto'
+        hashed = index.claim(output, 'loan-calculator', 'https://other.example.com/auto/loan')
+        assert hashed.startswith('loan-calculator-') and hashed != 'loan-calculator-auto'
+        assert index.claim(output, 'loan-calculator', 'https://other.example.com/auto/loan') == hashed
+
+        # Output files from earlier runs go to the first page claiming them
+        assert index.claim(output, 'old-calculator', 'https://example.com/old') == 'old-calculator'
+        assert index.claim(output, 'old-calculator', 'https://example.com/older') != 'old-calculator'
+
+        assert 'loan-calculator-auto' in index and 'missing-calculator' not in index
+        assert index.duplicate_slugs() == {'bmi-calculator', 'loan-calculator', 'old-calculator'}
+
+        generator = CalculatorContentGenerator(cache_dir=None, journal_path=None, manifest_path=None,
+                                               archive_dir=None, reserved_slug_dir=reserved)
+        first = generator.save_calculator_json({'title': 'Loan Calculator'}, output, 'https://a.example.com/loan')
+        second = generator.save_calculator_json({'title': 'Loan Calculator'}, output, 'https://b.example.com/loan')
+        assert first != second and os.path.exists(first) and os.path.exists(second)
+
+        # Pages saved out of sitemap order are renamed once the run's claims are replayed in order
+        generator = CalculatorContentGenerator(cache_dir=None, journal_path=None, archive_dir=None,
+                                               manifest_path=os.path.join(output, 'manifest'))
+        urls = ['https://example.com/finance/rate', 'https://example.com/mortgage/rate']
+        generator.slug_index.set_order(urls)
+        late = generator.save_calculator_json({'title': 'Rate Calculator', 'n': 2}, output, urls[1])
+        early = generator.save_calculator_json({'title': 'Rate Calculator', 'n': 1}, output, urls[0])
+        generator.manifest.update(urls[1], None, 'digest', late)
+        assert os.path.basename(late) == 'rate-calculator.json'
+        assert os.path.basename(early) == 'rate-calculator-finance.json'
+        with contextlib.redirect_stdout(io.StringIO()):
+            generator._finalize_slugs()
+        for name, n in (('rate-calculator.json', 1), ('rate-calculator-mortgage.json', 2)):
+            with open(os.path.join(output, name), encoding='utf-8') as f:
+                assert json.load(f)['n'] == n
+        assert not os.path.exists(early)
+        assert generator.manifest.entries[urls[1]]['output'].endswith('rate-calculator-mortgage.json')
+        assert [(c.url, c.resolved) for c in generator.slug_index.collisions] == [
+            (urls[1], 'rate-calculator-mortgage')]
+        assert generator.slug_index.finalize() == []
+
+    print("✅ Colliding titles get distinct, stable filenames")
+
+
+def test_json_writer():
+    """Test skip-if-unchanged, atomic JSON writes."""
+    import tempfile
+    from json_writer import JSONWriter
+
+    print("\n💾 Testing JSON Writer")
+    print("=" * 50)
+
+    data = {'title': 'Préstamo Calculator', 'inputs': [{'name': 'amount', 'label': 'Monto'}]}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'nested', 'loan-calculator.json')
+        writer = JSONWriter()
+        assert writer.write(path, data, trailing_newline=True)
+        with open(path, 'r', encoding='utf-8') as f:
+            assert f.read() == json.dumps(data, indent=2, ensure_ascii=False) + '\n'
+
+        # A fresh writer (next run) compares against the file on disk
+        os.utime(path, (0, 0))
+        rerun = JSONWriter()
+        assert not rerun.write(path, data, trailing_newline=True)
+        assert os.path.getmtime(path) == 0
+        assert rerun.write(path, data)  # without the newline the bytes differ
+        assert rerun.stats['written'] == 1 and rerun.stats['skipped'] == 1 and rerun.stats['bytes_saved'] > 0
+
+        background = JSONWriter(background=True, max_pending=2)
+        for i in range(10):
+            data['inputs'][0]['label'] = f'Monto {i}'
+            background.write(os.path.join(tmp, f'calc-{i}.json'), data)
+        background.close()
+        assert sorted(os.listdir(tmp)) == sorted(['nested'] + [f'calc-{i}.json' for i in range(10)])
+        with open(os.path.join(tmp, 'calc-3.json'), 'r', encoding='utf-8') as f:
+            assert json.load(f)['inputs'][0]['label'] == 'Monto 3'
+
+    print("✅ Unchanged files are skipped, changed files are replaced atomically")
+
+
+class _FakeTranslation:
+    def __init__(self, text):
+        self.text = text
+
+
+class _FakeGoogleTranslator:
+    """Stand-in for googletrans.Translator that tags every line with the target language."""
+
+    calls = 0
+
+    def translate(self, text, src='en', dest='es'):
+        _FakeGoogleTranslator.calls += 1
+        return _FakeTranslation('\n'.join(f"[{dest}] {line}" for line in text.split('\n')))
+
+
+class _FakeDeepLTranslator:
+    """Stand-in for deepl.Translator that accepts lists of texts."""
+
+    calls = 0
+    instances = 0
+
+    def __init__(self, api_key, server_url=None):
+        _FakeDeepLTranslator.instances += 1
+        self.api_key = api_key
+        self.server_url = server_url
+
+    def translate_text(self, texts, target_lang, source_lang=None):
+        _FakeDeepLTranslator.calls += 1
+        return [_FakeTranslation(f"[{target_lang}] {text}") for text in texts]
+
+
+def _fake_translator(service, memory_path=None):
+    """Build a ContentTranslator whose backend library is replaced by a fake."""
+    import types
+    import translate_content
+
+    translate_content.Translator = _FakeGoogleTranslator
+    translate_content.deepl = types.SimpleNamespace(Translator=_FakeDeepLTranslator)
+    translate_content.GOOGLE_TRANS_AVAILABLE = translate_content.DEEPL_AVAILABLE = True
+    translator = translate_content.ContentTranslator(service, api_key='test-key' if service == 'deepl' else None,
+                                                     memory_path=memory_path)
+    translator.rate_limiter.max_rate = translator.rate_limiter.initial_rate = 1000.0
+    return translator
+
+
+def test_batched_translation():
+    """Test that a file's strings are translated in batched requests."""
+    import importlib
+    import translate_content
+
+    print("\n📦 Testing Batched Translation")
+    print("=" * 50)
+
+    calculators = [{
+        'title': f'Calculator {n}',
+        'metaDescription': 'Use our free online calculator.',
+        'applications': 'Useful for planning.\nAnd for homework.',
+        'instructions': [f'Enter value {i}.' for i in range(4)] + ["Click the 'Calculate' button."],
+        'examples': [{'input': {'amount': 100}, 'output': f'Result {i}'} for i in range(3)],
+        'formFields': [{'name': 'amount', 'label': 'Amount ($)'}, {'name': 'rate', 'label': ''}],
+    } for n in range(3)]
+
+    try:
+        google = _fake_translator('google')
+        _FakeGoogleTranslator.calls = 0
+        translated = google.translate_contents(calculators, 'es')
+        # All single-line strings of all three files share one request; the multi-line text goes alone
+        assert _FakeGoogleTranslator.calls == 2
+        assert translated[2]['title'] == '[es] Calculator 2'
+        assert translated[0]['applications'] == '[es] Useful for planning.\n[es] And for homework.'
+        assert translated[1]['examples'][2] == {'input': {'amount': 100}, 'output': '[es] Result 2'}
+        assert translated[0]['formFields'][1]['label'] == '' and calculators[0]['title'] == 'Calculator 0'
+        assert google.translate_text('Hello', 'fr') == '[fr] Hello'
+
+        deepl_translator = _fake_translator('deepl')
+        _FakeDeepLTranslator.calls = _FakeDeepLTranslator.instances = 0
+        many = [f'Label {i}' for i in range(120)]
+        assert deepl_translator.translate_texts(many + many, 'de') == [f'[DE] {text}' for text in many + many]
+        assert _FakeDeepLTranslator.calls == 3  # 120 distinct texts, 50 per request
+        # Sequential requests reuse one pooled client
+        assert _FakeDeepLTranslator.instances == 1
+        assert deepl_translator.clients.summary()['calls'] == 3
+    finally:
+        importlib.reload(translate_content)
+
+    print("✅ Strings are deduplicated and translated in a few batched requests")
+
+
+def test_client_pool():
+    """Test reuse and size limit of pooled backend clients."""
+    import threading
+    from client_pool import ClientPool
+
+    print("\n🔌 Testing Client Pool")
+    print("=" * 50)
+
+    pool = ClientPool(object, size=2)
+    with pool.client() as first:
+        pass
+    with pool.client() as second:
+        assert second is first
+
+    in_use = []
+    peak = []
+    lock = threading.Lock()
+
+    def call():
+        with pool.client() as client:
+            with lock:
+                in_use.append(client)
+                peak.append(len(in_use))
+            time.sleep(0.01)
+            with lock:
+                in_use.remove(client)
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = pool.summary()
+    assert stats['created'] == 2 and max(peak) == 2
+    assert stats['calls'] == 10 and stats['waits'] > 0 and stats['latency_p95'] >= 0.01
+
+    print("✅ Clients are reused and never exceed the pool size")
+
+
+def test_translation_memory():
+    """Test that remembered and hand-written translations skip the translation service."""
+    import importlib
+    import tempfile
+    import translate_content
+
+    print("\n📚 Testing Translation Memory")
+    print("=" * 50)
+
+    texts = ['Interest Rate (%)', "Click the 'Calculate' button.", 'Useful for planning.']
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'memory.db')
+            google = _fake_translator('google', memory_path=path)
+            _FakeGoogleTranslator.calls = 0
+            first = google.translate_texts(texts, 'es')
+            # The label comes from the hand-written dictionaries; the rest takes one request
+            assert first == ['Tasa de Interés (%)', "[es] Click the 'Calculate' button.", '[es] Useful for planning.']
+            assert _FakeGoogleTranslator.calls == 1 and google.memory.stats['hits'] == 1
+            google.memory.close()
+
+            # A later run (different whitespace) is served from disk without any request
+            rerun = _fake_translator('google', memory_path=path)
+            assert rerun.translate_texts(['  Useful   for planning. '], 'es') == ['  [es] Useful for planning. ']
+            assert rerun.translate_texts(texts, 'es') == first and _FakeGoogleTranslator.calls == 1
+            assert rerun.memory.hit_rate() == 100.0
+
+            # Failed requests are not remembered
+            def fail(texts, target_lang, source_lang='en'):
+                raise RuntimeError('service down')
+            rerun._translate_google = fail
+            assert rerun.translate_texts(['New text'], 'fr') == ['New text']
+            assert rerun.memory.lookup(['New text'], 'en', 'fr', 'google') == {}
+            rerun.memory.close()
+    finally:
+        importlib.reload(translate_content)
+
+    print("✅ Repeated strings are translated once and reused across runs")
+
+
+def test_parallel_translation():
+    """Test that parallel translate_directory matches the serial run and caps requests in flight."""
+    import contextlib
+    import importlib
+    import io
+    import tempfile
+    import threading
+    import translate_content
+
+    print("\n⚡ Testing Parallel Translation")
+    print("=" * 50)
+
+    languages = ['es', 'fr', 'de']
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            input_dir = os.path.join(tmp, 'en')
+            os.makedirs(input_dir)
+            for i in range(30):
+                with open(os.path.join(input_dir, f'calc-{i}.json'), 'w', encoding='utf-8') as f:
+                    json.dump({'title': f'Calculator {i}', 'instructions': [f'Enter value {i}.', 'Click Calculate.'],
+                               'formFields': [{'name': 'amount', 'label': 'Amount'}]}, f)
+
+            serial = _fake_translator('deepl')
+            with contextlib.redirect_stdout(io.StringIO()):
+                serial.translate_directory(input_dir, os.path.join(tmp, 'serial'), languages)
+
+            parallel = _fake_translator('deepl')
+            parallel.concurrency = 2
+            parallel._service_slots = threading.BoundedSemaphore(2)
+            in_flight = []
+            peak = []
+            lock = threading.Lock()
+            translate = parallel._translate_deepl
+
+            def tracked(texts, target_lang, source_lang='en'):
+                with lock:
+                    in_flight.append(target_lang)
+                    peak.append(len(in_flight))
+                time.sleep(0.02)
+                try:
+                    return translate(texts, target_lang, source_lang)
+                finally:
+                    with lock:
+                        in_flight.remove(target_lang)
+            parallel._translate_deepl = tracked
+
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                parallel.translate_directory(input_dir, os.path.join(tmp, 'parallel'), languages, workers=6)
+
+            # Same files and requests as the serial run, never more than two requests in flight
+            for lang in languages:
+                for i in range(30):
+                    name = os.path.join(lang, 'calculators', f'calc-{i}.json')
+                    with open(os.path.join(tmp, 'serial', name), encoding='utf-8') as a, \
+                            open(os.path.join(tmp, 'parallel', name), encoding='utf-8') as b:
+                        assert a.read() == b.read()
+            assert parallel.stats == serial.stats and max(peak) == 2
+            assert '6/6 batches, 90/90 files' in output.getvalue() and 'ETA' in output.getvalue()
+    finally:
+        importlib.reload(translate_content)
+
+    print("✅ (file batch, language) items run in parallel with a per-service request cap")
+
+
+def test_incremental_translation():
+    """Test that reruns only translate new or changed English fields."""
+    import contextlib
+    import importlib
+    import io
+    import tempfile
+    import translate_content
+
+    print("\n♻️  Testing Incremental Translation")
+    print("=" * 50)
+
+    def run(input_dir, output_dir, incremental=True):
+        translator = _fake_translator('google')
+        _FakeGoogleTranslator.calls = 0
+        with contextlib.redirect_stdout(io.StringIO()):
+            translator.translate_directory(input_dir, output_dir, ['es'], incremental=incremental)
+        return translator
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            input_dir = os.path.join(tmp, 'en')
+            output_dir = os.path.join(tmp, 'content')
+            os.makedirs(input_dir)
+            for i in range(3):
+                with open(os.path.join(input_dir, f'calc-{i}.json'), 'w', encoding='utf-8') as f:
+                    json.dump({'title': f'Calculator {i}', 'instructions': ['Enter a value.', f'Press {i}.'],
+                               'examples': [{'input': {'x': i}, 'output': f'Result {i}'}]}, f)
+
+            first = run(input_dir, output_dir)
+            assert first.stats['strings'] == 12 and _FakeGoogleTranslator.calls == 1
+            # The manifest sits next to the outputs without a .json extension
+            assert sorted(os.listdir(output_dir)) == ['.translation_manifest', 'es']
+
+            # Nothing changed: no strings are translated
+            rerun = run(input_dir, output_dir)
+            assert rerun.stats['strings'] == 0 and rerun.stats['up_to_date'] == 3 and _FakeGoogleTranslator.calls == 0
+
+            # One edited instruction in one file: one string is translated, the rest is kept
+            output_file = os.path.join(output_dir, 'es', 'calculators', 'calc-1.json')
+            with open(output_file, encoding='utf-8') as f:
+                existing = json.load(f)
+            existing['title'] = 'Calculadora revisada'
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(existing, f)
+            with open(os.path.join(input_dir, 'calc-1.json'), 'w', encoding='utf-8') as f:
+                json.dump({'title': 'Calculator 1', 'instructions': ['Enter a value.', 'Press 1 twice.'],
+                           'examples': [{'input': {'x': 10}, 'output': 'Result 1'}]}, f)
+
+            edited = run(input_dir, output_dir)
+            assert edited.stats['strings'] == 1 and edited.stats['reused'] == 3 and edited.stats['up_to_date'] == 2
+            with open(output_file, encoding='utf-8') as f:
+                assert json.load(f) == {'title': 'Calculadora revisada',
+                                        'instructions': ['[es] Enter a value.', '[es] Press 1 twice.'],
+                                        'examples': [{'input': {'x': 10}, 'output': '[es] Result 1'}]}
+
+            # A full run retranslates everything
+            assert run(input_dir, output_dir, incremental=False).stats['strings'] == 12
+    finally:
+        importlib.reload(translate_content)
+
+    print("✅ Unchanged files are skipped and only edited fields are retranslated")
+
+
+def test_merged_translation():
+    """Test in-place translation of merged multi-language calculator files."""
+    import contextlib
+    import importlib
+    import io
+    import tempfile
+    import translate_content
+
+    print("\n🗂️  Testing Merged Translation")
+    print("=" * 50)
+
+    english = {
+        'title': 'Loan Calculator',
+        'slug': 'loan-calculator',
+        'description': 'Estimate monthly payments.',
+        'calculatorComponent': {
+            'inputs': [{'name': 'amount', 'label': 'Loan Amount', 'type': 'number', 'unit': '$'}],
+            'output': {'label': 'Monthly Payment', 'default': '$0.00'},
+        },
+        'examples': [{'title': 'Basic', 'input': {'amount': '10000'}, 'output': 'Payment: $200'}],
+        'seoContent': {'introduction': 'Loans made simple.', 'examples': ['Borrow $10,000 over 5 years.'],
+                       'faqs': [{'question': 'What?', 'answer': 'A loan.'}, {'question': 'Why?', 'answer': 'To buy.'}]},
+    }
+    calculator = {
+        'en': english,
+        'es': {'title': 'Calculadora de Préstamos', 'slug': 'loan-calculator',
+               'description': 'Estimate monthly payments.', 'extra': 'kept',
+               'calculatorComponent': {'inputs': [{'name': 'amount', 'label': 'Monto del préstamo',
+                                                   'type': 'number', 'unit': '$'}]},
+               'seoContent': {'introduction': 'Préstamos fáciles.', 'examples': '10.000 $ en 5 años.',
+                              'faqs': [{'question': '¿Qué?', 'answer': 'Un préstamo.'}]}},
+    }
+
+    def run(directory):
+        translator = _fake_translator('google')
+        _FakeGoogleTranslator.calls = 0
+        with contextlib.redirect_stdout(io.StringIO()):
+            translator.translate_merged_directory(directory, ['es', 'de'])
+        return translator
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'loan-calculator.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps(calculator, indent=2, ensure_ascii=False) + '\n')
+            report = os.path.join(tmp, 'translation-issues.json')
+            with open(report, 'w', encoding='utf-8') as f:
+                json.dump([{'file': 'loan-calculator.json'}], f)
+
+            first = run(tmp)
+            # One load, one write and one request per language for the whole file
+            assert _FakeGoogleTranslator.calls == 2 and first.writer.stats['written'] == 1
+            with open(path, encoding='utf-8') as f:
+                raw = f.read()
+            merged = json.loads(raw)
+            assert raw.endswith('}\n') and merged['en'] == english and list(merged) == ['en', 'es', 'de']
+            es, de = merged['es'], merged['de']
+            # Existing translations are kept; English leftovers and missing fields are translated
+            assert es['title'] == 'Calculadora de Préstamos' and es['extra'] == 'kept'
+            assert es['description'] == '[es] Estimate monthly payments.'
+            assert es['calculatorComponent']['inputs'][0] == {'name': 'amount', 'label': 'Monto del préstamo',
+                                                              'type': 'number', 'unit': '$'}
+            # Format-only values are copied, not translated
+            assert es['calculatorComponent']['output'] == {'label': '[es] Monthly Payment', 'default': '$0.00'}
+            # A shorter translated list keeps its items and gets the missing ones appended
+            assert es['seoContent']['faqs'] == [{'question': '¿Qué?', 'answer': 'Un préstamo.'},
+                                                {'question': '[es] Why?', 'answer': '[es] To buy.'}]
+            # Values shaped differently from English are left alone
+            assert es['seoContent']['examples'] == '10.000 $ en 5 años.'
+            assert es['seoContent']['introduction'] == 'Préstamos fáciles.'
+            assert es['examples'][0] == {'title': '[es] Basic', 'input': {'amount': '10000'},
+                                         'output': '[es] Payment: $200'}
+            assert de['slug'] == 'loan-calculator' and de['title'] == '[de] Loan Calculator'
+            assert de['seoContent']['faqs'][0] == {'question': '[de] What?', 'answer': '[de] A loan.'}
+            with open(report, encoding='utf-8') as f:
+                assert json.load(f) == [{'file': 'loan-calculator.json'}]
+
+            assert run(tmp).stats['strings'] == 0 and _FakeGoogleTranslator.calls == 0
+
+            # An edited English field is retranslated in every language, nothing else
+            merged['en']['seoContent']['introduction'] = 'Loans, explained.'
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(merged, f, indent=2, ensure_ascii=False)
+            edited = run(tmp)
+            assert edited.stats['strings'] == 2 and _FakeGoogleTranslator.calls == 2
+            with open(path, encoding='utf-8') as f:
+                merged = json.load(f)
+            assert merged['de']['seoContent']['introduction'] == '[de] Loans, explained.'
+            assert merged['es']['title'] == 'Calculadora de Préstamos'
+            assert [name for name in os.listdir(tmp) if not name.endswith('.json')] == ['.translation_manifest']
+
+        # Real component specs: option values, conditions, defaults and output fields stay as they are
+        def code_values(spec, path=()):
+            if isinstance(spec, dict):
+                return {key: value for k, item in spec.items() if k not in ('label', 'placeholder')
+                        for key, value in code_values(item, path + (k,)).items()}
+            if isinstance(spec, list):
+                return {key: value for i, item in enumerate(spec)
+                        for key, value in code_values(item, path + (i,)).items()}
+            return {path: spec}
+
+        source_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'content', 'calculators')
+        with tempfile.TemporaryDirectory() as tmp:
+            originals = {}
+            for name in ('paycheck-calculator.json', 'quadratic-equation-calculator.json'):
+                with open(os.path.join(source_dir, name), encoding='utf-8') as f:
+                    originals[name] = json.load(f)
+                with open(os.path.join(tmp, name), 'w', encoding='utf-8') as f:
+                    json.dump(originals[name], f, indent=2, ensure_ascii=False)
+            run(tmp)
+            for name, original in originals.items():
+                with open(os.path.join(tmp, name), encoding='utf-8') as f:
+                    merged = json.load(f)
+                component = original['en']['calculatorComponent']
+                assert merged['es']['calculatorComponent'] == original['es']['calculatorComponent']
+                assert code_values(merged['de']['calculatorComponent']) == code_values(component)
+                assert merged['de']['calculatorComponent']['inputs'][0]['label'] == \
+                    '[de] ' + component['inputs'][0]['label']
+            assert merged['de']['calculatorComponent']['additionalOutputs'][0]['field'] == 'discriminant'
+    finally:
+        importlib.reload(translate_content)
+
+    print("✅ Missing and stale language sections are filled in with one read and write per file")
+
+
 def cleanup_test_files():
     """Clean up test output files."""
     import shutil
@@ -173,11 +1258,53 @@ def main():
         test_content_generation()
         test_translation()
         test_file_operations()
+        test_sitemap_reader()
+        test_crawl_journal()
+        test_content_manifest()
+        test_rate_limiter()
+        test_page_archive()
+        test_existing_instructions_and_examples()
+        test_declared_encoding()
+        test_ai_generation()
+        test_ai_cache()
+        test_streaming_ai_response()
+        test_template_engine()
+        test_staged_pipeline()
+        test_content_audit()
+        test_slug_index()
+        test_json_writer()
+        test_batched_translation()
+        test_client_pool()
+        test_translation_memory()
+        test_parallel_translation()
+        test_incremental_translation()
+        test_merged_translation()
 
         print("\n✅ All tests completed successfully!")
         print("\n📋 Test Results Summary:")
         print("   • Content generation: Working")
         print("   • File operations: Working")
+        print("   • Sitemap reader: Working")
+        print("   • Crawl journal: Working")
+        print("   • Content manifest: Working")
+        print("   • Rate limiter: Working")
+        print("   • Page archive: Working")
+        print("   • Instruction and example extraction: Working")
+        print("   • Page encoding detection: Working")
+        print("   • AI generation stage: Working")
+        print("   • AI response cache: Working")
+        print("   • Streaming AI responses: Working")
+        print("   • Template engine: Working")
+        print("   • Staged pipeline: Working")
+        print("   • Content audit: Working")
+        print("   • Slug index: Working")
+        print("   • JSON writer: Working")
+        print("   • Batched translation: Working")
+        print("   • Translator client pool: Working")
+        print("   • Translation memory: Working")
+        print("   • Parallel translation: Working")
+        print("   • Incremental translation: Working")
+        print("   • Merged translation: Working")
         print("   • Translation: See above")
         print("\n🚀 Ready to run the full pipeline!")
         print("   Try: python run_pipeline.py --sitemap https://example.com/sitemap.xml --limit 3")
@@ -5,16 +5,39 @@ Content Translator - Automated Translation Pipeline
 This script translates calculator content JSON files to multiple languages
 using Google Translate API or DeepL API.
 
+All translatable strings of a batch of files are collected, deduplicated and
+sent in as few requests as the service's payload limits allow, then mapped
+back into each file's structure.
+
+With ``--merged``, the site's merged files (``content/calculators/*.json``, one
+section per language) are translated in place instead: missing or stale
+language sections are filled in from the ``en`` section, reading and writing
+each file once.
+
 Usage:
     python translate_content.py --input /content/en/calculators/ --output /content/ --languages es,fr,de
+    python translate_content.py --merged --languages es,pt,fr,de,nl
 """
 
 import argparse
+import copy
+import functools
+import glob
 import json
 import os
-from typing import Dict, List, Any
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Any, Optional, Tuple
 import time
 
+from client_pool import DEFAULT_POOL_SIZE, ClientPool
+from json_writer import JSONWriter
+from rate_limiter import AdaptiveRateLimiter
+from slug_index import DEFAULT_CONTENT_DIR
+from translation_manifest import FieldPath, TranslationManifest, field_hash, field_key, source_hash
+from translation_memory import DEFAULT_TRANSLATION_MEMORY_PATH, TranslationMemory
+
 try:
     from googletrans import Translator
     GOOGLE_TRANS_AVAILABLE = True
@@ -27,19 +50,99 @@ try:
 except ImportError:
     DEEPL_AVAILABLE = False
 
+# Payload limits per request: DeepL accepts up to 50 texts and 128 KiB per call,
+# Google Translate's web endpoint about 5000 characters
+DEEPL_MAX_TEXTS = 50
+DEEPL_MAX_BYTES = 120 * 1024
+GOOGLE_MAX_CHARS = 5000
+
+# Files whose strings are translated together by translate_directory
+FILES_PER_BATCH = 25
+
+# Requests in flight per service when translate_directory runs parallel workers
+SERVICE_CONCURRENCY = {'deepl': 4, 'google': 2}
+
+# Merged content/calculators/*.json format: one file per calculator, one section per language
+MERGED_SOURCE_LANG = 'en'
+MERGED_LANGUAGES = ['es', 'pt', 'fr', 'de', 'nl']
+
+# Keys of merged sections holding identifiers, codes, units or formulas rather than text
+MERGED_SKIP_KEYS = frozenset({
+    'slug', 'category', 'subcategory', 'difficulty', 'component', 'componentName', 'relatedCalculators',
+    'name', 'id', 'type', 'format', 'unit', 'formula', 'field', 'conditional', 'value', 'default',
+})
+# Top-level keys holding a calculator component spec (older files keep inputs/outputs at the top level)
+MERGED_COMPONENT_KEYS = frozenset({'calculatorComponent', 'inputs', 'output', 'outputs', 'additionalOutputs'})
+# Keys of a component spec holding display text; everything else there is read by the component code
+MERGED_COMPONENT_TEXT_KEYS = frozenset({'label', 'placeholder', 'help', 'helpText', 'description'})
+# Example keys holding calculator input values
+EXAMPLE_INPUT_KEYS = frozenset({'input', 'inputs', 'scenario'})
+# Numbers, amounts and placeholders such as "$0.00", "0.0%", "0kg" or "0.0g/kg"
+FORMAT_ONLY_PATTERN = re.compile(r'^[^A-Za-z]*$|^[\s$€£+\-.,\d]*\d[\s.,\d]*[A-Za-z/%]{1,5}\.?$')
+# Text with at least one lowercase word; anything else (acronyms such as "IRA", "99 = XCIX") may stay English
+PROSE_PATTERN = re.compile(r'[a-z]{3,}')
+
+
+def _fill_missing(source: Any, target: Any, path: FieldPath, filled: List[FieldPath]) -> Any:
+    """Copy into target whatever source has and target lacks, keeping everything target has.
+
+    Missing dict keys and missing list items (a translated list shorter than the
+    English one) are copied from source. Where target holds a leaf but source
+    holds a dict or list (e.g. a component name instead of component labels),
+    target is kept as it is.
+
+    Args:
+        source: English value
+        target: Existing translated value at the same path
+        path: Path of the value inside the section
+        filled: Receives the paths of the values copied from English
+
+    Returns:
+        The merged value (target, modified in place where possible)
+    """
+    if isinstance(source, dict):
+        if not isinstance(target, dict):
+            return target
+        for key, value in source.items():
+            if key in target:
+                target[key] = _fill_missing(value, target[key], path + (key,), filled)
+            else:
+                filled.append(path + (key,))
+                target[key] = copy.deepcopy(value)
+        return target
+    if isinstance(source, list):
+        if not isinstance(target, list):
+            return target
+        for i, value in enumerate(source):
+            if i < len(target):
+                target[i] = _fill_missing(value, target[i], path + (i,), filled)
+            else:
+                filled.append(path + (i,))
+                target.append(copy.deepcopy(value))
+        return target
+    return target
+
 
 class ContentTranslator:
     """Automated content translation for calculator JSON files."""
 
-    def __init__(self, translation_service: str = 'google', api_key: str = None):
+    def __init__(self, translation_service: str = 'google', api_key: str = None,
+                 pool_size: int = DEFAULT_POOL_SIZE, server_url: Optional[str] = None,
+                 memory_path: Optional[str] = DEFAULT_TRANSLATION_MEMORY_PATH,
+                 concurrency: Optional[int] = None):
         """Initialize translator.
 
         Args:
             translation_service: 'google' or 'deepl'
             api_key: API key for DeepL (required for DeepL)
+            pool_size: Maximum number of backend clients kept open for reuse (at least ``concurrency``)
+            server_url: Alternative DeepL API URL (e.g. translation_stub_server.py for benchmarks)
+            memory_path: Path of the translation memory (None disables it)
+            concurrency: Requests in flight to the service (default: ``SERVICE_CONCURRENCY``)
         """
         self.service = translation_service
         self.api_key = api_key
+        self.server_url = server_url
 
         if translation_service == 'deepl' and not DEEPL_AVAILABLE:
             raise ImportError("DeepL library not installed. Run: pip install deepl")
@@ -49,6 +152,25 @@ class ContentTranslator:
         if translation_service == 'deepl' and not api_key:
             raise ValueError("DeepL API key required for DeepL translation")
 
+        # Starts at the old fixed pace of two calls per second and adapts from there
+        self.rate_limiter = AdaptiveRateLimiter(initial_rate=2.0, max_rate=10.0)
+        self.writer = JSONWriter()
+        self.stats = {'strings': 0, 'unique': 0, 'requests': 0, 'fallbacks': 0, 'up_to_date': 0, 'reused': 0}
+        self._stats_lock = threading.Lock()
+        # Parallel workers share the service's request slots
+        self.concurrency = concurrency or SERVICE_CONCURRENCY.get(translation_service, 1)
+        self._service_slots = threading.BoundedSemaphore(self.concurrency)
+        # Clients keep their HTTP connections open between calls
+        self.clients = ClientPool(self._create_client, max(pool_size, self.concurrency))
+        # Translations from earlier calls and runs, consulted before any request
+        self.memory = TranslationMemory(memory_path) if memory_path else None
+
+    def _create_client(self) -> Any:
+        """Create a backend client for the configured service."""
+        if self.service == 'deepl':
+            return deepl.Translator(self.api_key, server_url=self.server_url)
+        return Translator()
+
     def translate_text(self, text: str, target_lang: str, source_lang: str = 'en') -> str:
         """Translate text to target language.
 
@@ -60,45 +182,131 @@ class ContentTranslator:
         Returns:
             Translated text
         """
-        if not text or not text.strip():
-            return text
+        return self.translate_texts([text], target_lang, source_lang)[0]
 
-        try:
-            if self.service == 'deepl':
-                return self._translate_deepl(text, target_lang, source_lang)
-            elif self.service == 'google':
-                return self._translate_google(text, target_lang, source_lang)
-            else:
-                raise ValueError(f"Unsupported translation service: {self.service}")
-        except Exception as e:
-            print(f"Translation failed: {e}")
-            return text  # Return original text on failure
+    def translate_texts(self, texts: List[str], target_lang: str, source_lang: str = 'en') -> List[str]:
+        """Translate many texts with as few requests as possible.
 
-    def _translate_deepl(self, text: str, target_lang: str, source_lang: str = 'en') -> str:
-        """Translate using DeepL API."""
-        translator = deepl.Translator(self.api_key)
+        Duplicates are translated once, texts found in the translation memory
+        are not sent at all, and the rest are sent in chunks that fit the
+        service's payload limits.
 
+        Args:
+            texts: Texts to translate
+            target_lang: Target language code (e.g., 'es', 'fr', 'de')
+            source_lang: Source language code (default: 'en')
+
+        Returns:
+            Translated texts, in order (a text is returned unchanged if its request failed)
+        """
+        return [text if translated is None else translated
+                for text, translated in zip(texts, self._translate_texts(texts, target_lang, source_lang))]
+
+    def _translate_texts(self, texts: List[str], target_lang: str, source_lang: str) -> List[Optional[str]]:
+        """Like ``translate_texts``, with None for each text whose request failed (blank texts are kept)."""
+        results: List[Optional[str]] = list(texts)
+        positions: Dict[str, List[int]] = {}
+        for i, text in enumerate(texts):
+            if text and text.strip():
+                positions.setdefault(text, []).append(i)
+        with self._stats_lock:
+            self.stats['strings'] += sum(len(indices) for indices in positions.values())
+            self.stats['unique'] += len(positions)
+
+        translations = (self.memory.lookup(positions, source_lang, target_lang, self.service)
+                        if self.memory else {})
+        for chunk in self._chunks([text for text in positions if text not in translations]):
+            fresh = {source: translated
+                     for source, translated in zip(chunk, self._translate_chunk(chunk, target_lang, source_lang))
+                     if translated is not None}
+            if self.memory:
+                self.memory.store(fresh, source_lang, target_lang, self.service)
+            translations.update(fresh)
+
+        for source, indices in positions.items():
+            for i in indices:
+                results[i] = translations.get(source)
+        return results
+
+    def _chunks(self, texts: List[str]) -> List[List[str]]:
+        """Split texts into request-sized chunks for the current service."""
+        chunks: List[List[str]] = []
+        current: List[str] = []
+        size = 0
+        for text in texts:
+            if self.service == 'deepl':
+                length = len(text.encode('utf-8'))
+                full = len(current) >= DEEPL_MAX_TEXTS or size + length > DEEPL_MAX_BYTES
+            else:
+                # Google chunks are sent newline-joined, so multi-line texts travel alone
+                if '\n' in text:
+                    chunks.append([text])
+                    continue
+                length = len(text) + 1
+                full = size + length > GOOGLE_MAX_CHARS
+            if current and full:
+                chunks.append(current)
+                current, size = [], 0
+            current.append(text)
+            size += length
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _translate_chunk(self, texts: List[str], target_lang: str, source_lang: str) -> List[Optional[str]]:
+        """Translate one chunk in a single request (None for each text whose request failed)."""
+        with self._service_slots:
+            self.rate_limiter.acquire(self.service)
+            with self._stats_lock:
+                self.stats['requests'] += 1
+            start = time.perf_counter()
+            try:
+                if self.service == 'deepl':
+                    result = self._translate_deepl(texts, target_lang, source_lang)
+                elif self.service == 'google':
+                    result = self._translate_google(texts, target_lang, source_lang)
+                else:
+                    raise ValueError(f"Unsupported translation service: {self.service}")
+            except Exception as e:
+                print(f"Translation failed: {e}")
+                self.rate_limiter.record(self.service, status_code=self._throttle_status(e), error=True)
+                return [None] * len(texts)
+            self.rate_limiter.record(self.service, latency=time.perf_counter() - start)
+
+        if len(result) != len(texts) and len(texts) > 1:
+            # The service merged or split lines of a joined chunk: translate the texts one by one
+            with self._stats_lock:
+                self.stats['fallbacks'] += 1
+            return [self._translate_chunk([text], target_lang, source_lang)[0] for text in texts]
+        return result
+
+    def _throttle_status(self, error: Exception) -> Optional[int]:
+        """Map a translation library exception to a 429 if it signals rate limiting."""
+        message = str(error).lower()
+        if '429' in message or 'too many requests' in message or 'quota' in message:
+            return 429
+        return None
+
+    def _translate_deepl(self, texts: List[str], target_lang: str, source_lang: str = 'en') -> List[str]:
+        """Translate a list of texts in one DeepL API request."""
         # Convert language codes to DeepL format
         deepl_target = self._to_deepl_lang(target_lang)
         deepl_source = self._to_deepl_lang(source_lang)
 
-        result = translator.translate_text(
-            text,
-            target_lang=deepl_target,
-            source_lang=deepl_source if source_lang != 'auto' else None
-        )
-
-        return result.text
+        with self.clients.client() as translator:
+            results = translator.translate_text(
+                texts,
+                target_lang=deepl_target,
+                source_lang=deepl_source if source_lang != 'auto' else None
+            )
 
-    def _translate_google(self, text: str, target_lang: str, source_lang: str = 'en') -> str:
-        """Translate using Google Translate."""
-        translator = Translator()
+        return [result.text for result in results]
 
-        # Handle rate limiting
-        time.sleep(0.5)
-
-        result = translator.translate(text, src=source_lang, dest=target_lang)
-        return result.text
+    def _translate_google(self, texts: List[str], target_lang: str, source_lang: str = 'en') -> List[str]:
+        """Translate a list of single-line texts in one Google Translate request, joined by newlines."""
+        with self.clients.client() as translator:
+            result = translator.translate('\n'.join(texts), src=source_lang, dest=target_lang)
+        return result.text.split('\n') if len(texts) > 1 else [result.text]
 
     def _to_deepl_lang(self, lang_code: str) -> str:
         """Convert ISO language code to DeepL format."""
@@ -116,6 +324,38 @@ class ContentTranslator:
         }
         return mapping.get(lang_code, lang_code.upper())
 
+    def translatable_strings(self, content: Dict[str, Any]) -> List[Tuple[FieldPath, str]]:
+        """List the translatable strings of a calculator with their location.
+
+        Covers the title, metaDescription and applications, each instruction,
+        each example output and each form field label.
+        """
+        strings: List[Tuple[FieldPath, str]] = []
+
+        # Simple string fields
+        for field in ['title', 'metaDescription', 'applications']:
+            if isinstance(content.get(field), str):
+                strings.append(((field,), content[field]))
+
+        # Instructions array
+        if isinstance(content.get('instructions'), list):
+            strings.extend((('instructions', i), instr) for i, instr in enumerate(content['instructions'])
+                           if isinstance(instr, str))
+
+        # Example output text (input field values are typically numbers and don't need translation)
+        if isinstance(content.get('examples'), list):
+            strings.extend((('examples', i, 'output'), example['output'])
+                           for i, example in enumerate(content['examples'])
+                           if isinstance(example, dict) and isinstance(example.get('output'), str))
+
+        # Form field labels
+        if isinstance(content.get('formFields'), list):
+            strings.extend((('formFields', i, 'label'), field['label'])
+                           for i, field in enumerate(content['formFields'])
+                           if isinstance(field, dict) and isinstance(field.get('label'), str))
+
+        return strings
+
     def translate_calculator_content(self, content: Dict[str, Any], target_lang: str) -> Dict[str, Any]:
         """Translate calculator content dictionary.
 
@@ -126,52 +366,101 @@ class ContentTranslator:
         Returns:
             Translated content dictionary
         """
-        translated = content.copy()
-
-        # Translate simple string fields
-        string_fields = ['title', 'metaDescription', 'applications']
-        for field in string_fields:
-            if field in translated and isinstance(translated[field], str):
-                translated[field] = self.translate_text(translated[field], target_lang)
-
-        # Translate instructions array
-        if 'instructions' in translated and isinstance(translated['instructions'], list):
-            translated['instructions'] = [
-                self.translate_text(instr, target_lang)
-                for instr in translated['instructions']
-            ]
-
-        # Translate examples
-        if 'examples' in translated and isinstance(translated['examples'], list):
-            translated_examples = []
-            for example in translated['examples']:
-                translated_example = example.copy()
-
-                # Translate output text
-                if 'output' in translated_example:
-                    translated_example['output'] = self.translate_text(
-                        translated_example['output'], target_lang
-                    )
-
-                # Note: Input field values are typically numbers and don't need translation
-                translated_examples.append(translated_example)
-
-            translated['examples'] = translated_examples
-
-        # Translate form field labels
-        if 'formFields' in translated and isinstance(translated['formFields'], list):
-            translated_fields = []
-            for field in translated['formFields']:
-                translated_field = field.copy()
-                if 'label' in translated_field:
-                    translated_field['label'] = self.translate_text(
-                        translated_field['label'], target_lang
-                    )
-                translated_fields.append(translated_field)
-
-            translated['formFields'] = translated_fields
+        return self.translate_contents([content], target_lang)[0]
 
-        return translated
+    def translate_contents(self, contents: List[Dict[str, Any]], target_lang: str) -> List[Dict[str, Any]]:
+        """Translate several calculators, batching their strings into shared requests.
+
+        Args:
+            contents: Calculator content dictionaries
+            target_lang: Target language code
+
+        Returns:
+            Translated copies of the content dictionaries, in order
+        """
+        return self._translate_contents(contents, target_lang)[0]
+
+    def _translate_contents(self, contents: List[Dict[str, Any]], target_lang: str,
+                            kept: Optional[List[Dict[FieldPath, str]]] = None
+                            ) -> Tuple[List[Dict[str, Any]], List[List[Tuple[FieldPath, str]]], List[int]]:
+        """Translate several calculators, keeping the given translations of unchanged fields.
+
+        Args:
+            contents: Calculator content dictionaries
+            target_lang: Target language code
+            kept: Per content, field path → existing translation that is not sent again
+
+        Returns:
+            Translated copies, the (field path, English text) of every field that holds a
+            translation, and the number of fields whose translation failed, per content
+        """
+        kept = kept or [{} for _ in contents]
+        located = [(index, path, text) for index, content in enumerate(contents)
+                   for path, text in self.translatable_strings(content) if path not in kept[index]]
+        translated_texts = self._translate_texts([text for _, _, text in located], target_lang, 'en')
+
+        translated = [copy.deepcopy(content) for content in contents]
+        done: List[List[Tuple[FieldPath, str]]] = [[] for _ in contents]
+        failed = [0] * len(contents)
+        for index, values in enumerate(kept):
+            for path, text in values.items():
+                self._set_field(translated[index], path, text)
+                done[index].append((path, self._get_field(contents[index], path)))
+        for (index, path, source), text in zip(located, translated_texts):
+            if text is None:
+                failed[index] += 1
+                text = source
+            else:
+                done[index].append((path, source))
+            self._set_field(translated[index], path, text)
+        return translated, done, failed
+
+    @staticmethod
+    def _get_field(content: Any, path: FieldPath) -> Any:
+        """Value at a field path (KeyError, IndexError or TypeError if it doesn't exist)."""
+        for key in path:
+            content = content[key]
+        return content
+
+    @staticmethod
+    def _set_field(content: Dict[str, Any], path: FieldPath, value: Any):
+        """Set the value at an existing field path."""
+        for key in path[:-1]:
+            content = content[key]
+        content[path[-1]] = value
+
+    def _reusable_translations(self, content: Dict[str, Any], output_file: str,
+                               manifest: TranslationManifest) -> Dict[FieldPath, str]:
+        """Translations in an existing output whose English text hasn't changed since.
+
+        Args:
+            content: Current English content
+            output_file: Existing translated file
+            manifest: Manifest with the field hashes the output was translated from
+
+        Returns:
+            Field path → translation to keep
+        """
+        hashes = manifest.field_hashes(output_file)
+        if not hashes:
+            return {}
+        try:
+            with open(output_file, 'r', encoding='utf-8') as f:
+                existing = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        kept = {}
+        for path, text in self.translatable_strings(content):
+            if hashes.get(field_key(path)) != field_hash(text):
+                continue
+            try:
+                value = self._get_field(existing, path)
+            except (KeyError, IndexError, TypeError):
+                continue
+            if isinstance(value, str):
+                kept[path] = value
+        return kept
 
     def translate_file(self, input_file: str, output_file: str, target_lang: str):
         """Translate a single JSON file.
@@ -181,33 +470,87 @@ class ContentTranslator:
             output_file: Path to output JSON file
             target_lang: Target language code
         """
-        try:
-            # Load input file
-            with open(input_file, 'r', encoding='utf-8') as f:
-                content = json.load(f)
-
-            # Translate content
-            translated_content = self.translate_calculator_content(content, target_lang)
+        self.translate_files([(input_file, output_file)], target_lang)
 
-            # Create output directory if needed
-            os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    def translate_files(self, files: List[Tuple[str, str]], target_lang: str,
+                        manifest: Optional[TranslationManifest] = None, incremental: bool = True) -> int:
+        """Translate several JSON files to one language with batched requests.
 
-            # Save translated content
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(translated_content, f, indent=2, ensure_ascii=False)
+        Args:
+            files: (input file, output file) pairs
+            target_lang: Target language code
+            manifest: Source-hash manifest of the outputs, updated for every file written
+            incremental: Skip up-to-date files and keep the translations of unchanged
+                fields recorded in the manifest
 
-            print(f"✅ Translated: {input_file} → {output_file}")
+        Returns:
+            Number of files translated (or already up to date)
+        """
+        contents = []
+        loaded = []
+        digests = []
+        kept = []
+        translated = 0
+        for input_file, output_file in files:
+            try:
+                # Load input file
+                with open(input_file, 'r', encoding='utf-8') as f:
+                    content = json.load(f)
+                digest = source_hash(content)
+                if manifest and incremental:
+                    if manifest.is_unchanged(output_file, digest):
+                        with self._stats_lock:
+                            self.stats['up_to_date'] += 1
+                        translated += 1
+                        continue
+                    kept.append(self._reusable_translations(content, output_file, manifest))
+                else:
+                    kept.append({})
+                contents.append(content)
+                loaded.append((input_file, output_file))
+                digests.append(digest)
+            except Exception as e:
+                print(f"❌ Translation failed for {input_file}: {e}")
+        if not contents:
+            return translated
+        with self._stats_lock:
+            self.stats['reused'] += sum(len(values) for values in kept)
 
+        try:
+            # Translate the strings of all files together
+            translated_contents, fields, failed = self._translate_contents(contents, target_lang, kept)
         except Exception as e:
-            print(f"❌ Translation failed for {input_file}: {e}")
+            for input_file, _ in loaded:
+                print(f"❌ Translation failed for {input_file}: {e}")
+            return translated
+
+        for i, ((input_file, output_file), translated_content) in enumerate(zip(loaded, translated_contents)):
+            try:
+                # Save translated content (skipped if the file already has it)
+                if self.writer.write(output_file, translated_content):
+                    print(f"✅ Translated: {input_file} → {output_file}")
+                else:
+                    print(f"✅ Unchanged: {output_file}")
+                if manifest:
+                    # Files with failed fields keep no source hash, so the next run retries them
+                    manifest.update(output_file, None if failed[i] else digests[i], fields[i])
+                translated += 1
+            except Exception as e:
+                print(f"❌ Translation failed for {input_file}: {e}")
+        return translated
 
-    def translate_directory(self, input_dir: str, output_base_dir: str, target_languages: List[str]):
+    def translate_directory(self, input_dir: str, output_base_dir: str, target_languages: List[str],
+                            workers: int = 1, incremental: bool = True):
         """Translate all JSON files in a directory to multiple languages.
 
         Args:
             input_dir: Directory containing English JSON files
             output_base_dir: Base output directory
             target_languages: List of target language codes
+            workers: Work items (a batch of files for one language) translated in parallel;
+                requests to the service are still capped at ``self.concurrency``
+            incremental: Only translate files and fields whose English source changed since
+                the last run, according to ``<output_base_dir>/.translation_manifest``
         """
         if not os.path.exists(input_dir):
             print(f"❌ Input directory not found: {input_dir}")
@@ -223,24 +566,281 @@ class ContentTranslator:
         print(f"📁 Found {len(json_files)} JSON files to translate")
         print(f"🌍 Target languages: {', '.join(target_languages)}")
 
-        total_translations = 0
+        manifest = TranslationManifest(output_base_dir)
+        tasks = []
+        for lang in target_languages:
+            for i in range(0, len(json_files), FILES_PER_BATCH):
+                # Create output paths: /content/{lang}/calculators/filename.json
+                batch = [(input_file, os.path.join(output_base_dir, lang, 'calculators', os.path.basename(input_file)))
+                         for input_file in json_files[i:i + FILES_PER_BATCH]]
+                tasks.append((functools.partial(self.translate_files, batch, lang, manifest, incremental),
+                              len(batch), lang))
+
+        start = time.perf_counter()
+        if workers > 1:
+            print(f"⚡ Parallel mode: {workers} workers, {self.concurrency} {self.service} requests in flight")
+        total_translations = self._run_work_items(tasks, workers)
+        manifest.save()
+
+        print(f"✅ Translation complete! Created {total_translations} translated files "
+              f"in {time.perf_counter() - start:.1f}s")
+        self.print_summary()
+        self.writer.print_summary()
+        self.rate_limiter.print_summary()
+
+    def _run_work_items(self, tasks: List[Tuple[Callable[[], int], int, str]], workers: int) -> int:
+        """Run translation work items on a worker pool, reporting progress.
+
+        Args:
+            tasks: (function translating a batch of files, number of files, label for errors) per item
+            workers: Number of worker threads
+
+        Returns:
+            Number of files translated
+        """
+        total_files = sum(files for _, files, _ in tasks)
+        done_files = 0
+        translated = 0
+        start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='translate') as executor:
+            futures = {executor.submit(task): (files, label) for task, files, label in tasks}
+            for done, future in enumerate(as_completed(futures), 1):
+                files, label = futures[future]
+                try:
+                    translated += future.result()
+                except Exception as e:
+                    print(f"❌ Translation ({label}) failed: {e}")
+                done_files += files
+
+                elapsed = time.perf_counter() - start
+                rate = done_files / elapsed if elapsed else 0.0
+                eta = (total_files - done_files) / rate if rate else 0.0
+                print(f"⏳ {done}/{len(tasks)} batches, {done_files}/{total_files} files "
+                      f"({rate:.1f} files/s, ETA {eta:.0f}s)")
+        return translated
+
+    def merged_translatable_strings(self, section: Dict[str, Any]) -> List[Tuple[FieldPath, str]]:
+        """Locate the strings of a merged-format language section that need translating.
 
-        for input_file in json_files:
-            # Calculate relative path for output
-            rel_path = os.path.relpath(input_file, input_dir)
-            filename = os.path.basename(input_file)
+        Every string with text is translated, including ``seoContent``, except
+        identifiers, codes, units, formulas and input values (``MERGED_SKIP_KEYS``),
+        example input values and numeric or format-only values
+        (``FORMAT_ONLY_PATTERN``). Of ``calculatorComponent`` (and the other
+        component specs, ``MERGED_COMPONENT_KEYS``), whose option values,
+        conditions and output fields are read by the component code, only the
+        display text (``MERGED_COMPONENT_TEXT_KEYS``) is translated.
 
+        Args:
+            section: Language section of a merged calculator file (usually ``en``)
+
+        Returns:
+            (field path, text) pairs
+        """
+        strings: List[Tuple[FieldPath, str]] = []
+
+        def walk(value: Any, path: FieldPath):
+            if isinstance(value, str):
+                # Option lists, conditions and output fields of the component must stay as they are
+                if path[0] in MERGED_COMPONENT_KEYS and path[-1] not in MERGED_COMPONENT_TEXT_KEYS:
+                    return
+                if not FORMAT_ONLY_PATTERN.match(value.strip()):
+                    strings.append((path, value))
+            elif isinstance(value, dict):
+                for key, item in value.items():
+                    if key in MERGED_SKIP_KEYS or (key in EXAMPLE_INPUT_KEYS and 'examples' in path):
+                        continue
+                    walk(item, path + (key,))
+            elif isinstance(value, list):
+                for i, item in enumerate(value):
+                    walk(item, path + (i,))
+
+        walk(section, ())
+        return strings
+
+    def _plan_merged_section(self, source: Dict[str, Any], current: Any, hashes: Dict[str, str],
+                             incremental: bool) -> Tuple[Dict[str, Any], List[Tuple[FieldPath, str]],
+                                                         List[Tuple[FieldPath, str]]]:
+        """Merge a language section with its English source and find what needs translating.
+
+        Only what the section lacks (keys, list items) is copied from English
+        and translated; every existing translated string is kept, as are values
+        whose shape differs from English (those fields are left out). Existing
+        fields are retranslated when their English text changed since the
+        recorded translation; sections translated before the manifest existed
+        are only retranslated where they still hold English prose.
+
+        Args:
+            source: English section
+            current: Existing language section (None if missing)
+            hashes: Field hashes recorded for the section in the manifest
+            incremental: Keep existing translations of unchanged fields
+
+        Returns:
+            The merged section, the (field path, English text) of fields whose translation
+            is kept, and of fields to translate
+        """
+        filled: List[FieldPath] = []
+        section = _fill_missing(source, copy.deepcopy(current) if isinstance(current, dict) else {}, (), filled)
+        copied = set(filled)
+
+        kept: List[Tuple[FieldPath, str]] = []
+        pending: List[Tuple[FieldPath, str]] = []
+        for path, text in self.merged_translatable_strings(source):
+            try:
+                parent = self._get_field(section, path[:-1])
+                existing = parent[path[-1]] if isinstance(parent, (dict, list)) else None
+            except (KeyError, IndexError, TypeError):
+                parent = existing = None
+            # The section keeps a different shape here (see _fill_missing)
+            if not isinstance(parent, (dict, list)) or isinstance(existing, (dict, list)):
+                continue
+            recorded = hashes.get(field_key(path))
+            from_english = any(path[:length] in copied for length in range(len(path) + 1))
+            if from_english or not incremental or not isinstance(existing, str):
+                stale = True
+            elif recorded is not None:
+                stale = recorded != field_hash(text)
+            else:
+                # Still the English text: never translated, unless it is an acronym or code
+                stale = existing.strip() == text.strip() and bool(PROSE_PATTERN.search(text))
+            (pending if stale else kept).append((path, text))
+        return section, kept, pending
+
+    def translate_merged_files(self, paths: List[str], target_languages: List[str],
+                               manifest: Optional[TranslationManifest] = None, incremental: bool = True) -> int:
+        """Fill in missing or stale language sections of merged calculator files in place.
+
+        Each file is read and written once, whatever the number of languages. The
+        strings of all files are translated together, one batched call per language.
+
+        Args:
+            paths: Merged calculator JSON files
+            target_languages: Language sections to fill
+            manifest: Source-hash manifest of the files, updated for every file written
+            incremental: Skip up-to-date sections and keep translations of unchanged fields
+
+        Returns:
+            Number of calculator files processed
+        """
+        loaded = []
+        for path in paths:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    raw = f.read()
+                data = json.loads(raw)
+            except Exception as e:
+                print(f"❌ Translation failed for {path}: {e}")
+                continue
+            # Reports and other non-calculator files have no English section
+            if isinstance(data, dict) and isinstance(data.get(MERGED_SOURCE_LANG), dict):
+                loaded.append((path, data, raw.endswith('\n')))
+
+        # (file index, language, merged section, kept fields, fields to translate, source hash)
+        plans = []
+        for index, (path, data, _) in enumerate(loaded):
+            source = data[MERGED_SOURCE_LANG]
+            digest = source_hash(source)
             for lang in target_languages:
-                # Create output path: /content/{lang}/calculators/filename.json
-                output_file = os.path.join(output_base_dir, lang, 'calculators', filename)
+                if manifest and incremental and lang in data and manifest.is_unchanged(path, digest, lang):
+                    with self._stats_lock:
+                        self.stats['up_to_date'] += 1
+                    continue
+                hashes = manifest.field_hashes(path, lang) if manifest else {}
+                section, kept, pending = self._plan_merged_section(source, data.get(lang), hashes, incremental)
+                plans.append((index, lang, section, kept, pending, digest))
+        with self._stats_lock:
+            self.stats['reused'] += sum(len(plan[3]) for plan in plans)
+
+        # Translated fields and failures per plan
+        done: List[List[Tuple[FieldPath, str]]] = [list(plan[3]) for plan in plans]
+        failed = [0] * len(plans)
+        for lang in target_languages:
+            selected = [i for i, plan in enumerate(plans) if plan[1] == lang]
+            texts = [text for i in selected for _, text in plans[i][4]]
+            results = iter(self._translate_texts(texts, lang, MERGED_SOURCE_LANG))
+            for i in selected:
+                section, pending = plans[i][2], plans[i][4]
+                for path, text in pending:
+                    translated = next(results)
+                    if translated is None:
+                        failed[i] += 1
+                    else:
+                        self._set_field(section, path, translated)
+                        done[i].append((path, text))
+
+        for i, (index, lang, section, _, _, _) in enumerate(plans):
+            loaded[index][1][lang] = section
+
+        updated = {plan[0] for plan in plans}
+        for index, (path, data, trailing_newline) in enumerate(loaded):
+            if index not in updated:
+                continue
+            try:
+                if self.writer.write(path, data, trailing_newline=trailing_newline):
+                    print(f"✅ Translated: {path}")
+                else:
+                    print(f"✅ Unchanged: {path}")
+            except Exception as e:
+                print(f"❌ Translation failed for {path}: {e}")
+                continue
+            if manifest:
+                for i, (plan_index, lang, _, _, _, digest) in enumerate(plans):
+                    if plan_index == index:
+                        manifest.update(path, None if failed[i] else digest, done[i], section=lang)
+        return len(loaded)
+
+    def translate_merged_directory(self, content_dir: str = DEFAULT_CONTENT_DIR,
+                                   target_languages: Optional[List[str]] = None,
+                                   workers: int = 1, incremental: bool = True):
+        """Translate the merged calculator files of a directory in place.
 
-                self.translate_file(input_file, output_file, lang)
-                total_translations += 1
+        Args:
+            content_dir: Directory of merged calculator JSON files (``content/calculators``)
+            target_languages: Language sections to fill (default: ``MERGED_LANGUAGES``)
+            workers: Batches of files translated in parallel; requests to the service are
+                still capped at ``self.concurrency``
+            incremental: Only translate fields whose English text changed since the last
+                run, according to ``<content_dir>/.translation_manifest``
+        """
+        if not os.path.isdir(content_dir):
+            print(f"❌ Content directory not found: {content_dir}")
+            return
+        target_languages = target_languages or MERGED_LANGUAGES
 
-                # Rate limiting to avoid API limits
-                time.sleep(0.1)
+        json_files = sorted(glob.glob(os.path.join(content_dir, '*.json')))
+        print(f"📁 Found {len(json_files)} merged calculator files")
+        print(f"🌍 Target languages: {', '.join(target_languages)}")
 
-        print(f"✅ Translation complete! Created {total_translations} translated files")
+        manifest = TranslationManifest(content_dir)
+        tasks = [(functools.partial(self.translate_merged_files, json_files[i:i + FILES_PER_BATCH],
+                                    target_languages, manifest, incremental),
+                  len(json_files[i:i + FILES_PER_BATCH]),
+                  f"files {i + 1}-{min(i + FILES_PER_BATCH, len(json_files))}")
+                 for i in range(0, len(json_files), FILES_PER_BATCH)]
+
+        start = time.perf_counter()
+        if workers > 1:
+            print(f"⚡ Parallel mode: {workers} workers, {self.concurrency} {self.service} requests in flight")
+        total = self._run_work_items(tasks, workers)
+        manifest.save()
+
+        print(f"✅ Translation complete! Processed {total} calculator files "
+              f"in {time.perf_counter() - start:.1f}s")
+        self.print_summary()
+        self.writer.print_summary()
+        self.rate_limiter.print_summary()
+
+    def print_summary(self):
+        """Print how many requests the translated strings took."""
+        print(f"🌐 Translation: {self.stats['strings']} strings ({self.stats['unique']} distinct) "
+              f"in {self.stats['requests']} requests, {self.stats['fallbacks']} chunks retried item by item")
+        if self.stats['up_to_date'] or self.stats['reused']:
+            print(f"♻️  Incremental: {self.stats['up_to_date']} translations up to date, "
+                  f"{self.stats['reused']} unchanged strings kept from earlier translations")
+        self.clients.print_summary(self.service)
+        if self.memory:
+            self.memory.print_summary()
 
     def get_supported_languages(self) -> List[str]:
         """Get list of supported languages."""
@@ -250,24 +850,53 @@ class ContentTranslator:
 def main():
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(description="Translate calculator content JSON files")
-    parser.add_argument('--input', required=True, help='Input directory with English JSON files')
-    parser.add_argument('--output', required=True, help='Base output directory for translations')
-    parser.add_argument('--languages', required=True, help='Comma-separated target languages (e.g., es,fr,de)')
+    parser.add_argument('--input', help='Input directory with English JSON files')
+    parser.add_argument('--output', help='Base output directory for translations')
+    parser.add_argument('--merged', nargs='?', const=DEFAULT_CONTENT_DIR, metavar='DIR',
+                        help='Translate merged multi-language calculator files in place instead '
+                             '(default directory: content/calculators)')
+    parser.add_argument('--languages',
+                        help=f"Comma-separated target languages (e.g., es,fr,de; "
+                             f"--merged defaults to {','.join(MERGED_LANGUAGES)})")
     parser.add_argument('--service', choices=['google', 'deepl'], default='google', help='Translation service')
     parser.add_argument('--deepl-key', help='DeepL API key (required for DeepL service)')
+    parser.add_argument('--deepl-server-url',
+                        help='Alternative DeepL API URL (e.g. translation_stub_server.py for benchmarks)')
+    parser.add_argument('--pool-size', type=int, default=DEFAULT_POOL_SIZE,
+                        help='Translation clients kept open for reuse')
+    parser.add_argument('--memory', default=DEFAULT_TRANSLATION_MEMORY_PATH, help='Path of the translation memory')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='Send every string to the translation service, bypassing the translation memory')
+    parser.add_argument('--full', action='store_true',
+                        help='Retranslate every file, ignoring the source hashes of the last run')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Batches of files (one language each) translated in parallel')
+    parser.add_argument('--service-concurrency', type=int,
+                        help='Requests in flight to the translation service (default: 4 for DeepL, 2 for Google)')
 
     args = parser.parse_args()
+    if not args.merged and not (args.input and args.output and args.languages):
+        parser.error('--input, --output and --languages are required unless --merged is given')
 
-    target_languages = [lang.strip() for lang in args.languages.split(',')]
+    target_languages = [lang.strip() for lang in args.languages.split(',')] if args.languages else None
 
     # Initialize translator
     translator = ContentTranslator(
         translation_service=args.service,
-        api_key=args.deepl_key if args.service == 'deepl' else None
+        api_key=args.deepl_key if args.service == 'deepl' else None,
+        pool_size=args.pool_size,
+        server_url=args.deepl_server_url,
+        memory_path=None if args.no_memory else args.memory,
+        concurrency=args.service_concurrency
     )
 
     # Run translation pipeline
-    translator.translate_directory(args.input, args.output, target_languages)
+    if args.merged:
+        translator.translate_merged_directory(args.merged, target_languages, workers=args.workers,
+                                              incremental=not args.full)
+    else:
+        translator.translate_directory(args.input, args.output, target_languages, workers=args.workers,
+                                       incremental=not args.full)
 
 
 if __name__ == '__main__':
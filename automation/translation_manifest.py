@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Translation Manifest - Incremental Translations
+
+Remembers, for every translated output file, a hash of the English source it
+was translated from and a hash of each translatable field. Reruns skip files
+whose source is unchanged, and for changed files only the new or edited fields
+are sent to the translation service; every other field keeps the translation
+already in the output file.
+
+For the merged ``content/calculators/*.json`` format, where one file holds
+every language, entries are kept per file and language section.
+
+The manifest is stored next to the translated outputs, in
+``<output dir>/.translation_manifest``. It is JSON, but deliberately has no
+``.json`` extension so the site's content scans never pick it up.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+TRANSLATION_MANIFEST_NAME = '.translation_manifest'
+
+# Location of a string inside a calculator dict, e.g. ('examples', 0, 'output')
+FieldPath = Tuple[Union[str, int], ...]
+
+
+def source_hash(content: Any) -> str:
+    """Hash a whole English source file."""
+    payload = json.dumps(content, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def field_hash(text: str) -> str:
+    """Hash one translatable English string."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+
+def field_key(path: FieldPath) -> str:
+    """Manifest key of a field path, e.g. ``examples/0/output``."""
+    return '/'.join(str(key) for key in path)
+
+
+class TranslationManifest:
+    """Per-output record of the source and field hashes it was translated from."""
+
+    def __init__(self, output_dir: str, flush_every: int = 50):
+        """Load the manifest of an output directory if it exists.
+
+        Args:
+            output_dir: Base directory of the translated outputs
+            flush_every: Write the manifest to disk after this many updates
+        """
+        self.output_dir = os.path.abspath(output_dir)
+        self.path = os.path.join(self.output_dir, TRANSLATION_MANIFEST_NAME)
+        self.flush_every = flush_every
+        self._lock = threading.Lock()
+        self._dirty = 0
+        self.entries: Dict[str, Dict[str, Any]] = {}
+
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+
+    def _key(self, output_file: str, section: Optional[str] = None) -> str:
+        """Entries are keyed by the output path relative to the output directory (and the section)."""
+        key = os.path.relpath(os.path.abspath(output_file), self.output_dir)
+        return f"{key}#{section}" if section else key
+
+    def is_unchanged(self, output_file: str, digest: str, section: Optional[str] = None) -> bool:
+        """Check whether an output is up to date with its source.
+
+        An output is unchanged when its source hash matches the last complete
+        translation and the output file still exists.
+        """
+        entry = self.entries.get(self._key(output_file, section))
+        return bool(entry) and entry.get('source_hash') == digest and os.path.exists(output_file)
+
+    def field_hashes(self, output_file: str, section: Optional[str] = None) -> Dict[str, str]:
+        """Field key → hash of the English text the output's translation was made from."""
+        if not os.path.exists(output_file):
+            return {}
+        return self.entries.get(self._key(output_file, section), {}).get('fields', {})
+
+    def update(self, output_file: str, digest: Optional[str], fields: Iterable[Tuple[FieldPath, str]],
+               section: Optional[str] = None):
+        """Record a translated output.
+
+        Args:
+            output_file: Path of the translated file
+            digest: Hash of the source, or None if some fields failed to translate
+                (the output is then revisited on the next run)
+            fields: (field path, English text) of every field holding a translation
+            section: Language section of a merged file
+        """
+        with self._lock:
+            self.entries[self._key(output_file, section)] = {
+                'source_hash': digest,
+                'fields': {field_key(path): field_hash(text) for path, text in fields},
+            }
+            self._dirty += 1
+            if self._dirty >= self.flush_every:
+                self._write()
+
+    def save(self):
+        """Write the manifest to disk."""
+        with self._lock:
+            self._write()
+
+    def _write(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2, ensure_ascii=False, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self._dirty = 0
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Translation Memory - Translating Each String Once
+
+Stores every translation in a SQLite database, keyed by the normalized source
+text, source and target language and translation service. Boilerplate such as
+the "Click the 'Calculate' button" instruction or labels like "Interest Rate
+(%)" is sent to the translation service once and served from disk for every
+later calculator, language run and rerun.
+
+The memory is seeded with the hand-written label dictionaries of
+``translate-calculator-labels.py`` and ``translate-all-labels.py`` in the
+project root. Those entries are stored under the service ``manual`` and take
+precedence over machine translations.
+
+Usage:
+    memory = TranslationMemory()
+    found = memory.lookup(['Interest Rate (%)'], 'en', 'es', 'deepl')
+    memory.store({'Loan Amount': 'Monto del préstamo'}, 'en', 'es', 'deepl')
+    memory.print_summary()
+"""
+
+import importlib.util
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_TRANSLATION_MEMORY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                               '.translation_memory.db')
+
+# Service name of the entries seeded from the hand-written dictionaries
+MANUAL_SERVICE = 'manual'
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Script and dictionary name of each hand-written label table; later scripts win on conflicts
+SEED_SOURCES = [
+    (os.path.join(_PROJECT_ROOT, 'translate-calculator-labels.py'), 'TRANSLATIONS'),
+    (os.path.join(_PROJECT_ROOT, 'translate-all-labels.py'), 'LABEL_TRANSLATIONS'),
+]
+
+# Stay below SQLite's limit on parameters per statement
+_LOOKUP_BATCH = 500
+
+
+def normalize(text: str) -> str:
+    """Strip a text and collapse runs of spaces and tabs, keeping line breaks."""
+    return re.sub(r'[ \t]+', ' ', text.strip())
+
+
+def load_manual_translations(sources: Optional[List[Tuple[str, str]]] = None) -> Dict[str, Dict[str, str]]:
+    """Load the hand-written label dictionaries from the root translation scripts.
+
+    Args:
+        sources: (script path, dictionary name) pairs; defaults to ``SEED_SOURCES``
+
+    Returns:
+        Target language → English label → translation (missing scripts are skipped)
+    """
+    translations: Dict[str, Dict[str, str]] = {}
+    for path, name in SEED_SOURCES if sources is None else sources:
+        if not os.path.exists(path):
+            continue
+        # The script names contain hyphens, so they are loaded by path
+        spec = importlib.util.spec_from_file_location(f"_seed_{name.lower()}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        for lang, labels in getattr(module, name, {}).items():
+            translations.setdefault(lang, {}).update(labels)
+    return translations
+
+
+class TranslationMemory:
+    """SQLite store of translations shared by every translation run."""
+
+    def __init__(self, path: str = DEFAULT_TRANSLATION_MEMORY_PATH, seed: bool = True):
+        """Open (or create) the memory.
+
+        Args:
+            path: Path of the SQLite database
+            seed: Refresh the entries of the hand-written label dictionaries
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS translations (
+                source TEXT NOT NULL,
+                source_lang TEXT NOT NULL,
+                target_lang TEXT NOT NULL,
+                service TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (source, source_lang, target_lang, service)
+            )
+        """)
+        self._db.commit()
+
+        self.stats = {'hits': 0, 'misses': 0, 'stored': 0, 'seeded': 0}
+        if seed:
+            self.seed(load_manual_translations())
+
+    def seed(self, translations: Dict[str, Dict[str, str]], source_lang: str = 'en'):
+        """Replace the manual entries with hand-written translations.
+
+        Args:
+            translations: Target language → source text → translation
+            source_lang: Language of the source texts
+        """
+        now = time.time()
+        rows = [(normalize(source), source_lang, lang, MANUAL_SERVICE, translation, now)
+                for lang, labels in translations.items()
+                for source, translation in labels.items()
+                if source and source.strip() and translation]
+        with self._lock:
+            self._db.execute("DELETE FROM translations WHERE service = ?", (MANUAL_SERVICE,))
+            self._db.executemany("INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self._db.commit()
+        self.stats['seeded'] = len(rows)
+
+    def lookup(self, texts: Iterable[str], source_lang: str, target_lang: str, service: str) -> Dict[str, str]:
+        """Find stored translations, preferring hand-written ones.
+
+        Args:
+            texts: Distinct source texts
+            source_lang: Source language code
+            target_lang: Target language code
+            service: Translation service the texts would be sent to
+
+        Returns:
+            Source text → translation for the texts found; each translation keeps the
+            leading and trailing whitespace of its source text
+        """
+        by_key: Dict[str, List[str]] = {}
+        for text in texts:
+            by_key.setdefault(normalize(text), []).append(text)
+        keys = list(by_key)
+
+        found: Dict[str, str] = {}
+        with self._lock:
+            for i in range(0, len(keys), _LOOKUP_BATCH):
+                batch = keys[i:i + _LOOKUP_BATCH]
+                rows = self._db.execute(
+                    f"SELECT source, service, translation FROM translations "
+                    f"WHERE source_lang = ? AND target_lang = ? AND service IN (?, ?) "
+                    f"AND source IN ({', '.join('?' * len(batch))})",
+                    [source_lang, target_lang, service, MANUAL_SERVICE, *batch]
+                ).fetchall()
+                for key, row_service, translation in rows:
+                    if row_service == MANUAL_SERVICE or key not in found:
+                        found[key] = translation
+
+        results: Dict[str, str] = {}
+        for key, translation in found.items():
+            for text in by_key[key]:
+                stripped = text.strip()
+                start = text.find(stripped)
+                results[text] = text[:start] + translation + text[start + len(stripped):]
+        with self._lock:
+            self.stats['hits'] += len(results)
+            self.stats['misses'] += sum(len(originals) for originals in by_key.values()) - len(results)
+        return results
+
+    def store(self, translations: Dict[str, str], source_lang: str, target_lang: str, service: str):
+        """Remember translations returned by a service.
+
+        Args:
+            translations: Source text → translation
+            source_lang: Source language code
+            target_lang: Target language code
+            service: Service that produced the translations
+        """
+        now = time.time()
+        rows = [(normalize(source), source_lang, target_lang, service, translation.strip(), now)
+                for source, translation in translations.items()
+                if source.strip() and translation and translation.strip()]
+        with self._lock:
+            self._db.executemany("INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self._db.commit()
+            self.stats['stored'] += len(rows)
+
+    def __len__(self) -> int:
+        """Number of stored translations, including the manual ones."""
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+
+    def hit_rate(self) -> float:
+        """Share of lookups served from the memory in this run, in percent."""
+        total = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / total * 100 if total else 0.0
+
+    def print_summary(self):
+        """Print hit/miss statistics for this run."""
+        print(f"📚 Translation memory: {self.stats['hits']} hits, {self.stats['misses']} misses "
+              f"({self.hit_rate():.1f}% hit rate), {self.stats['stored']} new translations stored, "
+              f"{len(self)} entries ({self.stats['seeded']} hand-written)")
+
+    def close(self):
+        """Close the memory database."""
+        with self._lock:
+            self._db.close()
+
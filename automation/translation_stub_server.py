@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Translation Stub Server - Offline Stand-in for the DeepL API
+
+Answers ``POST /v2/translate`` like the DeepL API does, after a configurable
+delay, translating each text to ``[LANG] text``. Connections are kept alive,
+and each new connection can be delayed to mimic a TLS handshake, so the cost
+of building a new client per call (versus reusing pooled clients) shows up in
+benchmarks.
+
+Usage:
+    python translation_stub_server.py --port 8095 --latency 0.05 --handshake 0.1
+    python translate_content.py --input ../content/en/calculators/ --output /tmp/translated --languages es \\
+        --service deepl --deepl-key test --deepl-server-url http://127.0.0.1:8095
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+from urllib.parse import parse_qs
+
+
+class TranslationStubServer(ThreadingHTTPServer):
+    """Threaded HTTP server carrying the stub's latency settings and counters."""
+
+    daemon_threads = True
+
+    def __init__(self, address, latency: float = 0.05, handshake: float = 0.0):
+        super().__init__(address, TranslationStubHandler)
+        self.latency = latency
+        self.handshake = handshake
+        self.requests = 0
+        self.connections = 0
+        self.texts = 0
+        self._lock = threading.Lock()
+
+
+class TranslationStubHandler(BaseHTTPRequestHandler):
+    """DeepL ``/v2/translate`` endpoint returning tagged texts."""
+
+    # Keep-alive, so pooled clients can reuse their connection
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; don't let Nagle hold back the body on reused connections
+    disable_nagle_algorithm = True
+    server: TranslationStubServer
+
+    def setup(self):
+        super().setup()
+        with self.server._lock:
+            self.server.connections += 1
+        time.sleep(self.server.handshake)
+
+    def do_POST(self):
+        if self.path.split('?')[0].rstrip('/') != '/v2/translate':
+            self._send(404, {'message': 'Not found'})
+            return
+
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if 'json' in self.headers.get('Content-Type', ''):
+            params = json.loads(body or b'{}')
+            texts: List[str] = params.get('text', [])
+            target = params.get('target_lang', '')
+        else:
+            params = parse_qs(body.decode('utf-8'))
+            texts = params.get('text', [])
+            target = params.get('target_lang', [''])[0]
+
+        with self.server._lock:
+            self.server.requests += 1
+            self.server.texts += len(texts)
+        time.sleep(self.server.latency)
+
+        self._send(200, {'translations': [{'detected_source_language': 'EN', 'text': f"[{target}] {text}"}
+                                          for text in texts]})
+
+    def _send(self, status: int, payload: Dict[str, Any]):
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        """Keep benchmark output quiet."""
+
+
+def start_stub_server(port: int = 0, latency: float = 0.05, handshake: float = 0.0) -> TranslationStubServer:
+    """Start the stub server on a background thread.
+
+    Args:
+        port: Port to listen on (0 picks a free port)
+        latency: Seconds each request is delayed
+        handshake: Seconds each new connection is delayed
+
+    Returns:
+        The running server; its URL is ``http://127.0.0.1:<server_port>``
+    """
+    server = TranslationStubServer(('127.0.0.1', port), latency, handshake)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for the DeepL translation API")
+    parser.add_argument('--port', type=int, default=8095, help='Port to listen on')
+    parser.add_argument('--latency', type=float, default=0.05, help='Seconds each request is delayed')
+    parser.add_argument('--handshake', type=float, default=0.0,
+                        help='Seconds each new connection is delayed (mimics a TLS handshake)')
+
+    args = parser.parse_args()
+
+    server = TranslationStubServer(('127.0.0.1', args.port), args.latency, args.handshake)
+    print(f"🌐 Stub DeepL API on http://127.0.0.1:{args.port} "
+          f"({args.latency}s latency, {args.handshake}s per new connection)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
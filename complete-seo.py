@@ -2,9 +2,14 @@
 import json
 import glob
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'automation'))
+from json_writer import JSONWriter  # noqa: E402
 
 os.chdir('./content/calculators')
 
+writer = JSONWriter()
 enhanced = 0
 for f in sorted(glob.glob('*.json')):
     with open(f) as file:
@@ -68,10 +73,9 @@ for f in sorted(glob.glob('*.json')):
                 c[lang]['seoContent']['steps'] = c['en']['seoContent']['steps']
                 c[lang]['seoContent']['faqs'] = c['en']['seoContent']['faqs']
         
-        with open(f, 'w') as file:
-            json.dump(c, file, indent=2, ensure_ascii=False)
-            file.write('\n')
-        print(f'✓ {f}')
-        enhanced += 1
+        if writer.write(f, c, trailing_newline=True):
+            print(f'✓ {f}')
+            enhanced += 1
 
 print(f'\n✅ Enhanced {enhanced} calculators with complete seoContent!')
+writer.print_summary()
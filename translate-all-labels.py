@@ -6,9 +6,13 @@ Translates inputs, outputs, and additional outputs for ES, PT, and FR sections.
 
 import json
 import os
+import sys
 import glob
 from pathlib import Path
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'automation'))
+from json_writer import JSONWriter  # noqa: E402
+
 # Comprehensive translation dictionaries
 LABEL_TRANSLATIONS = {
     'es': {
@@ -325,7 +329,7 @@ def translate_calculator_component(component, lang):
     
     return modified
 
-def process_calculator_file(filepath):
+def process_calculator_file(filepath, writer):
     """Process a single calculator JSON file."""
     filename = os.path.basename(filepath)
     
@@ -342,10 +346,8 @@ def process_calculator_file(filepath):
                 if modified:
                     file_modified = True
         
-        if file_modified:
-            # Write back to file
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+        # Write back to file, unless the serialized content is unchanged
+        if file_modified and writer.write(filepath, data):
             print(f"✓ {filename}")
             return True
         else:
@@ -366,13 +368,15 @@ def main():
     calculator_files = sorted(list(content_dir.glob('*.json')))
     print(f"Processing {len(calculator_files)} calculator files...\n")
     
+    writer = JSONWriter()
     updated_count = 0
     for filepath in calculator_files:
-        if process_calculator_file(filepath):
+        if process_calculator_file(filepath, writer):
             updated_count += 1
     
     print(f"\n{'='*60}")
     print(f"✓ Complete! Updated {updated_count}/{len(calculator_files)} files")
+    writer.print_summary()
     print(f"{'='*60}")
 
 if __name__ == '__main__':